@@ -1,5 +1,9 @@
 from typing import Dict, List, Union, AsyncIterable, Optional, Any
 from dataclasses import dataclass
+import hashlib
+import inspect
+import json
+import re
 from agent_orchestration_framework.types import (
     ConversationMessage,
     ParticipantRole,
@@ -8,32 +12,91 @@ from agent_orchestration_framework.types import (
 from agent_orchestration_framework.tools.tool import (
     Tool,
 )
+from agent_orchestration_framework.agents.prompt_template import PromptTemplate
+from agent_orchestration_framework.agents.single_flight import SingleFlight
+from agent_orchestration_framework.agents.response_cache import SemanticResponseCache
+from agent_orchestration_framework.agents.prompt_cache import (
+    PromptCache,
+    PromptCacheOptions,
+    content_text,
+)
+from agent_orchestration_framework.llm.scheduler import LLMScheduler, Priority
+from agent_orchestration_framework.llm.model_pool import ModelPool
+from agent_orchestration_framework.agents.history_window import (
+    HistoryWindow,
+    message_text,
+)
 from agent_orchestration_framework.utils import Logger
+from agent_orchestration_framework.utils.tracing import span
 
 
 @dataclass
 class AgentOptions:
     name: str
     description: str
-    # TODO: for now None but this is required.
-    # Check how to create typing which is an instance of a Model (OpenAI Compatible?)
-    model: None
+    # Model name used with `client`, or a `ModelPool` of equivalent endpoints
+    # (each with its own client) and a routing policy
+    model: Union[str, ModelPool, None]
     streaming: Optional[bool] = None
     tools: Optional[List[Tool]] = None
+    # OpenAI compatible client. Pass `AsyncOpenAI` so completions don't block the event loop,
+    # a sync `OpenAI` client still works but each request holds the loop until it returns.
+    client: Optional[Any] = None
+    inference_config: Optional[Dict[str, Any]] = None
+    retriever: Optional[Any] = None
+    callbacks: Optional[Any] = None
+    save_chat: bool = True
+    # Token budget for the prompt, older turns are dropped or summarized
+    history_window: Optional[HistoryWindow] = None
+    # Share one completion between identical requests in flight. Only used when
+    # the temperature is 0, otherwise callers would expect different answers
+    coalesce_requests: bool = False
+    # Answer paraphrases of earlier questions from a cache, also only at temperature 0
+    response_cache: Optional[SemanticResponseCache] = None
+    # Shared queue enforcing rate limits and retries, set by the orchestrator when not given.
+    # Create the client with `max_retries=0` so retries are not done twice
+    scheduler: Optional[LLMScheduler] = None
+    priority: Priority = Priority.INTERACTIVE
+    # Prompt caching hints for the provider and cached input token accounting. Pair it
+    # with a HistoryWindow `eviction_block` so long sessions keep a stable prefix
+    prompt_cache: Optional[PromptCacheOptions] = None
 
 
 class Agent:
     def __init__(self, options: AgentOptions):
-        super().__init__(options)
-
         self.id = self.generate_key_from_name(options.name)
         self.name = options.name
         self.description = options.description
         self.model = options.model
         self.streaming = options.streaming or False
+        self.tools = options.tools
+        self.client = options.client
+        self.retriever = options.retriever
+        self.callbacks = options.callbacks
+        self.save_chat = options.save_chat
+        self.history_window = options.history_window
+        self.single_flight = SingleFlight() if options.coalesce_requests else None
+        self.response_cache = options.response_cache
+        self.scheduler = options.scheduler
+        self.priority = options.priority
+        self.prompt_cache = (
+            PromptCache(options.prompt_cache, self.id) if options.prompt_cache else None
+        )
 
+        default_inference_config = {
+            "maxTokens": 1000,
+            "temperature": None,
+            "topP": None,
+            "stopSequences": None,
+        }
+        self.inference_config = {
+            **default_inference_config,
+            **(options.inference_config or {}),
+        }
+
+        self.custom_variables: TemplateVariables = {}
         # Initialize system prompt
-        self.system_prompt = f"""You are a {self.name}.
+        self.prompt_template = f"""You are a {self.name}.
         {self.description} Provide helpful and accurate information based on your expertise.
         You will engage in an open-ended conversation, providing helpful and accurate information based on your expertise.
         The conversation will proceed as follows:
@@ -51,11 +114,39 @@ class Agent:
         - Ask for clarification if any part of the question or prompt is ambiguous.
         - Maintain a consistent, respectful, and engaging tone tailored to the human's communication style.
         - Seamlessly transition between topics as the human introduces new subjects."""
+        self.compiled_template = PromptTemplate(self.prompt_template)
+        self.system_prompt = self.prompt_template
+
+    def is_streaming_enabled(self) -> bool:
+        return self.streaming is True
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Counters of the agent's caches by title, reported by the orchestrator."""
+        stats = {}
+        if self.single_flight:
+            stats["Request Coalescing"] = self.single_flight.stats()
+        if self.response_cache:
+            stats["Response Cache"] = self.response_cache.stats()
+        return stats
+
+    def set_system_prompt(
+        self,
+        template: Optional[str] = None,
+        variables: Optional[TemplateVariables] = None,
+    ) -> None:
+        if template:
+            self.prompt_template = template
+            self.compiled_template = PromptTemplate(template)
+        if variables:
+            self.custom_variables = variables
+        self.update_system_prompt()
+
+    def update_system_prompt(self) -> None:
+        # Cheap when the variables didn't change, the last render is reused
+        self.system_prompt = self.compiled_template.render(self.custom_variables)
 
     @staticmethod
     def generate_key_from_name(name: str) -> str:
-        import re
-
         # Remove special characters and replace spaces with hyphens
         key = re.sub(r"[^a-zA-Z0-9\s-]", "", name)
         key = re.sub(r"\s+", "-", key)
@@ -69,33 +160,69 @@ class Agent:
         chat_history: List[ConversationMessage],
         additional_params: Optional[Dict[str, str]] = None,
         logger: Logger = Logger,
+        retrieved_context: Optional[str] = None,
     ) -> Union[ConversationMessage, AsyncIterable[Any]]:
+        """
+        `retrieved_context` is passed when the caller already ran the retriever.
+        Messages go from the most to the least stable: system prompt, summary, history,
+        then the retrieved context and the user turn, so consecutive turns of a session
+        share a prompt prefix that providers can cache.
+        """
         try:
 
             self.update_system_prompt()
 
             system_prompt = self.system_prompt
 
-            if self.retriever:
-                response = await self.retriever.retrieve_and_combine_results(input_text)
-                context_prompt = (
-                    "\nHere is the context to use to answer the user's question:\n"
-                    + response
+            if retrieved_context is None:
+                retrieved_context = await self.retrieve_context(input_text)
+            turn_messages = []
+            if retrieved_context:
+                turn_messages.append(
+                    {
+                        "role": "system",
+                        "content": "Here is the context to use to answer the user's question:\n"
+                        + retrieved_context,
+                    }
                 )
-                system_prompt += context_prompt
+            turn_messages.append({"role": "user", "content": input_text})
+
+            history_summary = None
+            if self.history_window:
+                with span(f"Agent {self.name} | History window"):
+                    window = await self.history_window.apply(
+                        chat_history,
+                        user_id,
+                        session_id,
+                        reserved_tokens=self.history_window.count_tokens(system_prompt)
+                        + sum(
+                            self.history_window.count_tokens(message["content"])
+                            for message in turn_messages
+                        ),
+                    )
+                chat_history, history_summary = window.messages, window.summary
 
             messages = [
                 {"role": "system", "content": system_prompt},
+                *(
+                    [
+                        {
+                            "role": "system",
+                            "content": "Summary of the earlier conversation:\n"
+                            + history_summary,
+                        }
+                    ]
+                    if history_summary
+                    else []
+                ),
                 *[
                     {
                         "role": msg.role.lower(),
-                        "content": (
-                            msg.content[0].get("text", "") if msg.content else ""
-                        ),
+                        "content": message_text(msg),
                     }
                     for msg in chat_history
                 ],
-                {"role": "user", "content": input_text},
+                *turn_messages,
             ]
 
             request_options = {
@@ -107,21 +234,73 @@ class Agent:
                 "stop": self.inference_config.get("stopSequences"),
                 "stream": self.streaming,
             }
+            reusable_tokens = None
+            if self.prompt_cache:
+                reusable_tokens = self.prompt_cache.prepare(
+                    request_options,
+                    len(messages) - len(turn_messages),
+                    f"{user_id}:{session_id}",
+                )
             if self.streaming:
-                return await self.handle_streaming_response(request_options)
-            else:
-                return await self.handle_single_response(request_options)
+                # Not awaited, the caller consumes the tokens as they arrive
+                return self.handle_streaming_response(request_options, reusable_tokens)
+
+            if self.response_cache is None or request_options["temperature"] != 0:
+                return await self.handle_single_response(
+                    request_options, reusable_tokens
+                )
+
+            context = self.response_cache.context_key(messages[:-1])
+            with span(f"Agent {self.name} | Response cache lookup") as lookup_span:
+                cached_response = self.response_cache.lookup(input_text, context)
+                if lookup_span is not None:
+                    lookup_span.attributes["hit"] = cached_response is not None
+            if cached_response is not None:
+                return cached_response
+
+            response = await self.handle_single_response(
+                request_options, reusable_tokens
+            )
+            self.response_cache.store(input_text, context, response)
+            return response
 
         except Exception as error:
             Logger.error(f"Error in OpenAI API call: {str(error)}")
             raise error
 
+    async def retrieve_context(self, input_text: str) -> Optional[str]:
+        if not self.retriever:
+            return None
+        with span(f"Agent {self.name} | Retrieval"):
+            return await self.retriever.retrieve_and_combine_results(input_text)
+
     async def handle_single_response(
-        self, request_options: Dict[str, Any]
+        self, request_options: Dict[str, Any], reusable_tokens: Optional[int] = None
     ) -> ConversationMessage:
+        """`reusable_tokens` is the prompt cache estimate, when prompt caching is on."""
         try:
             request_options["stream"] = False
-            chat_completion = self.client.chat.completions.create(**request_options)
+            with span(
+                f"Agent {self.name} | LLM completion", model=str(self.model)
+            ) as completion_span:
+                if self.can_coalesce(request_options):
+                    key = self.request_key(request_options)
+                    if completion_span is not None:
+                        completion_span.attributes[
+                            "coalesced"
+                        ] = self.single_flight.is_in_flight(key)
+                    chat_completion = await self.single_flight.do(
+                        key, lambda: self._create_completion(request_options)
+                    )
+                else:
+                    chat_completion = await self._create_completion(request_options)
+
+            if self.prompt_cache and reusable_tokens is not None:
+                self.prompt_cache.record(
+                    getattr(chat_completion, "usage", None),
+                    reusable_tokens,
+                    completion_span,
+                )
 
             if not chat_completion.choices:
                 raise ValueError("No choices returned from OpenAI API")
@@ -141,39 +320,92 @@ class Agent:
             raise error
 
     async def handle_streaming_response(
-        self, request_options: Dict[str, Any]
-    ) -> ConversationMessage:
+        self, request_options: Dict[str, Any], reusable_tokens: Optional[int] = None
+    ) -> AsyncIterable[str]:
+        """Yield each token as soon as the model sends it"""
         try:
-            stream = self.client.chat.completions.create(**request_options)
-            accumulated_message = []
+            request_options["stream"] = True
+            stream = await self._create_completion(request_options)
 
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
+            usage = None
+            async for chunk in self._iterate_stream(stream):
+                # Only in the last chunk, and only when asked for with `stream_options`
+                usage = getattr(chunk, "usage", None) or usage
+                if chunk.choices and chunk.choices[0].delta.content:
                     chunk_content = chunk.choices[0].delta.content
-                    accumulated_message.append(chunk_content)
                     if self.callbacks:
                         self.callbacks.on_llm_new_token(chunk_content)
-                    # yield chunk_content
+                    yield chunk_content
 
-            # Store the complete message in the instance for later access if needed
-            return ConversationMessage(
-                role=ParticipantRole.ASSISTANT.value,
-                content=[{"text": "".join(accumulated_message)}],
-            )
+            if self.prompt_cache and reusable_tokens is not None:
+                self.prompt_cache.record(usage, reusable_tokens)
 
         except Exception as error:
             Logger.error(f"Error getting stream from OpenAI model: {str(error)}")
             raise error
 
+    def can_coalesce(self, request_options: Dict[str, Any]) -> bool:
+        return self.single_flight is not None and request_options.get("temperature") == 0
+
+    def request_key(self, request_options: Dict[str, Any]) -> str:
+        # The prompt cache key is per session, identical prompts of other sessions still coalesce
+        options = {
+            key: value
+            for key, value in request_options.items()
+            if key != "prompt_cache_key"
+        }
+        payload = json.dumps(options, sort_keys=True, default=str)
+        return f"{self.id}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    async def _create_completion(self, request_options: Dict[str, Any]) -> Any:
+        if isinstance(self.model, ModelPool):
+            return await self.model.complete(
+                lambda endpoint: self._submit_completion(
+                    endpoint.client, {**request_options, "model": endpoint.model}
+                )
+            )
+        return await self._submit_completion(self.client, request_options)
+
+    async def _submit_completion(
+        self, client: Any, request_options: Dict[str, Any]
+    ) -> Any:
+        if self.scheduler is None:
+            return await self._call_client(client, request_options)
+
+        return await self.scheduler.submit(
+            lambda: self._call_client(client, request_options),
+            model=request_options["model"],
+            tokens=self.estimate_request_tokens(request_options),
+            priority=self.priority,
+        )
+
     @staticmethod
-    def replace_placeholders(template: str, variables: TemplateVariables) -> str:
-        import re
+    def estimate_request_tokens(request_options: Dict[str, Any]) -> int:
+        """Prompt tokens (~4 characters each) plus the completion budget, for tokens/min limits"""
+        prompt_characters = sum(
+            len(content_text(message["content"]))
+            for message in request_options["messages"]
+        )
+        return prompt_characters // 4 + (request_options.get("max_tokens") or 0)
+
+    @staticmethod
+    async def _call_client(client: Any, request_options: Dict[str, Any]) -> Any:
+        """Call the client and await the result when it is an async client (e.g. `AsyncOpenAI`)"""
+        completion = client.chat.completions.create(**request_options)
+        if inspect.isawaitable(completion):
+            completion = await completion
+        return completion
 
-        def replace(match):
-            key = match.group(1)
-            if key in variables:
-                value = variables[key]
-                return "\n".join(value) if isinstance(value, list) else str(value)
-            return match.group(0)
+    @staticmethod
+    async def _iterate_stream(stream: Any) -> AsyncIterable[Any]:
+        """Iterate both async (`AsyncStream`) and sync (`Stream`) chunk streams"""
+        if hasattr(stream, "__aiter__"):
+            async for chunk in stream:
+                yield chunk
+        else:
+            for chunk in stream:
+                yield chunk
 
-        return re.sub(r"{{(\w+)}}", replace, template)
+    @staticmethod
+    def replace_placeholders(template: str, variables: TemplateVariables) -> str:
+        return PromptTemplate.compile(template).render(variables)
@@ -0,0 +1,220 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import inspect
+
+from agent_orchestration_framework.types import ConversationMessage, ParticipantRole
+
+# (messages evicted from the window, previous summary) -> new summary
+Summarizer = Callable[[List[ConversationMessage], Optional[str]], Awaitable[str]]
+MessageKey = Tuple[str, int, str]
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token for English text, pass a real tokenizer for exact counts."""
+    return max(1, len(text) // 4)
+
+
+def message_text(message: ConversationMessage) -> str:
+    return message.text
+
+
+@dataclass
+class HistoryWindowResult:
+    messages: List[ConversationMessage]
+    summary: Optional[str]
+    # Tokens of the kept history plus the summary
+    tokens: int
+
+
+@dataclass
+class _RollingSummary:
+    # Last message folded into `summary`
+    boundary: MessageKey
+    summary: str
+
+
+class LLMHistorySummarizer:
+    """Summarize evicted turns with an OpenAI compatible model."""
+
+    def __init__(self, client: Any, model: str, max_tokens: int = 300):
+        self.client = client
+        self.model = model
+        self.max_tokens = max_tokens
+
+    async def __call__(
+        self, messages: List[ConversationMessage], previous_summary: Optional[str]
+    ) -> str:
+        transcript = "\n".join(
+            f"{message.role}: {message_text(message)}" for message in messages
+        )
+        completion = self.client.chat.completions.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=0,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Update the summary of the conversation with the new turns. "
+                    "Keep facts, names, numbers and open questions. Answer with the summary only.",
+                },
+                {
+                    "role": "user",
+                    "content": f"Summary so far:\n{previous_summary or '- None -'}\n\nNew turns:\n{transcript}",
+                },
+            ],
+        )
+        if inspect.isawaitable(completion):
+            completion = await completion
+        return completion.choices[0].message.content
+
+
+class HistoryWindow:
+    """
+    Keep the latest turns that fit in `max_tokens` and fold the older ones into a
+    rolling summary. The summary is cached per session and only extended with the
+    turns that left the window since the previous request.
+
+    With `eviction_block` the window evicts that many extra messages whenever it has to
+    move, then keeps its start for the following turns while the history still fits.
+    The summary and the oldest kept turns stay the same between evictions, so the
+    prompt prefix can be served from a provider's prompt cache.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        token_counter: Callable[[str], int] = estimate_tokens,
+        summarizer: Optional[Summarizer] = None,
+        max_sessions: int = 10000,
+        max_cached_counts: int = 100000,
+        eviction_block: int = 0,
+    ):
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter
+        self.summarizer = summarizer
+        self.max_sessions = max_sessions
+        self.max_cached_counts = max_cached_counts
+        self.eviction_block = eviction_block
+        self._summaries: "OrderedDict[Tuple[str, str], _RollingSummary]" = OrderedDict()
+        self._token_counts: "OrderedDict[str, int]" = OrderedDict()
+        # First message kept for each session, when evicting in blocks
+        self._window_starts: "OrderedDict[Tuple[str, str], MessageKey]" = OrderedDict()
+
+    def count_tokens(self, text: str) -> int:
+        """Token count of `text`, cached so each message is only counted once."""
+        count = self._token_counts.get(text)
+        if count is None:
+            count = self._token_counts[text] = self.token_counter(text)
+            if len(self._token_counts) > self.max_cached_counts:
+                self._token_counts.popitem(last=False)
+        return count
+
+    @staticmethod
+    def message_key(message: ConversationMessage) -> MessageKey:
+        return (message.role, getattr(message, "timestamp", 0), message_text(message))
+
+    def select(
+        self, chat_history: List[ConversationMessage], budget: int
+    ) -> Tuple[int, int]:
+        """Index of the first message kept and the tokens of the kept messages."""
+        tokens = 0
+        start = len(chat_history)
+        for index in range(len(chat_history) - 1, -1, -1):
+            message_tokens = self.count_tokens(message_text(chat_history[index]))
+            if tokens + message_tokens > budget:
+                break
+            tokens += message_tokens
+            start = index
+
+        # Start the window on a user turn
+        while (
+            start < len(chat_history)
+            and chat_history[start].role != ParticipantRole.USER.value
+        ):
+            tokens -= self.count_tokens(message_text(chat_history[start]))
+            start += 1
+        return start, tokens
+
+    async def apply(
+        self,
+        chat_history: List[ConversationMessage],
+        user_id: str,
+        session_id: str,
+        reserved_tokens: int = 0,
+    ) -> HistoryWindowResult:
+        """`reserved_tokens` is what the rest of the prompt (system prompt, user input) uses."""
+        start, tokens = self.select(chat_history, self.max_tokens - reserved_tokens)
+        if self.eviction_block and 0 < start < len(chat_history):
+            start, tokens = self._stable_start(
+                chat_history, start, tokens, (user_id, session_id)
+            )
+        if start == 0:
+            return HistoryWindowResult(chat_history, None, tokens)
+
+        kept = chat_history[start:]
+        summary = None
+        if self.summarizer:
+            summary = await self._rolling_summary(
+                chat_history[:start], (user_id, session_id)
+            )
+            tokens += self.count_tokens(summary)
+        return HistoryWindowResult(kept, summary, tokens)
+
+    def _stable_start(
+        self,
+        chat_history: List[ConversationMessage],
+        start: int,
+        tokens: int,
+        session_key: Tuple[str, str],
+    ) -> Tuple[int, int]:
+        """Window start of the previous request if it still fits, otherwise a block further."""
+        previous = self._window_starts.get(session_key)
+        stable = None
+        if previous is not None:
+            for index in range(start, len(chat_history)):
+                if self.message_key(chat_history[index]) == previous:
+                    stable = index
+                    break
+
+        if stable is None:
+            stable = start + self.eviction_block
+            while (
+                stable < len(chat_history)
+                and chat_history[stable].role != ParticipantRole.USER.value
+            ):
+                stable += 1
+            if stable >= len(chat_history):
+                stable = start
+
+        for message in chat_history[start:stable]:
+            tokens -= self.count_tokens(message_text(message))
+        self._window_starts[session_key] = self.message_key(chat_history[stable])
+        self._window_starts.move_to_end(session_key)
+        if len(self._window_starts) > self.max_sessions:
+            self._window_starts.popitem(last=False)
+        return stable, tokens
+
+    async def _rolling_summary(
+        self, evicted: List[ConversationMessage], session_key: Tuple[str, str]
+    ) -> str:
+        boundary = self.message_key(evicted[-1])
+        state = self._summaries.get(session_key)
+        if state and state.boundary == boundary:
+            # The window didn't slide since the previous request
+            self._summaries.move_to_end(session_key)
+            return state.summary
+
+        new_messages, previous_summary = evicted, None
+        if state:
+            keys = [self.message_key(message) for message in evicted]
+            if state.boundary in keys:
+                new_messages = evicted[keys.index(state.boundary) + 1 :]
+                previous_summary = state.summary
+
+        summary = await self.summarizer(new_messages, previous_summary)
+        self._summaries[session_key] = _RollingSummary(boundary, summary)
+        self._summaries.move_to_end(session_key)
+        if len(self._summaries) > self.max_sessions:
+            self._summaries.popitem(last=False)
+        return summary
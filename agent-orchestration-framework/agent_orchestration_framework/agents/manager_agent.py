@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import json
+import re
+
+from agent_orchestration_framework.agents.agent import Agent
+from agent_orchestration_framework.types import ConversationMessage, ParticipantRole
+from agent_orchestration_framework.utils import Logger
+
+# A sentence end followed by more text, or a word joining several asks
+SEVERAL_PARTS = re.compile(r"[.?!;\n]\s*\S|\b(?:and|also|plus|then|as well as)\b", re.I)
+
+
+@dataclass
+class SubTask:
+    input_text: str
+    # None lets the orchestrator's classifier pick the agent
+    agent_id: Optional[str] = None
+
+
+@dataclass
+class SubTaskResult:
+    task: SubTask
+    agent: Any
+    response: Optional[ConversationMessage] = None
+    # True when the deadline hit before the agent answered
+    timed_out: bool = False
+    error: Optional[str] = None
+
+
+class ManagerAgent(Agent):
+    """Splits a multi-part request into sub-tasks for other agents and merges their answers."""
+
+    @staticmethod
+    def may_have_several_parts(input_text: str) -> bool:
+        """
+        Cheap check before paying for a decomposition. Only ever skips the model call,
+        the split itself is always left to the model.
+        """
+        return SEVERAL_PARTS.search(input_text.strip()) is not None
+
+    async def decompose(self, input_text: str, agents: Dict[str, Agent]) -> List[SubTask]:
+        """
+        Sub-tasks of `input_text`, a single one when there is no model to decompose with.
+        Parts often refer to each other ("My flight is AA100. What is its status?"),
+        so requests are never split without a model.
+        """
+        if self.client is None and self.model is None:
+            return [SubTask(input_text)]
+
+        agent_descriptions = "\n".join(
+            f"{agent.id}:{agent.description}" for agent in agents.values()
+        )
+        request_options = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": f"""Split the user's request into independent sub-questions, each answerable by one agent.
+                    Available agents (id:description):
+                    {agent_descriptions}
+                    Respond only with JSON: {{"tasks": [{{"agent_id": "<agent id>", "input": "<sub-question>"}}]}}.
+                    Use a single task when the request has only one part.""",
+                },
+                {"role": "user", "content": input_text},
+            ],
+            "max_tokens": self.inference_config.get("maxTokens"),
+            "temperature": 0,
+            "stream": False,
+        }
+        try:
+            completion = await self._create_completion(request_options)
+            output = json.loads(completion.choices[0].message.content)
+            tasks = [
+                SubTask(task["input"], task.get("agent_id") or None)
+                for task in output.get("tasks", [])
+                if task.get("input")
+            ]
+            return self.merge_tasks(tasks) or [SubTask(input_text)]
+        except Exception as error:
+            Logger.error(f"Error decomposing request, not fanning out: {str(error)}")
+            return [SubTask(input_text)]
+
+    @staticmethod
+    def merge_tasks(tasks: List[SubTask]) -> List[SubTask]:
+        """
+        One sub-task per agent. Parts for the same agent stay together, run concurrently
+        they would lose each other's context and race on that agent's history.
+        """
+        merged: Dict[Optional[str], SubTask] = {}
+        unassigned = []
+        for task in tasks:
+            if task.agent_id is None:
+                unassigned.append(task)
+            elif task.agent_id in merged:
+                previous = merged[task.agent_id]
+                merged[task.agent_id] = SubTask(
+                    f"{previous.input_text} {task.input_text}", task.agent_id
+                )
+            else:
+                merged[task.agent_id] = task
+        return [*merged.values(), *unassigned]
+
+    def merge(self, results: List[SubTaskResult]) -> ConversationMessage:
+        sections = []
+        for result in results:
+            name = result.agent.name if result.agent else "No agent"
+            if result.response is not None:
+                text = result.response.text
+            elif result.timed_out:
+                text = f"(no answer before the deadline for: {result.task.input_text})"
+            else:
+                text = f"(could not answer: {result.task.input_text})"
+            sections.append(f"{name}:\n{text}")
+
+        return ConversationMessage(
+            role=ParticipantRole.ASSISTANT.value,
+            content=[{"text": "\n\n".join(sections)}],
+        )
@@ -0,0 +1,185 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+
+from agent_orchestration_framework.agents.history_window import estimate_tokens
+from agent_orchestration_framework.utils.tracing import Span
+
+PROVIDERS = ("openai", "anthropic", "local")
+
+
+@dataclass
+class PromptCacheOptions:
+    # "openai": the provider caches prompt prefixes on its own, requests carry a per
+    #   session `prompt_cache_key` so a session keeps hitting the same cache
+    # "anthropic": `cache_control` breakpoints after the system prompt and the history,
+    #   for OpenAI compatible gateways that forward them (LiteLLM, OpenRouter...)
+    # "local": KV cache reuse hints for llama.cpp / vLLM style servers
+    provider: str = "openai"
+    # Merged into the request body for "local", e.g. add {"id_slot": 0} to pin a llama.cpp slot
+    local_hints: Dict[str, Any] = field(default_factory=lambda: {"cache_prompt": True})
+    # Ask for the usage chunk at the end of streams ("openai"), some servers reject the option
+    stream_usage: bool = True
+    # Sessions whose previous prompt is kept to estimate the reusable prefix
+    max_sessions: int = 10000
+
+
+def message_digest(message: Dict[str, Any]) -> str:
+    payload = json.dumps(message, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def content_text(content: Any) -> str:
+    """Text of a message `content`, either a string or a list of text blocks."""
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content or [])
+
+
+def with_breakpoint(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of `message` whose content ends with an ephemeral cache breakpoint."""
+    content = message["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    content = [*content[:-1], {**content[-1], "cache_control": {"type": "ephemeral"}}]
+    return {**message, "content": content}
+
+
+def usage_tokens(usage: Any) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Input tokens and cached input tokens reported in a completion's `usage`. The cached
+    count is None when the provider doesn't report it, everything is None without usage.
+    """
+    input_tokens = _field(usage, "prompt_tokens")
+    if input_tokens is None:
+        return None
+    cached_tokens = _field(_field(usage, "prompt_tokens_details"), "cached_tokens")
+    if cached_tokens is None:
+        # DeepSeek, then Anthropic style gateways
+        cached_tokens = _field(usage, "prompt_cache_hit_tokens")
+    if cached_tokens is None:
+        cached_tokens = _field(usage, "cache_read_input_tokens")
+    return input_tokens, cached_tokens
+
+
+def _field(value: Any, name: str) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+class PromptCache:
+    """
+    Add the prompt caching hints of a provider to requests and count cached against
+    uncached input tokens. The agent lays out messages as system prompt, summary and
+    history, then the per turn parts, so between turns of a session the prompt only
+    grows after the cached prefix.
+    """
+
+    def __init__(self, options: PromptCacheOptions, namespace: str):
+        if options.provider not in PROVIDERS:
+            raise ValueError(f"Unknown prompt cache provider: {options.provider}")
+        self.options = options
+        self.namespace = namespace
+        # Message digests of the previous prompt of each session
+        self._prompts: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.requests = 0
+        self.unreported = 0
+        self.estimated = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.reusable_tokens = 0
+
+    def cache_key(self, session_key: str) -> str:
+        return hashlib.sha256(f"{self.namespace}:{session_key}".encode()).hexdigest()[:32]
+
+    def prepare(
+        self, request_options: Dict[str, Any], prefix_length: int, session_key: str
+    ) -> int:
+        """
+        Annotate `request_options` for the provider, the first `prefix_length` messages
+        are the stable prefix. Returns the estimated tokens shared with the previous
+        prompt of the session, what a prefix cache can reuse at best.
+        """
+        messages = request_options["messages"]
+        reusable_tokens = self._reusable_tokens(messages, session_key)
+
+        provider = self.options.provider
+        if provider == "openai":
+            request_options["prompt_cache_key"] = self.cache_key(session_key)
+            if request_options.get("stream") and self.options.stream_usage:
+                request_options["stream_options"] = {"include_usage": True}
+        elif provider == "anthropic":
+            messages = list(messages)
+            for index in sorted({0, prefix_length - 1}):
+                if index >= 0:
+                    messages[index] = with_breakpoint(messages[index])
+            request_options["messages"] = messages
+        else:
+            request_options["extra_body"] = {
+                **(request_options.get("extra_body") or {}),
+                **self.options.local_hints,
+            }
+        return reusable_tokens
+
+    def _reusable_tokens(self, messages: List[Dict[str, Any]], session_key: str) -> int:
+        digests = [message_digest(message) for message in messages]
+        previous = self._prompts.get(session_key) or []
+        self._prompts[session_key] = digests
+        self._prompts.move_to_end(session_key)
+        if len(self._prompts) > self.options.max_sessions:
+            self._prompts.popitem(last=False)
+
+        tokens = 0
+        for message, digest, previous_digest in zip(messages, digests, previous):
+            if digest != previous_digest:
+                break
+            tokens += estimate_tokens(content_text(message["content"]))
+        return tokens
+
+    def record(
+        self, usage: Any, reusable_tokens: int, completion_span: Optional[Span] = None
+    ) -> None:
+        """
+        Count the input tokens of a completion. When the provider doesn't report cached
+        tokens the reusable prefix estimate stands in for them.
+        """
+        self.requests += 1
+        self.reusable_tokens += reusable_tokens
+        tokens = usage_tokens(usage)
+        if tokens is None:
+            self.unreported += 1
+            return
+
+        input_tokens, cached_tokens = tokens
+        estimated = cached_tokens is None
+        if estimated:
+            self.estimated += 1
+            cached_tokens = min(reusable_tokens, input_tokens)
+        self.input_tokens += input_tokens
+        self.cached_tokens += cached_tokens
+        if completion_span is not None:
+            completion_span.attributes.update(
+                input_tokens=input_tokens,
+                cached_input_tokens=cached_tokens,
+                uncached_input_tokens=input_tokens - cached_tokens,
+                cached_tokens_estimated=estimated,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+            "uncached_tokens": self.input_tokens - self.cached_tokens,
+            "cached_ratio": round(self.cached_tokens / self.input_tokens, 3)
+            if self.input_tokens
+            else 0.0,
+            "reusable_tokens": self.reusable_tokens,
+            "estimated": self.estimated,
+            "unreported": self.unreported,
+        }
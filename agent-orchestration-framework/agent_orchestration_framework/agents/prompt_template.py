@@ -0,0 +1,55 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+import re
+
+from agent_orchestration_framework.types import TemplateVariables
+
+PLACEHOLDER_PATTERN = re.compile(r"{{(\w+)}}")
+
+
+class PromptTemplate:
+    """
+    A `{{variable}}` template parsed once into literal segments and variable slots.
+    Rendering is a join over the segments, and the last result is reused while the
+    slot values don't change.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        # Literal text at even indexes, variable names at odd indexes
+        self.segments: List[str] = PLACEHOLDER_PATTERN.split(template)
+        self.variables: Tuple[str, ...] = tuple(self.segments[1::2])
+        self._last_key: Optional[Tuple] = None
+        self._last_render: Optional[str] = None
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def compile(template: str) -> "PromptTemplate":
+        return PromptTemplate(template)
+
+    @staticmethod
+    def _format(value: Union[str, List[str]]) -> str:
+        return "\n".join(value) if isinstance(value, list) else str(value)
+
+    def render(self, variables: TemplateVariables) -> str:
+        if not self.variables:
+            return self.template
+
+        # Only the values of the slots in this template matter for the cache
+        key = tuple(
+            tuple(value) if isinstance(value, list) else value
+            for value in (variables.get(name) for name in self.variables)
+        )
+        if key == self._last_key:
+            return self._last_render
+
+        rendered = self.segments.copy()
+        for index in range(1, len(rendered), 2):
+            name = rendered[index]
+            # Unknown placeholders are left as is
+            rendered[index] = (
+                self._format(variables[name]) if name in variables else f"{{{{{name}}}}}"
+            )
+        self._last_key = key
+        self._last_render = "".join(rendered)
+        return self._last_render
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+import hashlib
+import json
+
+import numpy as np
+
+from agent_orchestration_framework.classifiers.embedding_classifier import (
+    Embedder,
+    HashingEmbedder,
+)
+from agent_orchestration_framework.types import ConversationMessage
+
+
+class SemanticResponseCache:
+    """
+    Reuse an answer when a new question is close enough to a previous one asked with
+    the same system prompt and history. Entries live in fixed slots of one NumPy
+    matrix and the least recently used slot is overwritten when the cache is full.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        threshold: float = 0.9,
+        max_entries: int = 1000,
+    ):
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._responses: List[Optional[ConversationMessage]] = [None] * max_entries
+        self._contexts: List[Optional[str]] = [None] * max_entries
+        self._inputs: List[Optional[str]] = [None] * max_entries
+        self._slots_by_context: Dict[str, Set[int]] = {}
+        # (context, input_text) -> slot, storing the same question again updates its slot
+        self._slots_by_input: Dict[Tuple[str, str], int] = {}
+        # slot -> None, oldest first
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+
+    @staticmethod
+    def context_key(messages: List[Dict[str, str]]) -> str:
+        """Hash of the prompt messages before the final user turn (system prompt and history)."""
+        payload = json.dumps(messages, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embedder([text]), dtype=np.float32)[0]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, input_text: str, context: str) -> Optional[ConversationMessage]:
+        slots = self._slots_by_context.get(context)
+        if not slots:
+            self.misses += 1
+            return None
+
+        candidates = np.fromiter(slots, dtype=np.int64)
+        scores = self._vectors[candidates] @ self._embed(input_text)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            self.misses += 1
+            return None
+
+        slot = int(candidates[best])
+        self._lru.move_to_end(slot)
+        self.hits += 1
+        cached = self._responses[slot]
+        return ConversationMessage(role=cached.role, content=list(cached.content))
+
+    def store(
+        self, input_text: str, context: str, response: ConversationMessage
+    ) -> None:
+        slot = self._slots_by_input.get((context, input_text))
+        if slot is not None:
+            self._responses[slot] = response
+            self._lru.move_to_end(slot)
+            return
+
+        vector = self._embed(input_text)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+        if len(self._lru) < self.max_entries:
+            slot = len(self._lru)
+        else:
+            slot, _ = self._lru.popitem(last=False)
+            self._slots_by_context[self._contexts[slot]].discard(slot)
+            if not self._slots_by_context[self._contexts[slot]]:
+                del self._slots_by_context[self._contexts[slot]]
+            del self._slots_by_input[(self._contexts[slot], self._inputs[slot])]
+
+        self._vectors[slot] = vector
+        self._responses[slot] = response
+        self._contexts[slot] = context
+        self._inputs[slot] = input_text
+        self._slots_by_input[(context, input_text)] = slot
+        self._slots_by_context.setdefault(context, set()).add(slot)
+        self._lru[slot] = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._lru)}
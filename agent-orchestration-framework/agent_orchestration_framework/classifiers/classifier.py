@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from agent_orchestration_framework.types import ConversationMessage
+
+
+@dataclass
+class ClassifierResult:
+    # Instance of `Agent`. Kept as Any to avoid a circular import with agents.agent
+    selected_agent: Optional[Any]
+    confidence: float
+
+
+class Classifier(ABC):
+    # The orchestrator only fetches the chat history for classifiers that read it
+    uses_history: bool = True
+
+    def __init__(self):
+        self.agents: Dict[str, Any] = {}
+        self.agent_descriptions = ""
+
+    def set_agents(self, agents: Dict[str, Any]) -> None:
+        self.agents = agents
+        self.agent_descriptions = "\n\n".join(
+            f"{agent.id}:{agent.description}" for agent in agents.values()
+        )
+
+    def get_agent_by_id(self, agent_id: str) -> Optional[Any]:
+        if not agent_id:
+            return None
+        # The model can answer "agent-id: reason", only keep the id
+        my_agent_id = agent_id.split(" ")[0].strip().lower()
+        return self.agents.get(my_agent_id)
+
+    async def classify_lazily(
+        self,
+        input_text: str,
+        load_history: Callable[[], Awaitable[List[ConversationMessage]]],
+    ) -> ClassifierResult:
+        """
+        `classify` with the chat history loaded only when it is read. Classifiers that
+        need it only some of the time (e.g. to escalate) override this.
+        """
+        chat_history = await load_history() if self.uses_history else []
+        return await self.classify(input_text, chat_history)
+
+    @abstractmethod
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        pass
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import re
+import time
+
+from agent_orchestration_framework.classifiers.classifier import ClassifierResult
+
+CacheKey = Tuple[Optional[str], str]
+
+
+class ClassifierCache:
+    """LRU + TTL cache of classifier results keyed on the normalized user input."""
+
+    def __init__(self, max_size: int = 1000, ttl: float = 300, per_session: bool = False):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.per_session = per_session
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, ClassifierResult]]" = OrderedDict()
+
+    @staticmethod
+    def normalize(user_input: str) -> str:
+        # "Reset my password!" and "reset  my password" share an entry
+        text = re.sub(r"\s+", " ", user_input.strip().lower())
+        return text.rstrip("?!. ")
+
+    def make_key(self, user_input: str, session_id: Optional[str] = None) -> CacheKey:
+        return (session_id if self.per_session else None, self.normalize(user_input))
+
+    def get(self, key: CacheKey) -> Optional[ClassifierResult]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: CacheKey, result: ClassifierResult) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -0,0 +1,139 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+import re
+import zlib
+
+import numpy as np
+
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.types import ConversationMessage
+
+# Takes a batch of texts and returns one vector per text
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+class HashingEmbedder:
+    """
+    Dependency free local embedder: word unigrams/bigrams and character trigrams
+    hashed into a fixed size vector. Good enough to route between agents with distinct
+    descriptions, pass a sentence embedding model for paraphrase heavy traffic.
+    """
+
+    def __init__(self, dimensions: int = 2048):
+        self.dimensions = dimensions
+
+    def features(self, text: str) -> List[str]:
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        features = [f"w:{word}" for word in words]
+        features += [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+        for word in words:
+            padded = f" {word} "
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return features
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self.features(text):
+                # crc32 is stable across processes unlike `hash()`
+                vectors[row, zlib.crc32(feature.encode()) % self.dimensions] += 1.0
+        # Sublinear term frequency so repeated words don't dominate
+        return np.log1p(vectors)
+
+
+class EmbeddingClassifier(Classifier):
+    """
+    Routes by cosine similarity between the user input and each agent's name/description.
+    Agent embeddings are computed once when the agent is added. When the best score is
+    below `threshold` the request is escalated to `fallback_classifier` (e.g. an LLM classifier).
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        threshold: float = 0.1,
+        fallback_classifier: Optional[Classifier] = None,
+    ):
+        super().__init__()
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.fallback_classifier = fallback_classifier
+        self.agent_ids: List[str] = []
+        self.agent_matrix = np.zeros((0, 0), dtype=np.float32)
+        self._agent_embeddings: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    @property
+    def uses_history(self) -> bool:
+        # Scoring only looks at the input, the fallback may need the history
+        return self.fallback_classifier is not None and self.fallback_classifier.uses_history
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self._normalize(np.asarray(self.embedder(texts), dtype=np.float32))
+
+    def set_agents(self, agents: Dict[str, Any]) -> None:
+        super().set_agents(agents)
+
+        new_agents = [
+            agent for agent_id, agent in agents.items()
+            if agent_id not in self._agent_embeddings
+        ]
+        if new_agents:
+            vectors = self.embed(
+                [f"{agent.name}. {agent.description}" for agent in new_agents]
+            )
+            for agent, vector in zip(new_agents, vectors):
+                self._agent_embeddings[agent.id] = vector
+
+        self.agent_ids = list(agents.keys())
+        if self.agent_ids:
+            self.agent_matrix = np.stack(
+                [self._agent_embeddings[agent_id] for agent_id in self.agent_ids]
+            )
+
+        if self.fallback_classifier:
+            self.fallback_classifier.set_agents(agents)
+
+    def score(self, input_text: str) -> np.ndarray:
+        """Cosine similarity of the input against every agent, in `agent_ids` order."""
+        if not self.agent_ids:
+            return np.zeros(0, dtype=np.float32)
+        return self.agent_matrix @ self.embed([input_text])[0]
+
+    def best_match(self, input_text: str) -> Optional[ClassifierResult]:
+        """Best scoring agent, None when no score reaches `threshold`."""
+        scores = self.score(input_text)
+        if scores.size:
+            best = int(np.argmax(scores))
+            confidence = float(scores[best])
+            if confidence >= self.threshold:
+                return ClassifierResult(
+                    selected_agent=self.agents[self.agent_ids[best]],
+                    confidence=confidence,
+                )
+        return None
+
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        result = self.best_match(input_text)
+        if result is None and self.fallback_classifier:
+            return await self.fallback_classifier.classify(input_text, chat_history)
+        return result or ClassifierResult(selected_agent=None, confidence=0)
+
+    async def classify_lazily(
+        self,
+        input_text: str,
+        load_history: Callable[[], Awaitable[List[ConversationMessage]]],
+    ) -> ClassifierResult:
+        # The history is only loaded when the request escalates to the fallback
+        result = self.best_match(input_text)
+        if result is None and self.fallback_classifier:
+            return await self.fallback_classifier.classify_lazily(input_text, load_history)
+        return result or ClassifierResult(selected_agent=None, confidence=0)
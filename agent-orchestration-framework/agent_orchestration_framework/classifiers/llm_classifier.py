@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Optional
+import inspect
+import json
+
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.types import ConversationMessage
+from agent_orchestration_framework.utils import Logger
+
+
+class LLMClassifier(Classifier):
+    """Asks an OpenAI compatible model which agent should handle the request."""
+
+    def __init__(
+        self,
+        client: Any,
+        model: str,
+        inference_config: Optional[Dict[str, Any]] = None,
+        max_history_messages: int = 10,
+    ):
+        super().__init__()
+        self.client = client
+        self.model = model
+        self.inference_config = {"maxTokens": 100, "temperature": 0, **(inference_config or {})}
+        self.max_history_messages = max_history_messages
+
+    def build_system_prompt(self) -> str:
+        return f"""You are AgentMatcher, you pick the agent that is best suited to handle the user's request.
+        Available agents (id:description):
+        {self.agent_descriptions}
+        Use the conversation history to resolve follow up questions to the agent that handled the previous turn.
+        Respond only with JSON: {{"selected_agent": "<agent id>", "confidence": <number between 0 and 1>}}.
+        Use an empty string for selected_agent if no agent fits."""
+
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        history = "\n".join(
+            f"{message.role}: {message.text}"
+            for message in chat_history[-self.max_history_messages :]
+        )
+        messages = [
+            {"role": "system", "content": self.build_system_prompt()},
+            {
+                "role": "user",
+                "content": f"Conversation history:\n{history}\n\nUser request: {input_text}",
+            },
+        ]
+
+        try:
+            completion = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=self.inference_config.get("maxTokens"),
+                temperature=self.inference_config.get("temperature"),
+            )
+            if inspect.isawaitable(completion):
+                completion = await completion
+
+            output = json.loads(completion.choices[0].message.content)
+            return ClassifierResult(
+                selected_agent=self.get_agent_by_id(output.get("selected_agent", "")),
+                confidence=float(output.get("confidence", 0)),
+            )
+        except Exception as error:
+            Logger.error(f"Error processing LLM classifier output: {str(error)}")
+            raise error
@@ -0,0 +1,193 @@
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+import asyncio
+import itertools
+import time
+
+
+class RoutingPolicy(Enum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_LATENCY = "least_latency"
+    # Send a duplicate to the next endpoint when the first is slower than its p95
+    HEDGED = "hedged"
+
+
+@dataclass
+class ModelEndpoint:
+    client: Any
+    model: str
+    name: Optional[str] = None
+
+    def __post_init__(self):
+        self.name = self.name or self.model
+
+
+@dataclass
+class EndpointStats:
+    ewma_latency: Optional[float] = None
+    # EWMA of failed attempts, 0 when the last calls succeeded
+    error_rate: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    # Successful calls only, cancelled and failed attempts would bias the p95 low
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def record(self, latency: float, alpha: float) -> None:
+        self.requests += 1
+        self.latencies.append(latency)
+        self._update(latency, 0.0, alpha)
+
+    def record_censored(self, elapsed: float, alpha: float) -> None:
+        """A cancelled attempt, its latency is at least `elapsed`."""
+        self.requests += 1
+        self._update(max(elapsed, self.ewma_latency or 0.0), 0.0, alpha)
+
+    def record_error(self, elapsed: float, alpha: float) -> None:
+        self.requests += 1
+        self.errors += 1
+        self._update(max(elapsed, self.ewma_latency or 0.0), 1.0, alpha)
+
+    def _update(self, latency: float, error: float, alpha: float) -> None:
+        self.ewma_latency = (
+            latency
+            if self.ewma_latency is None
+            else alpha * latency + (1 - alpha) * self.ewma_latency
+        )
+        self.error_rate = alpha * error + (1 - alpha) * self.error_rate
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < 20:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 3),
+            "ewma_latency": self.ewma_latency,
+            "p95": self.p95(),
+        }
+
+
+class ModelPool:
+    """
+    Equivalent model endpoints behind one `AgentOptions.model`. Latency of every
+    call feeds the per endpoint stats used by the least latency and hedged policies,
+    cancelled and failed attempts count too so a slow or broken endpoint loses its rank.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[ModelEndpoint],
+        policy: RoutingPolicy = RoutingPolicy.ROUND_ROBIN,
+        ewma_alpha: float = 0.2,
+        # Hedge delay until the endpoint has enough samples for a p95
+        default_hedge_delay: float = 1.0,
+        # Seconds added to the EWMA latency per unit of error rate when ranking
+        error_penalty: float = 5.0,
+    ):
+        if not endpoints:
+            raise ValueError("ModelPool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.policy = policy
+        self.ewma_alpha = ewma_alpha
+        self.default_hedge_delay = default_hedge_delay
+        self.error_penalty = error_penalty
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+        self.stats: Dict[str, EndpointStats] = {
+            endpoint.name: EndpointStats() for endpoint in endpoints
+        }
+        self._round_robin = itertools.cycle(endpoints)
+
+    def __str__(self) -> str:
+        return ",".join(endpoint.name for endpoint in self.endpoints)
+
+    def ranked(self) -> List[ModelEndpoint]:
+        """
+        Endpoints by EWMA latency plus the error penalty, endpoints without samples first
+        so they get measured.
+        """
+
+        def key(endpoint: ModelEndpoint):
+            stats = self.stats[endpoint.name]
+            if stats.ewma_latency is None:
+                return (False, 0.0)
+            return (True, stats.ewma_latency + stats.error_rate * self.error_penalty)
+
+        return sorted(self.endpoints, key=key)
+
+    async def _timed(
+        self, endpoint: ModelEndpoint, fn: Callable[[ModelEndpoint], Awaitable[Any]]
+    ) -> Any:
+        stats = self.stats[endpoint.name]
+        start = time.perf_counter()
+        try:
+            result = await fn(endpoint)
+        except asyncio.CancelledError:
+            stats.record_censored(time.perf_counter() - start, self.ewma_alpha)
+            raise
+        except Exception:
+            stats.record_error(time.perf_counter() - start, self.ewma_alpha)
+            raise
+        stats.record(time.perf_counter() - start, self.ewma_alpha)
+        return result
+
+    async def complete(self, fn: Callable[[ModelEndpoint], Awaitable[Any]]) -> Any:
+        """`fn` runs the completion against the given endpoint."""
+        if self.policy == RoutingPolicy.ROUND_ROBIN:
+            return await self._timed(next(self._round_robin), fn)
+        if self.policy == RoutingPolicy.LEAST_LATENCY or len(self.endpoints) == 1:
+            return await self._timed(self.ranked()[0], fn)
+        return await self._hedged(fn)
+
+    async def _hedged(self, fn: Callable[[ModelEndpoint], Awaitable[Any]]) -> Any:
+        primary, secondary = self.ranked()[:2]
+        delay = self.stats[primary.name].p95() or self.default_hedge_delay
+
+        primary_task = asyncio.ensure_future(self._timed(primary, fn))
+        pending = {primary_task}
+        error: Optional[BaseException] = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            fallback = bool(done)
+            if fallback:
+                if primary_task.exception() is None:
+                    return primary_task.result()
+                # Failed before the hedge delay, fall back to the next endpoint right away
+                error = primary_task.exception()
+                pending = set()
+                self.fallbacks += 1
+            else:
+                self.hedged_requests += 1
+
+            hedge_task = asyncio.ensure_future(self._timed(secondary, fn))
+            pending.add(hedge_task)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task and not fallback:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Cancel the loser, or everything when the caller itself was cancelled
+            for task in pending:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "endpoints": {name: stats.to_dict() for name, stats in self.stats.items()},
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+        }
@@ -0,0 +1,217 @@
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import itertools
+import random
+import time
+
+from agent_orchestration_framework.types import OrchestratorConfig
+from agent_orchestration_framework.utils import Logger
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@dataclass
+class ModelLimits:
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    # How many seconds worth of budget can be spent at once
+    burst_seconds: float = 60
+
+
+class TokenBucket:
+    """Refills `rate_per_minute` units per minute up to `burst_seconds` worth of units."""
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 60):
+        self.rate = rate_per_minute / 60
+        self.capacity = self.rate * burst_seconds
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        # Set after a 429, nothing is granted before this time
+        self.paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken, 0 when it is available now."""
+        now = time.monotonic()
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        wait = max(0.0, self.paused_until - now)
+        if self.tokens < amount:
+            wait = max(wait, (amount - self.tokens) / self.rate)
+        return wait
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    sequence: int
+    tokens: float = field(compare=False)
+    fn: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    attempt: int = field(default=0, compare=False)
+
+
+class LLMScheduler:
+    """
+    Central queue for completions of every agent sharing an API key. Per model it
+    enforces requests/min and tokens/min with token buckets, serves interactive
+    requests before background ones, and retries 429/5xx with jittered exponential backoff.
+    Queues are bound to the event loop that submitted to them and recreated on a new loop
+    (e.g. the next `asyncio.run`), the rate limits carry over.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ModelLimits]] = None,
+        max_retries: int = OrchestratorConfig.MAX_RETRIES,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+    ):
+        self.limits = limits or {}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.throttled = 0
+        self._sequence = itertools.count()
+        self._queues: Dict[str, asyncio.PriorityQueue] = {}
+        # Event loop the queue and dispatcher of each model run on
+        self._loops: Dict[str, asyncio.AbstractEventLoop] = {}
+        self._dispatchers: Dict[str, asyncio.Task] = {}
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._running: Set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        model: str,
+        tokens: float = 0,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Any:
+        """Run `fn` (one completion call) once the limits of `model` allow it."""
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(model, _Job(priority, next(self._sequence), tokens, fn, future))
+        return await future
+
+    def _enqueue(self, model: str, job: _Job) -> None:
+        loop = asyncio.get_running_loop()
+        if model not in self._loops:
+            limits = self.limits.get(model, ModelLimits())
+            if limits.requests_per_minute:
+                self._request_buckets[model] = TokenBucket(
+                    limits.requests_per_minute, limits.burst_seconds
+                )
+            if limits.tokens_per_minute:
+                self._token_buckets[model] = TokenBucket(
+                    limits.tokens_per_minute, limits.burst_seconds
+                )
+        if self._loops.get(model) is not loop:
+            # The previous loop's dispatcher died with it and its queue can't be awaited here
+            self._loops[model] = loop
+            self._queues[model] = asyncio.PriorityQueue()
+            self._dispatchers.pop(model, None)
+        if model not in self._dispatchers or self._dispatchers[model].done():
+            self._dispatchers[model] = asyncio.create_task(self._dispatch(model))
+        self._queues[model].put_nowait(job)
+
+    def _wait_time(self, model: str, tokens: float) -> float:
+        wait = 0.0
+        if model in self._request_buckets:
+            wait = max(wait, self._request_buckets[model].wait_time(1))
+        if model in self._token_buckets:
+            wait = max(wait, self._token_buckets[model].wait_time(tokens))
+        return wait
+
+    async def _dispatch(self, model: str) -> None:
+        queue = self._queues[model]
+        while True:
+            job = await queue.get()
+            if job.future.cancelled():
+                continue
+
+            wait = self._wait_time(model, job.tokens)
+            while wait > 0:
+                await asyncio.sleep(wait)
+                # A higher priority job may have arrived while waiting
+                queue.put_nowait(job)
+                job = queue.get_nowait()
+                wait = self._wait_time(model, job.tokens)
+
+            if model in self._request_buckets:
+                self._request_buckets[model].take(1)
+            if model in self._token_buckets:
+                self._token_buckets[model].take(job.tokens)
+            task = asyncio.create_task(self._run(model, job))
+            # Keep a reference so the task isn't garbage collected mid-flight
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+            # A caller that gives up (e.g. a cancelled speculation) stops the call too
+            job.future.add_done_callback(
+                lambda future, task=task: task.cancel() if future.cancelled() else None
+            )
+
+    async def _run(self, model: str, job: _Job) -> None:
+        try:
+            result = await job.fn()
+        except Exception as error:
+            if not self.is_retryable(error) or job.attempt >= self.max_retries:
+                if not job.future.done():
+                    job.future.set_exception(error)
+                return
+
+            delay = self.backoff(job.attempt, error)
+            self.retries += 1
+            if getattr(error, "status_code", None) == 429:
+                # Shared key is throttled, hold every request of this model
+                self.throttled += 1
+                for buckets in (self._request_buckets, self._token_buckets):
+                    if model in buckets:
+                        buckets[model].pause(delay)
+            Logger.warning(
+                f"Retrying {model} completion in {delay:.2f}s "
+                f"(attempt {job.attempt + 1}/{self.max_retries}): {str(error)}"
+            )
+            await asyncio.sleep(delay)
+            job.attempt += 1
+            self._enqueue(model, job)
+            return
+
+        if not job.future.done():
+            job.future.set_result(result)
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        status_code = getattr(error, "status_code", None)
+        return status_code == 429 or (status_code is not None and status_code >= 500)
+
+    def backoff(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Full jitter exponential backoff, at least the server's Retry-After when given."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "queued": sum(queue.qsize() for queue in self._queues.values()),
+        }
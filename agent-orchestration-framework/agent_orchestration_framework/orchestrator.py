@@ -1,6 +1,6 @@
-from typing import Dict, Any, AsyncIterable, Optional, Union
+from typing import Dict, Any, AsyncIterable, List, Optional, Union
+import asyncio
 from dataclasses import dataclass, fields, asdict, replace
-import time
 
 from agent_orchestration_framework.types import (
     ConversationMessage,
@@ -8,6 +8,38 @@ from agent_orchestration_framework.types import (
     OrchestratorConfig,
 )
 from agent_orchestration_framework.utils import Logger
+from agent_orchestration_framework.utils.session_locks import SessionLocks
+from agent_orchestration_framework.utils.streams import ClosingStream
+from agent_orchestration_framework.utils.speculation import SpeculationTracker
+from agent_orchestration_framework.utils.tracing import (
+    CallbackExporter,
+    Span,
+    Tracer,
+    current_trace,
+    measure,
+    use_span,
+)
+from agent_orchestration_framework.storage.chat_storage import (
+    ChatStorage,
+    save_chat_messages,
+)
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.classifiers.classifier_cache import ClassifierCache
+from agent_orchestration_framework.llm.scheduler import LLMScheduler
+from agent_orchestration_framework.agents.manager_agent import (
+    ManagerAgent,
+    SubTask,
+    SubTaskResult,
+)
+from agent_orchestration_framework.classifiers.embedding_classifier import (
+    EmbeddingClassifier,
+)
 
 
 @dataclass
@@ -15,11 +47,15 @@ class MultiAgentOrchestrator:
     def __init__(
         self,
         options: Optional[OrchestratorConfig] = None,
-        storage=None,
+        storage: Optional[ChatStorage] = None,
+        classifier: Optional[Classifier] = None,
         logger=None,
+        tracer: Optional[Tracer] = None,
+        scheduler: Optional[LLMScheduler] = None,
         # Orchastrator where other agents will be added automatically to it's tools
         # By default none and we will create it.
         manager=None,
+        default_agent=None,
     ):
 
         DEFAULT_CONFIG = OrchestratorConfig()
@@ -37,34 +73,79 @@ class MultiAgentOrchestrator:
             )
 
         self.config = replace(DEFAULT_CONFIG, **asdict(options))
-        self.storage = storage
+        self.storage = storage or InMemoryChatStorage(
+            self.config.MAX_MESSAGE_PAIRS_PER_AGENT
+        )
 
         self.logger = Logger(self.config, logger)
         self.agents: Dict[str] = {}
-        self.storage = storage
-
-        self.execution_times: Dict[str, float] = {}
-        self.default_agent = default_agent or self.get_default_agent()
+        self.classifier = classifier or EmbeddingClassifier()
+
+        # One trace per request, spans are tracked through contextvars so
+        # concurrent requests don't overwrite each other's timings
+        self.tracer = tracer or Tracer(enabled=self.config.LOG_EXECUTION_TIMES)
+        if self.config.LOG_EXECUTION_TIMES:
+            self.tracer.exporters.append(
+                CallbackExporter(self.logger.print_execution_times)
+            )
+        self.classifier_cache = (
+            ClassifierCache(
+                self.config.CLASSIFIER_CACHE_SIZE,
+                self.config.CLASSIFIER_CACHE_TTL,
+                self.config.CLASSIFIER_CACHE_PER_SESSION,
+            )
+            if self.config.CLASSIFIER_CACHE_SIZE
+            else None
+        )
+        self.default_agent = default_agent
+        # Every agent submits its completions here so limits and retries are shared
+        self.scheduler = scheduler or LLMScheduler(
+            max_retries=self.config.MAX_RETRIES
+        )
+        self.session_locks = SessionLocks()
+        self.speculation = (
+            SpeculationTracker(self.config.SPECULATION_MIN_HIT_RATE)
+            if self.config.SPECULATIVE_EXECUTION
+            else None
+        )
+        self.manager = manager
+        if self.manager and self.manager.scheduler is None:
+            self.manager.scheduler = self.scheduler
 
-    def create_manager_agent(self):
-        from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+    def create_manager_agent(self) -> ManagerAgent:
+        from agent_orchestration_framework.agents.agent import AgentOptions
 
-        manager_agent = Agent(
+        # Not added to `self.agents`, the classifier should never route to it
+        manager_agent = ManagerAgent(
             AgentOptions(
                 name="Manager",
                 description="Manager agent to manage other agents",
                 model=None,
                 streaming=False,
                 tools=[],
+                save_chat=False,
+                scheduler=self.scheduler,
             )
         )
-        self.add_agent(manager_agent)
+        self.manager = manager_agent
+        return manager_agent
 
     def add_agent(self, agent):
         if agent.id in self.agents:
             raise ValueError(f"An agent with ID '{agent.id}' already exists.")
         self.agents[agent.id] = agent
+        if agent.scheduler is None:
+            agent.scheduler = self.scheduler
         self.classifier.set_agents(self.agents)
+        if self.classifier_cache:
+            # Cached decisions were made without this agent
+            self.classifier_cache.clear()
+
+    def get_default_agent(self):
+        return self.default_agent
+
+    def set_default_agent(self, agent) -> None:
+        self.default_agent = agent
 
     def get_all_agents(self) -> Dict[str, Dict[str, str]]:
         return {
@@ -86,16 +167,34 @@ class MultiAgentOrchestrator:
                 Could you please be more specific?"
 
         selected_agent = classifier_result.selected_agent
-        agent_chat_history = await self.storage.fetch_chat(
-            user_id, session_id, selected_agent.id
+        fetch_chat = self.measure_execution_time(
+            "Fetching chat history",
+            lambda: self.storage.fetch_chat(
+                user_id,
+                session_id,
+                selected_agent.id,
+                self.config.MAX_MESSAGE_PAIRS_PER_AGENT,
+            ),
         )
+        retrieved_context = None
+        if self.config.OVERLAP_RETRIEVAL and selected_agent.retriever:
+            agent_chat_history, retrieved_context = await asyncio.gather(
+                fetch_chat, selected_agent.retrieve_context(user_input)
+            )
+        else:
+            agent_chat_history = await fetch_chat
 
         self.logger.print_chat_history(agent_chat_history, selected_agent.id)
 
         response = await self.measure_execution_time(
             f"Agent {selected_agent.name} | Processing request",
             lambda: selected_agent.process_request(
-                user_input, user_id, session_id, agent_chat_history, additional_params
+                user_input,
+                user_id,
+                session_id,
+                agent_chat_history,
+                additional_params,
+                retrieved_context=retrieved_context,
             ),
         )
 
@@ -108,35 +207,60 @@ class MultiAgentOrchestrator:
         session_id: str,
         classifier_result,
         additional_params: Dict[str, str] = {},
+        agent_response=None,
     ):
-        """Process agent response and handle chat storage."""
+        """Process agent response and handle chat storage.
+
+        `agent_response` is set when the agent already ran speculatively.
+        """
         try:
-            agent_response = await self.dispatch_to_agent(
-                {
-                    "user_input": user_input,
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "classifier_result": classifier_result,
-                    "additional_params": additional_params,
-                }
-            )
+            if agent_response is None:
+                agent_response = await self.dispatch_to_agent(
+                    {
+                        "user_input": user_input,
+                        "user_id": user_id,
+                        "session_id": session_id,
+                        "classifier_result": classifier_result,
+                        "additional_params": additional_params,
+                    }
+                )
 
             metadata = self.create_metadata(
                 classifier_result, user_input, user_id, session_id, additional_params
             )
 
-            await self.save_message(
-                ConversationMessage(
-                    role=ParticipantRole.USER.value, content=[{"text": user_input}]
-                ),
-                user_id,
-                session_id,
-                classifier_result.selected_agent,
+            user_message = ConversationMessage(
+                role=ParticipantRole.USER.value, content=[{"text": user_input}]
             )
 
             if isinstance(agent_response, ConversationMessage):
-                await self.save_message(
-                    agent_response,
+                await self.save_messages(
+                    [user_message, agent_response],
+                    user_id,
+                    session_id,
+                    classifier_result.selected_agent,
+                )
+            elif classifier_result.selected_agent.is_streaming_enabled():
+                # Both messages are saved together once the stream is consumed.
+                # That happens after route_request returned, so keep the trace open until then.
+                trace = current_trace()
+                if trace:
+                    trace.deferred = True
+                agent_response = ClosingStream(
+                    self.stream_and_save_response(
+                        agent_response,
+                        user_message,
+                        user_id,
+                        session_id,
+                        classifier_result.selected_agent,
+                        trace,
+                    ),
+                    # The generator only ends the trace once started
+                    lambda: trace and self.tracer.end_trace(trace),
+                )
+            else:
+                await self.save_messages(
+                    [user_message],
                     user_id,
                     session_id,
                     classifier_result.selected_agent,
@@ -153,6 +277,99 @@ class MultiAgentOrchestrator:
             self.logger.error(f"Error during agent processing: {str(error)}")
             raise error
 
+    async def classify_request(
+        self, user_input: str, user_id: str, session_id: str
+    ) -> ClassifierResult:
+        """Classify user request and fallback to the default agent if configured."""
+        try:
+            cache_key = None
+            classifier_result = None
+            if self.classifier_cache:
+                cache_key = self.classifier_cache.make_key(user_input, session_id)
+                classifier_result = self.classifier_cache.get(cache_key)
+
+            if classifier_result is None:
+                # Only fetched when the classifier reads it
+                async def load_history() -> List[ConversationMessage]:
+                    return (
+                        await self.measure_execution_time(
+                            "Fetching all chats",
+                            lambda: self.storage.fetch_all_chats(user_id, session_id),
+                        )
+                        or []
+                    )
+
+                classifier_result = await self.measure_execution_time(
+                    "Classifying user intent",
+                    lambda: self.classifier.classify_lazily(user_input, load_history),
+                )
+                if cache_key is not None:
+                    self.classifier_cache.set(cache_key, classifier_result)
+
+            if self.config.LOG_CLASSIFIER_OUTPUT:
+                self.print_intent(user_input, classifier_result)
+
+            if (
+                not classifier_result.selected_agent
+                and self.config.USE_DEFAULT_AGENT_IF_NONE_IDENTIFIED
+                and self.default_agent
+            ):
+                classifier_result = self.get_fallback_result()
+                self.logger.info("Using default agent as no agent was selected")
+
+            return classifier_result
+
+        except Exception as error:
+            self.logger.error(f"Error during intent classification: {str(error)}")
+            raise error
+
+    async def stream_and_save_response(
+        self,
+        agent_response: AsyncIterable[str],
+        user_message: ConversationMessage,
+        user_id: str,
+        session_id: str,
+        agent,
+        trace: Optional[Span],
+    ) -> AsyncIterable[str]:
+        """Forward tokens to the caller and save the assembled message once the stream ends."""
+        accumulated_message = []
+        if trace:
+            # Measured from the start of the request, as seen by the user
+            first_token_span = trace.child(
+                f"Agent {agent.name} | Time to first token", start=trace.start
+            )
+            stream_span = trace.child(
+                f"Agent {agent.name} | Streaming response", start=trace.start
+            )
+
+        try:
+            async for chunk in agent_response:
+                if not accumulated_message and trace:
+                    first_token_span.finish()
+                accumulated_message.append(chunk)
+                yield chunk
+
+            if trace:
+                stream_span.finish()
+
+            with use_span(trace):
+                await self.save_messages(
+                    [
+                        user_message,
+                        ConversationMessage(
+                            role=ParticipantRole.ASSISTANT.value,
+                            content=[{"text": "".join(accumulated_message)}],
+                        ),
+                    ],
+                    user_id,
+                    session_id,
+                    agent,
+                )
+        finally:
+            if trace:
+                self.tracer.end_trace(trace)
+
     async def route_request(
         self,
         user_input: str,
@@ -160,79 +377,305 @@ class MultiAgentOrchestrator:
         session_id: str,
         additional_params: Dict[str, str] = {},
     ):
-        """Route user request to appropriate agent."""
-        self.execution_times.clear()
-
-        try:
-            classifier_result = await self.classify_request(
-                user_input, user_id, session_id
-            )
+        """Route user request to appropriate agent.
+
+        With SERIALIZE_SESSION_REQUESTS a streamed response keeps its session locked
+        until the stream is consumed, closed with `aclose()` or dropped.
+        """
+        session_key = (user_id, session_id)
+        locked = False
+        with self.tracer.trace(
+            "Route request", user_id=user_id, session_id=session_id
+        ):
+            try:
+                if self.config.SERIALIZE_SESSION_REQUESTS:
+                    await self.measure_execution_time(
+                        "Waiting for session",
+                        lambda: self.session_locks.acquire(session_key),
+                    )
+                    locked = True
+
+                decomposition = self.start_decomposition(user_input)
+                speculation = self.start_speculation(
+                    user_input, user_id, session_id, additional_params
+                )
+                try:
+                    classifier_result = await self.classify_request(
+                        user_input, user_id, session_id
+                    )
+                    tasks = await decomposition if decomposition else None
+                    if tasks and len(tasks) > 1:
+                        response = await self.fan_out_request(
+                            user_input, user_id, session_id, tasks, additional_params
+                        )
+                        if response is not None:
+                            if speculation:
+                                self.cancel_speculation(speculation)
+                            return response
+                except BaseException:
+                    if decomposition:
+                        decomposition.cancel()
+                    if speculation:
+                        self.cancel_speculation(speculation)
+                    raise
+                agent_response = (
+                    await self.resolve_speculation(speculation, classifier_result)
+                    if speculation
+                    else None
+                )
 
-            if not classifier_result.selected_agent:
+                if not classifier_result.selected_agent:
+                    # TODO: return this later as class `AgentResponse`
+                    return {
+                        "metadata": self.create_metadata(
+                            classifier_result,
+                            user_input,
+                            user_id,
+                            session_id,
+                            additional_params,
+                        ),
+                        "output": ConversationMessage(
+                            role=ParticipantRole.ASSISTANT.value,
+                            content=[
+                                {"text": self.config.NO_SELECTED_AGENT_MESSAGE}
+                            ],
+                        ),
+                        "streaming": False,
+                    }
+
+                response = await self.agent_process_request(
+                    user_input,
+                    user_id,
+                    session_id,
+                    classifier_result,
+                    additional_params,
+                    agent_response,
+                )
+                if self.speculation:
+                    self.speculation.remember(
+                        session_key, classifier_result.selected_agent.id
+                    )
+                if locked and response["streaming"]:
+                    # History is saved once the stream ends, the next turn has to wait for it
+                    response["output"] = ClosingStream(
+                        response["output"],
+                        lambda: self.session_locks.release(session_key),
+                    )
+                    locked = False
+                return response
+
+            except Exception as error:
                 # TODO: return this later as class `AgentResponse`
                 return {
                     "metadata": self.create_metadata(
-                        classifier_result,
-                        user_input,
-                        user_id,
-                        session_id,
-                        additional_params,
-                    ),
-                    "output": ConversationMessage(
-                        role=ParticipantRole.ASSISTANT.value,
-                        content=[{"text": self.config.NO_SELECTED_AGENT_MESSAGE}],
+                        None, user_input, user_id, session_id, additional_params
                     ),
+                    "output": self.config.GENERAL_ROUTING_ERROR_MSG_MESSAGE
+                    or str(error),
                     "streaming": False,
                 }
 
-            return await self.agent_process_request(
-                user_input, user_id, session_id, classifier_result, additional_params
+            finally:
+                if locked:
+                    self.session_locks.release(session_key)
+                if self.classifier_cache:
+                    self.logger.print_cache_stats(
+                        "Classifier Cache", self.classifier_cache.stats()
+                    )
+                if self.speculation:
+                    self.logger.print_cache_stats(
+                        "Speculative Execution", self.speculation.stats()
+                    )
+                for agent in self.agents.values():
+                    for title, stats in agent.cache_stats().items():
+                        self.logger.print_cache_stats(f"Agent {agent.name} | {title}", stats)
+
+    def start_decomposition(self, user_input: str) -> Optional[asyncio.Future]:
+        """
+        Decompose the request while the classifier decides, single-part requests then
+        wait for the slower of the two instead of both. None when fan-out is disabled
+        or the request obviously has one part.
+        """
+        if not self.config.FAN_OUT_ENABLED:
+            return None
+        manager = self.manager or self.create_manager_agent()
+        if not manager.may_have_several_parts(user_input):
+            return None
+        return asyncio.ensure_future(
+            self.measure_execution_time(
+                "Decomposing request",
+                lambda: manager.decompose(user_input, self.agents),
             )
+        )
 
-        except Exception as error:
-            # TODO: return this later as class `AgentResponse`
-            return {
-                "metadata": self.create_metadata(
-                    None, user_input, user_id, session_id, additional_params
+    def start_speculation(
+        self,
+        user_input: str,
+        user_id: str,
+        session_id: str,
+        additional_params: Dict[str, str],
+    ):
+        """Run the session's previous agent while the classifier decides."""
+        if not self.speculation or not self.speculation.should_speculate():
+            return None
+        agent = self.agents.get(self.speculation.last_agent((user_id, session_id)))
+        # Streamed completions only start once iterated, there is nothing to win
+        if agent is None or agent.is_streaming_enabled():
+            return None
+
+        task = asyncio.ensure_future(
+            self.measure_execution_time(
+                f"Speculating {agent.name}",
+                lambda: self.dispatch_to_agent(
+                    {
+                        "user_input": user_input,
+                        "user_id": user_id,
+                        "session_id": session_id,
+                        "classifier_result": ClassifierResult(agent, 1.0),
+                        "additional_params": additional_params,
+                    }
                 ),
-                "output": self.config.GENERAL_ROUTING_ERROR_MSG_MESSAGE or str(error),
-                "streaming": False,
-            }
+            )
+        )
+        return agent, task
+
+    async def resolve_speculation(self, speculation, classifier_result: ClassifierResult):
+        """Response of the speculative run when the classifier agrees, None otherwise."""
+        agent, task = speculation
+        hit = classifier_result.selected_agent is agent
+        self.speculation.record(hit)
+        if hit:
+            return await task
+        self.cancel_speculation(speculation)
+        return None
+
+    @staticmethod
+    def cancel_speculation(speculation) -> None:
+        _, task = speculation
+        task.cancel()
+        # Nothing awaits it anymore, don't let a failure surface as "never retrieved"
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    async def fan_out_request(
+        self,
+        user_input: str,
+        user_id: str,
+        session_id: str,
+        tasks: List[SubTask],
+        additional_params: Dict[str, str] = {},
+    ):
+        """
+        Run the sub-tasks concurrently and merge whatever finished before the deadline.
+        Returns None when the sub-tasks all go to one agent, the request is then better
+        handled whole by the single agent path.
+        """
+        semaphore = asyncio.Semaphore(self.config.FAN_OUT_MAX_PARALLEL)
+
+        async def resolve(task: SubTask) -> SubTask:
+            if task.agent_id in self.agents:
+                return task
+            async with semaphore:
+                classifier_result = await self.classify_request(
+                    task.input_text, user_id, session_id
+                )
+            agent = classifier_result.selected_agent
+            return SubTask(task.input_text, agent.id if agent else None)
 
-        finally:
-            self.logger.print_execution_times(self.execution_times)
+        # Sub-tasks left to the classifier can land on the same agent, merge them too
+        tasks = ManagerAgent.merge_tasks(
+            list(await asyncio.gather(*(resolve(task) for task in tasks)))
+        )
+        if len(tasks) < 2:
+            return None
+        results = [SubTaskResult(task, self.agents.get(task.agent_id)) for task in tasks]
+
+        async def run(result: SubTaskResult):
+            async with semaphore:
+                if result.agent is None:
+                    return
+
+                response = await self.dispatch_to_agent(
+                    {
+                        "user_input": result.task.input_text,
+                        "user_id": user_id,
+                        "session_id": session_id,
+                        "classifier_result": ClassifierResult(result.agent, 1.0),
+                        "additional_params": additional_params,
+                    }
+                )
+                if not isinstance(response, ConversationMessage):
+                    # Streaming agents are drained, the merged answer is a single message
+                    response = ConversationMessage(
+                        role=ParticipantRole.ASSISTANT.value,
+                        content=[{"text": "".join([chunk async for chunk in response])}],
+                    )
+                result.response = response
+
+                await self.save_messages(
+                    [
+                        ConversationMessage(
+                            role=ParticipantRole.USER.value,
+                            content=[{"text": result.task.input_text}],
+                        ),
+                        response,
+                    ],
+                    user_id,
+                    session_id,
+                    result.agent,
+                )
+
+        running = {asyncio.ensure_future(run(result)): result for result in results}
+        done, pending = await asyncio.wait(
+            running, timeout=self.config.FAN_OUT_DEADLINE
+        )
+        for task in pending:
+            task.cancel()
+            running[task].timed_out = True
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            self.logger.warning(
+                f"Fan-out deadline reached, {len(pending)} of {len(tasks)} sub-tasks unanswered"
+            )
+        for task in done:
+            if task.exception():
+                running[task].error = str(task.exception())
+                self.logger.error(f"Error during fan-out: {running[task].error}")
+
+        metadata = self.create_metadata(
+            ClassifierResult(self.manager, 1.0),
+            user_input,
+            user_id,
+            session_id,
+            additional_params,
+        )
+        metadata["sub_agents"] = [
+            result.agent.id if result.agent else None for result in results
+        ]
+        metadata["partial"] = bool(pending)
+
+        # TODO: return this later as class `AgentResponse`
+        return {
+            "metadata": metadata,
+            "output": self.manager.merge(results),
+            "streaming": False,
+        }
 
     def print_intent(self, user_input: str, intent_classifier_result) -> None:
         """Print the classified intent."""
         self.logger.log_header("Classified Intent")
-        self.logger.info(f"> Text: {user_input}")
+        self.logger.info("> Text: %s", user_input)
         selected_agent_string = (
             intent_classifier_result.selected_agent.name
             if intent_classifier_result.selected_agent
             else "No agent selected"
         )
-        self.logger.info(f"> Selected Agent: {selected_agent_string}")
-        self.logger.info(f"> Confidence: {intent_classifier_result.confidence:.2f}")
+        self.logger.info("> Selected Agent: %s", selected_agent_string)
+        self.logger.info("> Confidence: %.2f", intent_classifier_result.confidence)
         self.logger.info("")
 
     async def measure_execution_time(self, timer_name: str, fn):
-        if not self.config.LOG_EXECUTION_TIMES:
-            return await fn()
-
-        start_time = time.time()
-        self.execution_times[timer_name] = start_time
-
-        try:
-            result = await fn()
-            end_time = time.time()
-            duration = end_time - start_time
-            self.execution_times[timer_name] = duration
-            return result
-        except Exception as error:
-            end_time = time.time()
-            duration = end_time - start_time
-            self.execution_times[timer_name] = duration
-            raise error
+        """Run `fn` inside a span of the current request trace."""
+        return await measure(timer_name, fn)
 
     def create_metadata(
         self,
@@ -253,16 +696,18 @@ class MultiAgentOrchestrator:
         }
 
         if not intent_classifier_result or not intent_classifier_result.selected_agent:
-            base_metadata.additional_params["error_type"] = "classification_failed"
+            base_metadata["additional_params"] = {
+                **(additional_params or {}),
+                "error_type": "classification_failed",
+            }
         else:
-            base_metadata.agent_id = intent_classifier_result.selected_agent.id
-            base_metadata.agent_name = intent_classifier_result.selected_agent.name
+            base_metadata["agent_id"] = intent_classifier_result.selected_agent.id
+            base_metadata["agent_name"] = intent_classifier_result.selected_agent.name
 
         return base_metadata
 
-    def get_fallback_result(self):
-        # TODO: Return this as ClassifierResult
-        return {"selected_agent": self.get_default_agent(), "confidence": 0}
+    def get_fallback_result(self) -> ClassifierResult:
+        return ClassifierResult(selected_agent=self.get_default_agent(), confidence=0)
 
     async def save_message(
         self, message: ConversationMessage, user_id: str, session_id: str, agent
@@ -275,3 +720,24 @@ class MultiAgentOrchestrator:
                 message,
                 self.config.MAX_MESSAGE_PAIRS_PER_AGENT,
             )
+
+    async def save_messages(
+        self,
+        messages: List[ConversationMessage],
+        user_id: str,
+        session_id: str,
+        agent,
+    ):
+        """Save the messages of one turn in a single storage call when the backend supports it."""
+        if agent and agent.save_chat:
+            return await self.measure_execution_time(
+                "Saving chat messages",
+                lambda: save_chat_messages(
+                    self.storage,
+                    user_id,
+                    session_id,
+                    agent.id,
+                    messages,
+                    self.config.MAX_MESSAGE_PAIRS_PER_AGENT,
+                ),
+            )
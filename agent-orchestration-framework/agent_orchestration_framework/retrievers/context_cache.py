@@ -0,0 +1,46 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import re
+import time
+
+
+class ContextCache:
+    """LRU + TTL cache of combined retrieval context keyed on the normalized query."""
+
+    def __init__(self, max_size: int = 1000, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        text = re.sub(r"\s+", " ", query.strip().lower())
+        return text.rstrip("?!. ")
+
+    def get(self, query: str) -> Optional[str]:
+        key = self.normalize(query)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, query: str, context: str) -> None:
+        key = self.normalize(query)
+        self._entries[key] = (time.monotonic() + self.ttl, context)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
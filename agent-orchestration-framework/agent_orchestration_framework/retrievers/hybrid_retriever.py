@@ -0,0 +1,176 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import math
+import re
+import threading
+
+import numpy as np
+
+from agent_orchestration_framework.classifiers.embedding_classifier import (
+    Embedder,
+    HashingEmbedder,
+)
+from agent_orchestration_framework.retrievers.context_cache import ContextCache
+from agent_orchestration_framework.retrievers.retriever import (
+    RetrievedDocument,
+    Retriever,
+)
+
+
+class HybridRetriever(Retriever):
+    """
+    Local in-memory index that ranks documents by BM25 and by embedding similarity,
+    then merges both rankings with reciprocal rank fusion. Searches run in worker
+    threads, a lock keeps them from reading the index while documents are added.
+    """
+
+    def __init__(
+        self,
+        documents: Optional[List[str]] = None,
+        embedder: Optional[Embedder] = None,
+        top_k: int = 4,
+        max_context_tokens: Optional[int] = None,
+        cache: Optional[ContextCache] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        # Candidates taken from each ranking before fusion
+        candidates: int = 50,
+        rrf_k: int = 60,
+    ):
+        super().__init__(top_k, max_context_tokens, cache)
+        self.embedder = embedder or HashingEmbedder()
+        self.k1 = k1
+        self.b = b
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+
+        self.documents: List[RetrievedDocument] = []
+        self.document_lengths = np.zeros(0, dtype=np.float32)
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+        # term -> (document indexes, term frequencies)
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._postings_arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+        if documents:
+            self.add_documents(documents)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return re.findall(r"[a-z0-9]+", text.lower())
+
+    def add_documents(
+        self,
+        texts: List[str],
+        ids: Optional[List[str]] = None,
+        metadata: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        # Tokenized and embedded before taking the lock, searches only wait for the update
+        term_counts = [Counter(self.tokenize(text)) for text in texts]
+        lengths = np.asarray(
+            [sum(terms.values()) for terms in term_counts], dtype=np.float32
+        )
+        vectors = np.asarray(self.embedder(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            start = len(self.documents)
+            for offset, (text, terms) in enumerate(zip(texts, term_counts)):
+                index = start + offset
+                self.documents.append(
+                    RetrievedDocument(
+                        text=text,
+                        score=0.0,
+                        id=ids[offset] if ids else str(index),
+                        metadata=metadata[offset] if metadata else {},
+                    )
+                )
+                for term, frequency in terms.items():
+                    indexes, frequencies = self._postings.setdefault(term, ([], []))
+                    indexes.append(index)
+                    frequencies.append(frequency)
+                    self._postings_arrays.pop(term, None)
+
+            self.document_lengths = np.concatenate([self.document_lengths, lengths])
+            self.embeddings = (
+                vectors
+                if not len(self.embeddings)
+                else np.vstack([self.embeddings, vectors])
+            )
+        if self.cache:
+            # Cached contexts were built without the new documents
+            self.cache.clear()
+
+    def _postings_for(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._postings_arrays.get(term)
+        if arrays is None and term in self._postings:
+            indexes, frequencies = self._postings[term]
+            arrays = (
+                np.asarray(indexes, dtype=np.int64),
+                np.asarray(frequencies, dtype=np.float32),
+            )
+            self._postings_arrays[term] = arrays
+        return arrays
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        count = len(self.documents)
+        scores = np.zeros(count, dtype=np.float32)
+        if not count:
+            return scores
+        length_norm = self.k1 * (
+            1 - self.b + self.b * self.document_lengths / self.document_lengths.mean()
+        )
+        for term in set(self.tokenize(query)):
+            postings = self._postings_for(term)
+            if postings is None:
+                continue
+            indexes, frequencies = postings
+            idf = math.log(1 + (count - len(indexes) + 0.5) / (len(indexes) + 0.5))
+            scores[indexes] += (
+                idf * frequencies * (self.k1 + 1) / (frequencies + length_norm[indexes])
+            )
+        return scores
+
+    def dense_scores(self, query: str) -> np.ndarray:
+        if not len(self.documents):
+            return np.zeros(0, dtype=np.float32)
+        vector = np.asarray(self.embedder([query]), dtype=np.float32)[0]
+        norm = np.linalg.norm(vector)
+        return self.embeddings @ (vector / norm if norm else vector)
+
+    def _top(self, scores: np.ndarray) -> np.ndarray:
+        candidates = min(self.candidates, int(np.count_nonzero(scores > 0)))
+        if not candidates:
+            return np.zeros(0, dtype=np.int64)
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        return top[np.argsort(-scores[top])]
+
+    def search(self, query: str, top_k: Optional[int] = None) -> List[RetrievedDocument]:
+        fused: Dict[int, float] = {}
+        # Documents are only ever appended, the indexes stay valid after the lock
+        with self._lock:
+            rankings = (
+                self._top(self.bm25_scores(query)),
+                self._top(self.dense_scores(query)),
+            )
+        for ranking in rankings:
+            for rank, index in enumerate(ranking.tolist()):
+                fused[index] = fused.get(index, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+
+        best = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+        return [
+            RetrievedDocument(
+                text=self.documents[index].text,
+                score=score,
+                id=self.documents[index].id,
+                metadata=self.documents[index].metadata,
+            )
+            for index, score in best[: top_k or self.top_k]
+        ]
+
+    async def retrieve(self, text: str, top_k: int) -> List[RetrievedDocument]:
+        # Off the event loop so the history fetch proceeds meanwhile. The BM25 term loop
+        # is Python and holds the GIL, only the NumPy products release it
+        return await asyncio.to_thread(self.search, text, top_k)
@@ -0,0 +1,60 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from agent_orchestration_framework.agents.history_window import estimate_tokens
+from agent_orchestration_framework.retrievers.context_cache import ContextCache
+
+
+@dataclass
+class RetrievedDocument:
+    text: str
+    score: float
+    id: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class Retriever(ABC):
+    """
+    Context source for `AgentOptions.retriever`. At most `top_k` documents are combined,
+    and documents are skipped once `max_context_tokens` would be exceeded.
+    """
+
+    def __init__(
+        self,
+        top_k: int = 4,
+        max_context_tokens: Optional[int] = None,
+        cache: Optional[ContextCache] = None,
+    ):
+        self.top_k = top_k
+        self.max_context_tokens = max_context_tokens
+        self.cache = cache
+
+    @abstractmethod
+    async def retrieve(self, text: str, top_k: int) -> List[RetrievedDocument]:
+        pass
+
+    def combine(self, documents: List[RetrievedDocument]) -> str:
+        texts = []
+        tokens = 0
+        for document in documents[: self.top_k]:
+            document_tokens = estimate_tokens(document.text)
+            if (
+                self.max_context_tokens is not None
+                and tokens + document_tokens > self.max_context_tokens
+            ):
+                break
+            texts.append(document.text)
+            tokens += document_tokens
+        return "\n\n".join(texts)
+
+    async def retrieve_and_combine_results(self, text: str) -> str:
+        if self.cache:
+            context = self.cache.get(text)
+            if context is not None:
+                return context
+
+        context = self.combine(await self.retrieve(text, self.top_k))
+        if self.cache:
+            self.cache.set(text, context)
+        return context
@@ -0,0 +1,43 @@
+from bisect import bisect
+from typing import Dict, Iterable, List
+import hashlib
+
+
+class HashRing:
+    """
+    Consistent hashing of keys (session ids) onto nodes (workers). Each node owns
+    `replicas` points on the ring, adding or removing one only moves ~1/N of the keys.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 100):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def hash(key: str) -> int:
+        # Stable across processes, unlike `hash()`
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def add(self, node: str) -> None:
+        for replica in range(self.replicas):
+            point = self.hash(f"{node}#{replica}")
+            self._owners[point] = node
+        self._points = sorted(self._owners)
+
+    def remove(self, node: str) -> None:
+        self._owners = {
+            point: owner for point, owner in self._owners.items() if owner != node
+        }
+        self._points = sorted(self._owners)
+
+    def node_for(self, key: str) -> str:
+        if not self._points:
+            raise LookupError("The hash ring has no nodes")
+        index = bisect(self._points, self.hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+    def __len__(self) -> int:
+        return len(set(self._owners.values()))
@@ -0,0 +1,578 @@
+"""
+Multi-process serving. A dispatcher accepts HTTP requests and forwards each one to the
+worker process that owns its session_id on a consistent hash ring, so turns of a session
+always meet the same orchestrator (ordering, caches). Every worker builds its own
+MultiAgentOrchestrator with `factory`, given as "package.module:function".
+
+    python -m agent_orchestration_framework.serving.server --factory app:create_orchestrator --workers 4
+
+POST /route    {"user_input", "user_id", "session_id", "additional_params"}
+GET  /health   200 when every worker is alive, 503 otherwise or while draining
+GET  /metrics  counters of the dispatcher and of every worker
+
+SIGTERM/SIGINT drain: new connections are refused, requests in flight finish
+(up to `drain_timeout` seconds), then the workers stop.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import importlib
+import json
+import multiprocessing
+import signal
+import time
+
+from agent_orchestration_framework.serving.hash_ring import HashRing
+from agent_orchestration_framework.types import ConversationMessage
+from agent_orchestration_framework.utils import Logger
+
+Head = Tuple[str, Dict[str, str]]
+
+
+def load_factory(path: str) -> Callable[[], Any]:
+    module_name, _, function_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+async def read_head(reader: asyncio.StreamReader) -> Optional[Head]:
+    """Start line and lower cased headers, None once the peer closed the connection."""
+    try:
+        data = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    lines = data.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, separator, value = line.partition(":")
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+
+async def read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+    length = int(headers.get("content-length", 0))
+    return await reader.readexactly(length) if length else b""
+
+
+def encode_head(start_line: str, headers: Dict[str, str]) -> bytes:
+    lines = [start_line, *(f"{name}: {value}" for name, value in headers.items())]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def json_response(status: int, payload: Any, keep_alive: bool = True) -> bytes:
+    body = json.dumps(payload, default=str).encode()
+    head = encode_head(
+        f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}",
+        {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+        },
+    )
+    return head + body
+
+
+def wants_keep_alive(headers: Dict[str, str]) -> bool:
+    """HTTP/1.1 connections stay open unless the client sent `Connection: close`."""
+    return headers.get("connection", "").lower() != "close"
+
+
+def encode_chunk(data: bytes) -> bytes:
+    return f"{len(data):x}\r\n".encode() + data + b"\r\n"
+
+
+async def close_connections(connections: Dict[asyncio.Task, asyncio.StreamWriter]) -> None:
+    """Close idle keep-alive connections so their handlers return instead of being cancelled."""
+    for writer in list(connections.values()):
+        writer.close()
+    if connections:
+        await asyncio.wait(list(connections), timeout=1)
+
+
+def output_text(output: Any) -> str:
+    if isinstance(output, ConversationMessage):
+        return output.text
+    return "" if output is None else str(output)
+
+
+class Worker:
+    """HTTP front of one orchestrator, runs inside a worker process."""
+
+    def __init__(self, orchestrator):
+        self.orchestrator = orchestrator
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.draining = False
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self, host: str) -> int:
+        self.server = await asyncio.start_server(self.handle_connection, host, 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "pid": multiprocessing.current_process().pid,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "active_sessions": len(self.orchestrator.session_locks),
+            "scheduler": self.orchestrator.scheduler.stats(),
+        }
+
+    async def handle_connection(self, reader, writer) -> None:
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while not self.draining:
+                head = await read_head(reader)
+                if head is None:
+                    break
+                start_line, headers = head
+                method, path, _ = start_line.split(" ", 2)
+                body = await read_body(reader, headers)
+                keep_alive = wants_keep_alive(headers) and not self.draining
+
+                if path == "/health":
+                    writer.write(json_response(200, {"status": "ok"}, keep_alive))
+                elif path == "/metrics":
+                    writer.write(json_response(200, self.metrics(), keep_alive))
+                elif method == "POST" and path == "/route":
+                    await self.route(body, writer, keep_alive)
+                else:
+                    writer.write(
+                        json_response(404, {"error": f"No route {path}"}, keep_alive)
+                    )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def route(
+        self, body: bytes, writer: asyncio.StreamWriter, keep_alive: bool = True
+    ) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.idle.clear()
+        streaming = False
+        try:
+            request = json.loads(body)
+            response = await self.orchestrator.route_request(
+                request["user_input"],
+                request["user_id"],
+                request["session_id"],
+                request.get("additional_params") or {},
+            )
+            metadata = response["metadata"]
+            if not response["streaming"]:
+                writer.write(
+                    json_response(
+                        200,
+                        {
+                            "metadata": metadata,
+                            "output": output_text(response["output"]),
+                            "streaming": False,
+                        },
+                        keep_alive,
+                    )
+                )
+                return
+
+            # Tokens are relayed as they come, the metadata travels in the headers
+            streaming = True
+            writer.write(
+                encode_head(
+                    "HTTP/1.1 200 OK",
+                    {
+                        "Content-Type": "text/plain; charset=utf-8",
+                        "Transfer-Encoding": "chunked",
+                        "Connection": "keep-alive" if keep_alive else "close",
+                        "X-Agent-Id": metadata["agent_id"],
+                        "X-Agent-Name": metadata["agent_name"],
+                    },
+                )
+            )
+            async for chunk in response["output"]:
+                if chunk:
+                    writer.write(encode_chunk(str(chunk).encode()))
+                    await writer.drain()
+            writer.write(encode_chunk(b""))
+        except (KeyError, ValueError) as error:
+            self.errors += 1
+            if streaming:
+                # Raised by the agent stream, the chunked body has already started
+                Logger.error(f"Error serving request: {str(error)}")
+                writer.close()
+            else:
+                writer.write(
+                    json_response(400, {"error": f"Invalid request: {error}"}, keep_alive)
+                )
+        except Exception as error:
+            self.errors += 1
+            Logger.error(f"Error serving request: {str(error)}")
+            if streaming:
+                # Too late for an error status, cut the stream short instead
+                writer.close()
+            else:
+                writer.write(json_response(500, {"error": str(error)}, keep_alive))
+        finally:
+            self.in_flight -= 1
+            if not self.in_flight:
+                self.idle.set()
+
+    async def drain(self, timeout: float) -> None:
+        self.draining = True
+        self.server.close()
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            Logger.warning(f"Worker stopped with {self.in_flight} requests in flight")
+        await close_connections(self.connections)
+
+
+def _run_worker(factory_path: str, host: str, drain_timeout: float, ready) -> None:
+    # The dispatcher coordinates shutdown, a Ctrl+C reaches the whole process group
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    async def main():
+        factory = load_factory(factory_path)
+        orchestrator = factory()
+        if asyncio.iscoroutine(orchestrator):
+            orchestrator = await orchestrator
+        worker = Worker(orchestrator)
+        port = await worker.start(host)
+
+        stopped = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+        ready.put(port)
+        await stopped.wait()
+        await worker.drain(drain_timeout)
+
+    asyncio.run(main())
+
+
+@dataclass
+class WorkerProcess:
+    name: str
+    process: Any = None
+    port: int = 0
+    forwarded: int = 0
+    restarts: int = 0
+    # Idle keep-alive connections to the worker
+    connections: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = field(
+        default_factory=list
+    )
+
+
+class Dispatcher:
+    def __init__(
+        self,
+        factory: str,
+        workers: int = 2,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        drain_timeout: float = 30,
+        replicas: int = 100,
+        max_idle_connections: int = 64,
+    ):
+        self.factory = factory
+        self.host = host
+        self.port = port
+        self.drain_timeout = drain_timeout
+        self.max_idle_connections = max_idle_connections
+        self.workers = {
+            f"worker-{index}": WorkerProcess(f"worker-{index}") for index in range(workers)
+        }
+        self.ring = HashRing(self.workers, replicas)
+        self.context = multiprocessing.get_context("spawn")
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.draining = False
+        self.idle = asyncio.Event()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._monitor: Optional[asyncio.Task] = None
+
+    async def spawn(self, worker: WorkerProcess) -> None:
+        ready = self.context.Queue()
+        worker.process = self.context.Process(
+            target=_run_worker,
+            args=(self.factory, self.host, self.drain_timeout, ready),
+            name=worker.name,
+            daemon=True,
+        )
+        worker.process.start()
+        worker.port = await asyncio.to_thread(ready.get, True, 60)
+        worker.connections.clear()
+
+    async def start(self) -> int:
+        self.idle.set()
+        await asyncio.gather(*[self.spawn(worker) for worker in self.workers.values()])
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        self._monitor = asyncio.create_task(self.monitor())
+        Logger.info(
+            "Serving on http://%s:%s with %d workers", self.host, self.port, len(self.workers)
+        )
+        return self.port
+
+    async def monitor(self, interval: float = 1.0) -> None:
+        """Restart crashed workers under the same name, their sessions map back to them."""
+        while not self.draining:
+            await asyncio.sleep(interval)
+            for worker in self.workers.values():
+                if not self.draining and not worker.process.is_alive():
+                    Logger.warning(
+                        f"{worker.name} exited with {worker.process.exitcode}, restarting"
+                    )
+                    worker.restarts += 1
+                    await self.spawn(worker)
+
+    async def handle_connection(self, reader, writer) -> None:
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                head = await read_head(reader)
+                if head is None:
+                    break
+                start_line, headers = head
+                method, path, _ = start_line.split(" ", 2)
+                body = await read_body(reader, headers)
+                keep_alive = wants_keep_alive(headers) and not self.draining
+
+                if path == "/health":
+                    healthy = not self.draining and all(
+                        worker.process.is_alive() for worker in self.workers.values()
+                    )
+                    writer.write(
+                        json_response(200 if healthy else 503, self.health(), keep_alive)
+                    )
+                elif path == "/metrics":
+                    writer.write(json_response(200, await self.metrics(), keep_alive))
+                elif method == "POST" and path == "/route":
+                    await self.route(headers, body, writer, keep_alive)
+                else:
+                    writer.write(
+                        json_response(404, {"error": f"No route {path}"}, keep_alive)
+                    )
+                await writer.drain()
+                if not keep_alive or self.draining or writer.is_closing():
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "draining" if self.draining else "ok",
+            "workers": {
+                worker.name: {
+                    "alive": worker.process.is_alive(),
+                    "pid": worker.process.pid,
+                    "restarts": worker.restarts,
+                }
+                for worker in self.workers.values()
+            },
+        }
+
+    async def metrics(self) -> Dict[str, Any]:
+        async def worker_metrics(worker: WorkerProcess):
+            try:
+                status, _, body = await self.forward(
+                    worker, encode_head("GET /metrics HTTP/1.1", {"Host": "worker"}), None
+                )
+                return json.loads(body) if status == 200 else None
+            except (ConnectionError, OSError, asyncio.IncompleteReadError):
+                return None
+
+        workers = list(self.workers.values())
+        results = await asyncio.gather(*[worker_metrics(worker) for worker in workers])
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "workers": {
+                worker.name: {"forwarded": worker.forwarded, "metrics": result}
+                for worker, result in zip(workers, results)
+            },
+        }
+
+    async def route(
+        self, headers: Dict[str, str], body: bytes, writer, keep_alive: bool = True
+    ) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.idle.clear()
+        try:
+            # Clients can skip the JSON parsing here by sending the header
+            session_id = headers.get("x-session-id")
+            if session_id is None:
+                session_id = json.loads(body)["session_id"]
+            worker = self.workers[self.ring.node_for(session_id)]
+            worker.forwarded += 1
+            request_head = encode_head(
+                "POST /route HTTP/1.1",
+                {
+                    "Host": "worker",
+                    "Content-Type": "application/json",
+                    "Content-Length": str(len(body)),
+                },
+            )
+            await self.forward(worker, request_head + body, writer, keep_alive)
+        except (KeyError, ValueError) as error:
+            self.errors += 1
+            writer.write(
+                json_response(400, {"error": f"Invalid request: {error}"}, keep_alive)
+            )
+        except (ConnectionError, OSError, asyncio.IncompleteReadError) as error:
+            self.errors += 1
+            Logger.error(f"Worker unavailable: {str(error)}")
+            # Closed by `forward` when the response had already started
+            if not writer.is_closing():
+                writer.write(
+                    json_response(503, {"error": "Worker unavailable"}, keep_alive)
+                )
+        finally:
+            self.in_flight -= 1
+            if not self.in_flight:
+                self.idle.set()
+
+    async def forward(
+        self,
+        worker: WorkerProcess,
+        request: bytes,
+        client: Optional[asyncio.StreamWriter],
+        keep_alive: bool = True,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Send `request` to the worker. With a `client` the response is relayed as it
+        arrives (streams included), otherwise it is returned. `keep_alive` is what the
+        client is told about its own connection. When the worker fails once the head is
+        relayed, the client connection is closed, too late for an error response.
+        """
+        head = None
+        while head is None:
+            reused = bool(worker.connections)
+            if reused:
+                reader, writer = worker.connections.pop()
+            else:
+                reader, writer = await asyncio.open_connection(self.host, worker.port)
+            writer.write(request)
+            head = await read_head(reader)
+            if head is None:
+                writer.close()
+                if not reused:
+                    raise ConnectionError(f"{worker.name} closed the connection")
+                # Idle connection closed by the worker (e.g. restarted), retry on a new one
+
+        relayed = False
+        try:
+            start_line, headers = head
+            status = int(start_line.split(" ", 2)[1])
+            if client:
+                client.write(
+                    encode_head(
+                        start_line,
+                        {**headers, "connection": "keep-alive" if keep_alive else "close"},
+                    )
+                )
+                relayed = True
+
+            body = []
+            if headers.get("transfer-encoding") == "chunked":
+                while True:
+                    size_line = await reader.readuntil(b"\r\n")
+                    data = await reader.readexactly(int(size_line, 16) + 2)
+                    if client:
+                        client.write(size_line + data)
+                        await client.drain()
+                    else:
+                        body.append(data[:-2])
+                    if size_line.strip() == b"0":
+                        break
+            else:
+                data = await read_body(reader, headers)
+                if client:
+                    client.write(data)
+                else:
+                    body.append(data)
+        except BaseException:
+            writer.close()
+            if relayed:
+                client.close()
+            raise
+
+        if len(worker.connections) < self.max_idle_connections:
+            worker.connections.append((reader, writer))
+        else:
+            writer.close()
+        return status, headers, b"".join(body)
+
+    async def drain(self) -> None:
+        """Refuse new connections, let requests in flight finish, then stop the workers."""
+        if self.draining:
+            return
+        self.draining = True
+        Logger.info("Draining %d requests in flight", self.in_flight)
+        self.server.close()
+        try:
+            await asyncio.wait_for(self.idle.wait(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            Logger.warning(f"Drain timed out with {self.in_flight} requests in flight")
+        await close_connections(self.connections)
+
+        if self._monitor:
+            self._monitor.cancel()
+        for worker in self.workers.values():
+            for _, writer in worker.connections:
+                writer.close()
+            worker.connections.clear()
+            if worker.process.is_alive():
+                worker.process.terminate()
+        deadline = time.monotonic() + self.drain_timeout
+        for worker in self.workers.values():
+            await asyncio.to_thread(
+                worker.process.join, max(deadline - time.monotonic(), 0)
+            )
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signal_number, stopped.set)
+        await stopped.wait()
+        await self.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--factory", required=True, help="package.module:function")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--drain-timeout", type=float, default=30)
+    args = parser.parse_args()
+
+    asyncio.run(
+        Dispatcher(
+            args.factory, args.workers, args.host, args.port, args.drain_timeout
+        ).serve_forever()
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Union
+import time
+
+from agent_orchestration_framework.types import (
+    ConversationMessage,
+    ParticipantRole,
+    TimestampedMessage,
+)
+
+
+class ChatStorage(ABC):
+    """
+    Chat history per (user_id, session_id, agent_id).
+    `max_history_size` is a number of user/assistant message pairs (`MAX_MESSAGE_PAIRS_PER_AGENT`).
+    """
+
+    @staticmethod
+    def now() -> int:
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def max_messages(max_history_size: Optional[int]) -> Optional[int]:
+        return None if max_history_size is None else max_history_size * 2
+
+    @staticmethod
+    def is_same_role_as_last_message(
+        last_message: Optional[ConversationMessage], new_message: ConversationMessage
+    ) -> bool:
+        # Only keep alternating user/assistant turns
+        return last_message is not None and last_message.role == new_message.role
+
+    @staticmethod
+    def to_timestamped_message(
+        message: ConversationMessage, timestamp: Optional[int] = None
+    ) -> TimestampedMessage:
+        if isinstance(message, TimestampedMessage) and timestamp is None:
+            return message
+        return TimestampedMessage(
+            role=message.role,
+            content=message.content,
+            timestamp=timestamp if timestamp is not None else ChatStorage.now(),
+        )
+
+    @staticmethod
+    def with_agent_prefix(
+        message: TimestampedMessage, agent_id: str
+    ) -> TimestampedMessage:
+        """Mark which agent answered when histories of every agent are merged."""
+        if message.role != ParticipantRole.ASSISTANT.value or not message.content:
+            return message
+        return TimestampedMessage(
+            role=message.role,
+            content=[{"text": f"[{agent_id}] {message.text}"}],
+            timestamp=message.timestamp,
+        )
+
+    @abstractmethod
+    async def save_chat_message(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_message: ConversationMessage,
+        max_history_size: Optional[int] = None,
+    ) -> bool:
+        pass
+
+    async def save_chat_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_messages: List[ConversationMessage],
+        max_history_size: Optional[int] = None,
+    ) -> bool:
+        """Save several messages of one conversation, backends override this to write them at once."""
+        return await _save_one_by_one(
+            self, user_id, session_id, agent_id, new_messages, max_history_size
+        )
+
+    @abstractmethod
+    async def fetch_chat(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        max_history_size: Optional[int] = None,
+    ) -> List[Union[ConversationMessage, TimestampedMessage]]:
+        pass
+
+    @abstractmethod
+    async def fetch_all_chats(
+        self, user_id: str, session_id: str
+    ) -> List[Union[ConversationMessage, TimestampedMessage]]:
+        pass
+
+
+async def _save_one_by_one(
+    storage,
+    user_id: str,
+    session_id: str,
+    agent_id: str,
+    new_messages: List[ConversationMessage],
+    max_history_size: Optional[int] = None,
+) -> bool:
+    saved = False
+    for new_message in new_messages:
+        saved = (
+            await storage.save_chat_message(
+                user_id, session_id, agent_id, new_message, max_history_size
+            )
+            or saved
+        )
+    return saved
+
+
+async def save_chat_messages(
+    storage,
+    user_id: str,
+    session_id: str,
+    agent_id: str,
+    new_messages: List[ConversationMessage],
+    max_history_size: Optional[int] = None,
+) -> bool:
+    """Use the storage bulk API when it has one, otherwise save one message at a time."""
+    if hasattr(storage, "save_chat_messages"):
+        return await storage.save_chat_messages(
+            user_id, session_id, agent_id, new_messages, max_history_size
+        )
+    return await _save_one_by_one(
+        storage, user_id, session_id, agent_id, new_messages, max_history_size
+    )
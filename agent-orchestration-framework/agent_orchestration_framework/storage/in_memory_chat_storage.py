@@ -0,0 +1,108 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import heapq
+import itertools
+
+from agent_orchestration_framework.storage.chat_storage import ChatStorage
+from agent_orchestration_framework.types import (
+    ConversationMessage,
+    OrchestratorConfig,
+    TimestampedMessage,
+)
+
+
+class InMemoryChatStorage(ChatStorage):
+    """
+    Keeps one ring buffer (`deque(maxlen=...)`) per agent conversation so saving
+    never has to copy or trim the whole history.
+    """
+
+    def __init__(
+        self,
+        max_message_pairs: int = OrchestratorConfig.MAX_MESSAGE_PAIRS_PER_AGENT,
+    ):
+        self.max_message_pairs = max_message_pairs
+        # (user_id, session_id) -> agent_id -> messages
+        self.conversations: Dict[
+            Tuple[str, str], Dict[str, Deque[TimestampedMessage]]
+        ] = {}
+
+    def _get_buffer(
+        self, user_id: str, session_id: str, agent_id: str, max_history_size: int
+    ) -> Deque[TimestampedMessage]:
+        agents = self.conversations.setdefault((user_id, session_id), {})
+        max_messages = self.max_messages(max_history_size)
+        buffer = agents.get(agent_id)
+        if buffer is None:
+            buffer = agents[agent_id] = deque(maxlen=max_messages)
+        elif buffer.maxlen != max_messages:
+            buffer = agents[agent_id] = deque(buffer, maxlen=max_messages)
+        return buffer
+
+    async def save_chat_message(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_message: ConversationMessage,
+        max_history_size: Optional[int] = None,
+    ) -> bool:
+        return await self.save_chat_messages(
+            user_id, session_id, agent_id, [new_message], max_history_size
+        )
+
+    async def save_chat_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_messages: List[ConversationMessage],
+        max_history_size: Optional[int] = None,
+    ) -> bool:
+        buffer = self._get_buffer(
+            user_id,
+            session_id,
+            agent_id,
+            max_history_size or self.max_message_pairs,
+        )
+        saved = False
+        for new_message in new_messages:
+            if self.is_same_role_as_last_message(
+                buffer[-1] if buffer else None, new_message
+            ):
+                continue
+            buffer.append(self.to_timestamped_message(new_message))
+            saved = True
+        return saved
+
+    async def fetch_chat(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        max_history_size: Optional[int] = None,
+    ) -> List[TimestampedMessage]:
+        buffer = self.conversations.get((user_id, session_id), {}).get(agent_id)
+        if not buffer:
+            return []
+
+        max_messages = self.max_messages(max_history_size)
+        if max_messages is None or max_messages >= len(buffer):
+            return list(buffer)
+        # Only copy the tail we need
+        return list(itertools.islice(buffer, len(buffer) - max_messages, None))
+
+    async def fetch_all_chats(
+        self, user_id: str, session_id: str
+    ) -> List[TimestampedMessage]:
+        agents = self.conversations.get((user_id, session_id), {})
+        # Each buffer is already sorted by timestamp
+        return list(
+            heapq.merge(
+                *[
+                    [self.with_agent_prefix(message, agent_id) for message in buffer]
+                    for agent_id, buffer in agents.items()
+                ],
+                key=lambda message: message.timestamp,
+            )
+        )
@@ -0,0 +1,199 @@
+from typing import List, Optional, Tuple
+import asyncio
+import json
+import sqlite3
+import threading
+
+from agent_orchestration_framework.storage.chat_storage import ChatStorage
+from agent_orchestration_framework.types import (
+    ConversationMessage,
+    OrchestratorConfig,
+    TimestampedMessage,
+)
+
+
+class SqliteChatStorage(ChatStorage):
+    """
+    Chat history in a SQLite database.
+    The composite index on (user_id, session_id, agent_id, timestamp) lets every read
+    seek straight to the last N messages of a conversation instead of scanning the table.
+    Queries run in a worker thread so the event loop is not blocked by disk I/O.
+    """
+
+    def __init__(
+        self,
+        database: str = ":memory:",
+        max_message_pairs: int = OrchestratorConfig.MAX_MESSAGE_PAIRS_PER_AGENT,
+    ):
+        self.max_message_pairs = max_message_pairs
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(database, check_same_thread=False)
+        self._initialize()
+
+    def _initialize(self) -> None:
+        with self._lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    agent_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL
+                )
+                """
+            )
+            self.connection.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_conversations_lookup
+                ON conversations (user_id, session_id, agent_id, timestamp)
+                """
+            )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    @staticmethod
+    def _to_message(row: Tuple[str, str, int]) -> TimestampedMessage:
+        role, content, timestamp = row
+        return TimestampedMessage(
+            role=role, content=json.loads(content), timestamp=timestamp
+        )
+
+    def _save(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_messages: List[ConversationMessage],
+        max_messages: int,
+    ) -> bool:
+        key = (user_id, session_id, agent_id)
+
+        # One transaction for the whole batch
+        with self._lock, self.connection:
+            last_message = self.connection.execute(
+                """
+                SELECT role, content, timestamp FROM conversations
+                WHERE user_id = ? AND session_id = ? AND agent_id = ?
+                ORDER BY timestamp DESC, id DESC LIMIT 1
+                """,
+                key,
+            ).fetchone()
+            last_message = self._to_message(last_message) if last_message else None
+
+            rows = []
+            for new_message in new_messages:
+                if self.is_same_role_as_last_message(last_message, new_message):
+                    continue
+                last_message = self.to_timestamped_message(new_message)
+                rows.append(
+                    (
+                        *key,
+                        last_message.role,
+                        json.dumps(last_message.content),
+                        last_message.timestamp,
+                    )
+                )
+            if not rows:
+                return False
+
+            self.connection.executemany(
+                """
+                INSERT INTO conversations
+                    (user_id, session_id, agent_id, role, content, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            # Everything after the newest `max_messages` rows of this conversation
+            self.connection.execute(
+                """
+                DELETE FROM conversations WHERE id IN (
+                    SELECT id FROM conversations
+                    WHERE user_id = ? AND session_id = ? AND agent_id = ?
+                    ORDER BY timestamp DESC, id DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (*key, max_messages),
+            )
+        return True
+
+    def _fetch(
+        self, user_id: str, session_id: str, agent_id: str, max_messages: int
+    ) -> List[TimestampedMessage]:
+        with self._lock:
+            rows = self.connection.execute(
+                """
+                SELECT role, content, timestamp FROM conversations
+                WHERE user_id = ? AND session_id = ? AND agent_id = ?
+                ORDER BY timestamp DESC, id DESC LIMIT ?
+                """,
+                (user_id, session_id, agent_id, max_messages),
+            ).fetchall()
+        return [self._to_message(row) for row in reversed(rows)]
+
+    def _fetch_all(self, user_id: str, session_id: str) -> List[TimestampedMessage]:
+        with self._lock:
+            rows = self.connection.execute(
+                """
+                SELECT agent_id, role, content, timestamp FROM conversations
+                WHERE user_id = ? AND session_id = ?
+                ORDER BY timestamp ASC, id ASC
+                """,
+                (user_id, session_id),
+            ).fetchall()
+        return [self.with_agent_prefix(self._to_message(row[1:]), row[0]) for row in rows]
+
+    async def save_chat_message(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_message: ConversationMessage,
+        max_history_size: Optional[int] = None,
+    ) -> bool:
+        return await self.save_chat_messages(
+            user_id, session_id, agent_id, [new_message], max_history_size
+        )
+
+    async def save_chat_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_messages: List[ConversationMessage],
+        max_history_size: Optional[int] = None,
+    ) -> bool:
+        return await asyncio.to_thread(
+            self._save,
+            user_id,
+            session_id,
+            agent_id,
+            new_messages,
+            self.max_messages(max_history_size or self.max_message_pairs),
+        )
+
+    async def fetch_chat(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        max_history_size: Optional[int] = None,
+    ) -> List[TimestampedMessage]:
+        return await asyncio.to_thread(
+            self._fetch,
+            user_id,
+            session_id,
+            agent_id,
+            self.max_messages(max_history_size or self.max_message_pairs),
+        )
+
+    async def fetch_all_chats(
+        self, user_id: str, session_id: str
+    ) -> List[TimestampedMessage]:
+        return await asyncio.to_thread(self._fetch_all, user_id, session_id)
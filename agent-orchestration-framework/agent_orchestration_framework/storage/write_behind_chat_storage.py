@@ -0,0 +1,135 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+
+from agent_orchestration_framework.storage.chat_storage import (
+    ChatStorage,
+    save_chat_messages,
+)
+from agent_orchestration_framework.types import ConversationMessage, TimestampedMessage
+from agent_orchestration_framework.utils import Logger
+
+ConversationKey = Tuple[str, str, str]
+
+
+class WriteBehindChatStorage(ChatStorage):
+    """
+    Wraps another storage and persists messages from a background task so saving
+    is off the response path. Reads of a conversation with queued writes wait for
+    them to be flushed, so history is never stale.
+    """
+
+    def __init__(self, storage: ChatStorage, max_pending: int = 10000, max_batch: int = 100):
+        self.storage = storage
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._pending: Dict[ConversationKey, int] = {}
+        self._flushed: Optional[asyncio.Condition] = None
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            if self._queue is None:
+                # Created lazily so they bind to the running event loop
+                self._queue = asyncio.Queue(maxsize=self.max_pending)
+                self._flushed = asyncio.Condition()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Merge queued writes of the same conversation into one bulk save
+            grouped: Dict[ConversationKey, Tuple[List[TimestampedMessage], Optional[int]]] = {}
+            for key, messages, max_history_size in batch:
+                grouped.setdefault(key, ([], max_history_size))[0].extend(messages)
+
+            for key, (messages, max_history_size) in grouped.items():
+                try:
+                    await save_chat_messages(
+                        self.storage, *key, messages, max_history_size
+                    )
+                except Exception as error:
+                    Logger.error(f"Error persisting chat messages: {str(error)}")
+
+            async with self._flushed:
+                for key, _, _ in batch:
+                    self._pending[key] -= 1
+                    if not self._pending[key]:
+                        del self._pending[key]
+                self._flushed.notify_all()
+
+            for _ in batch:
+                self._queue.task_done()
+
+    async def save_chat_message(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_message: ConversationMessage,
+        max_history_size: Optional[int] = None,
+    ) -> bool:
+        return await self.save_chat_messages(
+            user_id, session_id, agent_id, [new_message], max_history_size
+        )
+
+    async def save_chat_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        new_messages: List[ConversationMessage],
+        max_history_size: Optional[int] = None,
+    ) -> bool:
+        self._ensure_worker()
+        key = (user_id, session_id, agent_id)
+        # Timestamp now, not when the worker gets to it
+        messages = [self.to_timestamped_message(message) for message in new_messages]
+        # Blocks only when `max_pending` writes are queued (backpressure). Counted once
+        # queued, a caller cancelled while blocked would leave readers waiting forever
+        await self._queue.put((key, messages, max_history_size))
+        self._pending[key] = self._pending.get(key, 0) + 1
+        return True
+
+    async def _wait_for_pending(self, keys: List[ConversationKey]) -> None:
+        if not any(key in self._pending for key in keys):
+            return
+        async with self._flushed:
+            await self._flushed.wait_for(
+                lambda: not any(key in self._pending for key in keys)
+            )
+
+    async def fetch_chat(
+        self,
+        user_id: str,
+        session_id: str,
+        agent_id: str,
+        max_history_size: Optional[int] = None,
+    ) -> List[TimestampedMessage]:
+        await self._wait_for_pending([(user_id, session_id, agent_id)])
+        return await self.storage.fetch_chat(
+            user_id, session_id, agent_id, max_history_size
+        )
+
+    async def fetch_all_chats(
+        self, user_id: str, session_id: str
+    ) -> List[TimestampedMessage]:
+        await self._wait_for_pending(
+            [key for key in self._pending if key[:2] == (user_id, session_id)]
+        )
+        return await self.storage.fetch_all_chats(user_id, session_id)
+
+    async def flush(self) -> None:
+        """Wait until every queued message is persisted."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
@@ -1,8 +1,26 @@
 from typing import Any, Optional, Callable, Union
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import inspect
+import json
+import time
 from agent_orchestration_framework.types import (
     ParticipantRole,
 )
+from agent_orchestration_framework.tools.tool_cache import (
+    CachedToolResult,
+    SqliteToolCache,
+    ToolCachePolicy,
+    ToolCacheStats,
+    ToolResultCache,
+)
+from agent_orchestration_framework.utils import Logger
+from agent_orchestration_framework.utils.tracing import span
+
+
+class _ToolTimedOut(Exception):
+    """The tool missed its deadline, unlike a TimeoutError raised by the tool itself."""
 
 
 @dataclass
@@ -17,13 +35,17 @@ class PropertyDefinition:
 class ToolResult:
     tool_use_id: str
     content: Any
+    is_error: bool = False
 
     def to_default_format(self) -> dict:
-        return {
+        result = {
             "type": "tool_result",
             "tool_use_id": self.tool_use_id,
             "content": self.content,
         }
+        if self.is_error:
+            result["is_error"] = True
+        return result
 
 
 class Tool:
@@ -35,6 +57,10 @@ class Tool:
         required: Optional[list[str]] = None,
         func: Optional[Callable] = None,
         enum_values: Optional[dict[str, list]] = None,
+        # Seconds before the call is abandoned, overrides `Tools(timeout=...)`
+        timeout: Optional[float] = None,
+        # Memoize results of calls with the same input, None disables caching
+        cache_policy: Optional[ToolCachePolicy] = None,
     ):
 
         self.name = name
@@ -52,18 +78,36 @@ class Tool:
         self.properties = properties
         self.required = required or list(self.properties.keys())
         self.func = func
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.timeout = timeout
+        self.cache_policy = cache_policy
 
         # Add enum values to properties if they exist
         for prop_name, enum_vals in self.enum_values.items():
             if prop_name in self.properties:
                 self.properties[prop_name]["enum"] = enum_vals
 
+        self.openai_name = self.name.lower().replace("_tool", "")
+        # Schemas don't change after construction, build them once
+        self._openai_format: Optional[dict[str, Any]] = None
+        self._openai_json: Optional[str] = None
+
     def to_openai_format(self) -> dict[str, Any]:
-        """Convert generic tool definition to OpenAI format"""
+        """Convert generic tool definition to OpenAI format. Cached, treat the result as read only"""
+        if self._openai_format is None:
+            self._openai_format = self._build_openai_format()
+        return self._openai_format
+
+    def to_openai_json(self) -> str:
+        if self._openai_json is None:
+            self._openai_json = json.dumps(self.to_openai_format())
+        return self._openai_json
+
+    def _build_openai_format(self) -> dict[str, Any]:
         return {
             "type": "function",
             "function": {
-                "name": self.name.lower().replace("_tool", ""),
+                "name": self.openai_name,
                 "description": self.func_description,
                 "parameters": {
                     "type": "object",
@@ -76,8 +120,68 @@ class Tool:
 
 
 class Tools:
-    def __init__(self, tools: list[Tool]):
-        self.tools: list[Tool] = tools
+    def __init__(
+        self,
+        tools: list[Tool],
+        # Run every tool call of a response concurrently instead of one after another
+        parallel: bool = False,
+        max_concurrency: int = 8,
+        timeout: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        # SQLite file backing the result caches of tools with a `cache_policy`
+        cache_path: Optional[str] = None,
+    ):
+        self.tools: list[Tool] = []
+        # Lookup by `name` and by the name the model sees in the OpenAI schema
+        self._tools_by_name: dict[str, Tool] = {}
+        self._tools_by_openai_name: dict[str, Tool] = {}
+        self._openai_format: Optional[list[dict[str, Any]]] = None
+        self._openai_json: Optional[str] = None
+        for tool in tools:
+            self.register(tool)
+
+        self.parallel = parallel
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_workers = max_workers or max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._caches: dict[str, ToolResultCache] = {}
+        self._cache_stats: dict[str, ToolCacheStats] = {}
+        self.disk_cache = SqliteToolCache(cache_path) if cache_path else None
+
+    def register(self, tool: Tool) -> None:
+        if tool.name in self._tools_by_name:
+            raise ValueError(f"A tool named '{tool.name}' already exists.")
+        existing = self._tools_by_openai_name.get(tool.openai_name)
+        if existing is not None:
+            raise ValueError(
+                f"Tools '{existing.name}' and '{tool.name}' would both be named "
+                f"'{tool.openai_name}' in the OpenAI schema."
+            )
+        self.tools.append(tool)
+        self._tools_by_name[tool.name] = tool
+        self._tools_by_openai_name[tool.openai_name] = tool
+        self._openai_format = None
+        self._openai_json = None
+
+    def get_tool(self, tool_name: str) -> Optional[Tool]:
+        tool = self._tools_by_name.get(tool_name)
+        return tool if tool is not None else self._tools_by_openai_name.get(tool_name)
+
+    def to_openai_format(self) -> list[dict[str, Any]]:
+        """`tools` parameter for OpenAI requests, built once and shared across requests"""
+        if self._openai_format is None:
+            self._openai_format = [tool.to_openai_format() for tool in self.tools]
+        return self._openai_format
+
+    def to_openai_json(self) -> str:
+        if self._openai_json is None:
+            self._openai_json = (
+                "[" + ",".join(tool.to_openai_json() for tool in self.tools) + "]"
+            )
+        return self._openai_json
 
     async def tool_handler(
         self, provider_type, response: Any, _conversation: list[dict[str, Any]]
@@ -85,42 +189,157 @@ class Tools:
         if not response.content:
             raise ValueError("No content blocks in response")
 
-        tool_results = []
         content_blocks = response.content
+        tool_use_blocks = [
+            tool_use_block
+            for tool_use_block in (
+                self._get_tool_use_block(provider_type, block) for block in content_blocks
+            )
+            if tool_use_block
+        ]
 
-        for block in content_blocks:
-            # Determine if it's a tool use block based on platform
-            tool_use_block = self._get_tool_use_block(provider_type, block)
-            if not tool_use_block:
-                continue
+        if self.parallel:
+            # gather keeps the results in the same order as the blocks. A failing tool
+            # doesn't abort the others, its exception is returned in its place
+            results = await asyncio.gather(
+                *[self._run_tool_use_block(block) for block in tool_use_blocks],
+                return_exceptions=True,
+            )
+        else:
+            results = []
+            for block in tool_use_blocks:
+                try:
+                    results.append(await self._run_tool_use_block(block))
+                except Exception as error:
+                    results.append(error)
 
-            tool_name = tool_use_block.name
-            tool_id = tool_use_block.id
+        tool_results = [
+            # Format according to platform
+            self._tool_result(block, result).to_default_format()
+            for block, result in zip(tool_use_blocks, results)
+        ]
 
-            # Get input based on platform
-            input_data = tool_use_block.input
+        return {"role": ParticipantRole.USER.value, "content": tool_results}
 
-            # Process the tool use
-            result = await self._process_tool(tool_name, input_data)
+    @staticmethod
+    def _tool_result(tool_use_block: Any, result: Any) -> ToolResult:
+        if isinstance(result, BaseException):
+            Logger.error(f"Error in tool {tool_use_block.name}: {str(result)}")
+            return ToolResult(
+                tool_use_block.id,
+                f"Tool '{tool_use_block.name}' failed: {result}",
+                is_error=True,
+            )
+        return ToolResult(tool_use_block.id, result)
 
-            # Create tool result
-            tool_result = ToolResult(tool_id, result)
+    async def _run_tool_use_block(self, tool_use_block: Any) -> Any:
+        tool_name = tool_use_block.name
+        # Get input based on platform
+        input_data = tool_use_block.input
 
-            # Format according to platform
-            formatted_result = tool_result.to_default_format()
+        with span(f"Tool {tool_name}"):
+            if not self.parallel:
+                return await self._process_tool(tool_name, input_data)
 
-            tool_results.append(formatted_result)
+            # Created per event loop, a semaphore is bound to the loop it first waits on
+            loop = asyncio.get_running_loop()
+            if self._semaphore_loop is not loop:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphore_loop = loop
+            async with self._semaphore:
+                return await self._process_tool(tool_name, input_data)
 
-        return {"role": ParticipantRole.USER.value, "content": tool_results}
-
-    def _get_tool_use_block(self, block: dict) -> Union[dict, None]:
+    def _get_tool_use_block(self, provider_type, block: dict) -> Union[dict, None]:
         """Extract tool use block based on platform format. Right now only OpenAI is supported"""
 
         return block
 
-    def _process_tool(self, tool_name, input_data):
+    async def _process_tool(self, tool_name, input_data):
+        tool = self.get_tool(tool_name)
+        if tool is None:
+            return f"Tool '{tool_name}' not found"
+
+        policy = tool.cache_policy
+        if not policy or not policy.cacheable:
+            try:
+                return await self._call_tool(tool, input_data)
+            except _ToolTimedOut:
+                return self._timeout_message(tool)
+
+        key = policy.make_key(input_data)
+        stats = self._cache_stats.setdefault(tool.name, ToolCacheStats())
+        cache = self._caches.setdefault(tool.name, ToolResultCache(policy))
+
+        entry = cache.get(key)
+        if entry is None and self.disk_cache:
+            entry = await self.disk_cache.get(tool.name, key)
+            if entry is not None:
+                cache.set(key, entry)
+        if entry is not None:
+            stats.hits += 1
+            stats.saved_latency += entry.duration
+            return entry.value
+
+        stats.misses += 1
+        start_time = time.perf_counter()
         try:
-            tool = next(tool for tool in self.tools if tool.name == tool_name)
+            result = await self._call_tool(tool, input_data)
+        except _ToolTimedOut:
+            return self._timeout_message(tool)
+
+        # Only successful calls are cached
+        entry = CachedToolResult(
+            result, time.perf_counter() - start_time, time.time() + policy.ttl
+        )
+        cache.set(key, entry)
+        if self.disk_cache:
+            await self.disk_cache.set(tool.name, key, entry)
+        return result
+
+    def cache_stats(self) -> dict[str, dict[str, float]]:
+        """Hit ratio and latency saved by the result cache, per tool"""
+        return {name: stats.to_dict() for name, stats in self._cache_stats.items()}
+
+    def _tool_timeout(self, tool: Tool) -> Optional[float]:
+        return tool.timeout if tool.timeout is not None else self.timeout
+
+    def _timeout_message(self, tool: Tool) -> str:
+        return f"Tool '{tool.name}' timed out after {self._tool_timeout(tool)}s"
+
+    async def _call_tool(self, tool: Tool, input_data: dict) -> Any:
+        # Not `wait_for`, it can't tell its own timeout from a TimeoutError of the tool
+        call = asyncio.ensure_future(self._invoke_tool(tool, input_data))
+        try:
+            done, _ = await asyncio.wait({call}, timeout=self._tool_timeout(tool))
+        finally:
+            if not call.done():
+                call.cancel()
+                call.add_done_callback(lambda done: done.cancelled() or done.exception())
+        if not done:
+            raise _ToolTimedOut()
+        return call.result()
+
+    async def _invoke_tool(self, tool: Tool, input_data: dict) -> Any:
+        if tool.is_async:
+            return await tool.func(**input_data)
+        if not self.parallel:
             return tool.func(**input_data)
-        except StopIteration:
-            return f"Tool '{tool_name}' not found"
+
+        # Sync tools run in a bounded pool so they don't block the event loop.
+        # A timed out call keeps running in its thread, the result is just dropped.
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="tool"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: tool.func(**input_data)
+        )
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+            self.disk_cache = None
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+
+@dataclass
+class ToolCachePolicy:
+    # Only tools without side effects should be cached
+    cacheable: bool = True
+    ttl: float = 300
+    max_entries: int = 1000
+    # Input fields that identify a call, None means every field
+    key_fields: Optional[list[str]] = None
+
+    def make_key(self, input_data: dict[str, Any]) -> str:
+        fields = self.key_fields if self.key_fields is not None else input_data.keys()
+        return json.dumps(
+            {field: input_data.get(field) for field in fields},
+            sort_keys=True,
+            default=str,
+        )
+
+
+@dataclass
+class ToolCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Sum of the original call durations of every hit
+    saved_latency: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "saved_latency": self.saved_latency,
+        }
+
+
+@dataclass
+class CachedToolResult:
+    value: Any
+    # How long the tool took to produce `value`
+    duration: float
+    expires_at: float
+
+
+class ToolResultCache:
+    """In-memory LRU of one tool's results."""
+
+    def __init__(self, policy: ToolCachePolicy):
+        self.policy = policy
+        self._entries: "OrderedDict[str, CachedToolResult]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedToolResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CachedToolResult) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.policy.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SqliteToolCache:
+    """On-disk tier shared by every tool so results survive restarts. Values must be JSON serializable."""
+
+    def __init__(self, database: str):
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(database, check_same_thread=False)
+        with self._lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tool_cache (
+                    tool TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    duration REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (tool, key)
+                )
+                """
+            )
+
+    def _get(self, tool: str, key: str) -> Optional[CachedToolResult]:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT value, duration, expires_at FROM tool_cache WHERE tool = ? AND key = ?",
+                (tool, key),
+            ).fetchone()
+        if row is None or row[2] < time.time():
+            return None
+        return CachedToolResult(json.loads(row[0]), row[1], row[2])
+
+    def _set(self, tool: str, key: str, entry: CachedToolResult) -> None:
+        try:
+            value = json.dumps(entry.value)
+        except TypeError:
+            return
+        with self._lock, self.connection:
+            self.connection.execute(
+                """
+                INSERT OR REPLACE INTO tool_cache (tool, key, value, duration, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (tool, key, value, entry.duration, entry.expires_at),
+            )
+
+    async def get(self, tool: str, key: str) -> Optional[CachedToolResult]:
+        return await asyncio.to_thread(self._get, tool, key)
+
+    async def set(self, tool: str, key: str, entry: CachedToolResult) -> None:
+        await asyncio.to_thread(self._set, tool, key, entry)
+
+    def close(self) -> None:
+        self.connection.close()
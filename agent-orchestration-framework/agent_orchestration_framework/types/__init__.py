@@ -0,0 +1,10 @@
+from agent_orchestration_framework.types.types import (
+    OPENAI_MODEL_ID_GPT_O_MINI,
+    ToolInput,
+    RequestMetadata,
+    ParticipantRole,
+    ConversationMessage,
+    TimestampedMessage,
+    TemplateVariables,
+    OrchestratorConfig,
+)
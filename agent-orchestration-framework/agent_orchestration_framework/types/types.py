@@ -1,4 +1,5 @@
 from enum import Enum
+import json
 from typing import List, Dict, Union, TypedDict, Optional, Any
 from dataclasses import dataclass
 
@@ -28,23 +29,140 @@ class ParticipantRole(Enum):
 
 
 class ConversationMessage:
-    role: ParticipantRole
-    content: List[Any]
+    """
+    A chat message. Content of a single text block, the common case, is kept as the
+    bare string and only expanded to `[{"text": ...}]` when `content` is read. That
+    list is built anew on every read, so editing it in place (`msg.content[0]["text"] = ...`)
+    is lost: assign a new `content` instead.
+    Frozen messages raise on assignment, storage backends can hand them out safely.
+    """
 
-    def __init__(self, role: ParticipantRole, content: Optional[List[Any]] = None):
-        self.role = role
+    __slots__ = ("role", "_text", "_content", "_frozen")
+
+    def __init__(
+        self,
+        role: ParticipantRole,
+        content: Optional[List[Any]] = None,
+        frozen: bool = False,
+    ):
+        set_attribute = object.__setattr__
+        set_attribute(self, "role", role)
+        set_attribute(self, "_frozen", False)
         self.content = content
+        set_attribute(self, "_frozen", frozen)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"{type(self).__name__} is frozen")
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Pickle and copy would restore the slots through __setattr__, which a frozen message refuses
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    @property
+    def content(self) -> Optional[List[Any]]:
+        if self._text is not None:
+            return [{"text": self._text}]
+        return self._content
+
+    @content.setter
+    def content(self, content: Optional[List[Any]]) -> None:
+        if (
+            isinstance(content, list)
+            and len(content) == 1
+            and isinstance(content[0], dict)
+            and len(content[0]) == 1
+            and isinstance(content[0].get("text"), str)
+        ):
+            object.__setattr__(self, "_text", content[0]["text"])
+            object.__setattr__(self, "_content", None)
+        else:
+            object.__setattr__(self, "_text", None)
+            object.__setattr__(self, "_content", content)
+
+    @property
+    def text(self) -> str:
+        """Text of the first content block, without building the content list."""
+        if self._text is not None:
+            return self._text
+        if self._content and isinstance(self._content[0], dict):
+            return self._content[0].get("text", "")
+        return ""
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"role": self.role.value if isinstance(self.role, Enum) else self.role}
+        if self._text is not None:
+            data["text"] = self._text
+        else:
+            data["content"] = self._content
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], frozen: bool = False):
+        content = [{"text": data["text"]}] if "text" in data else data.get("content")
+        return cls(data["role"], content, frozen=frozen)
+
+    def to_bytes(self, serializer: str = "json") -> bytes:
+        """Serialize for storage backends, "json" or "msgpack" (needs the msgpack package)."""
+        if serializer == "msgpack":
+            import msgpack
+
+            return msgpack.packb(self.to_dict())
+        return json.dumps(self.to_dict(), separators=(",", ":")).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, serializer: str = "json", frozen: bool = False):
+        if serializer == "msgpack":
+            import msgpack
+
+            return cls.from_dict(msgpack.unpackb(data), frozen=frozen)
+        return cls.from_dict(json.loads(data), frozen=frozen)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(role={self.role!r}, content={self.content!r})"
 
 
 class TimestampedMessage(ConversationMessage):
+    __slots__ = ("timestamp",)
+
     def __init__(
         self,
         role: ParticipantRole,
         content: Optional[List[Any]] = None,
         timestamp: int = 0,
+        frozen: bool = False,
     ):
-        super().__init__(role, content)  # Call the parent constructor
-        self.timestamp = timestamp  # Initialize the timestamp attribute
+        object.__setattr__(self, "timestamp", timestamp)
+        super().__init__(role, content, frozen=frozen)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data["timestamp"] = self.timestamp
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], frozen: bool = False):
+        content = [{"text": data["text"]}] if "text" in data else data.get("content")
+        return cls(data["role"], content, data.get("timestamp", 0), frozen=frozen)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(role={self.role!r}, content={self.content!r}, "
+            f"timestamp={self.timestamp!r})"
+        )
 
 
 TemplateVariables = Dict[str, Union[str, List[str]]]
@@ -57,6 +175,12 @@ class OrchestratorConfig:
     LOG_CLASSIFIER_RAW_OUTPUT: bool = False  # pylint: disable=invalid-name
     LOG_CLASSIFIER_OUTPUT: bool = False  # pylint: disable=invalid-name
     LOG_EXECUTION_TIMES: bool = False  # pylint: disable=invalid-name
+    # Fraction of requests whose chat history gets logged when LOG_AGENT_CHAT/LOG_CLASSIFIER_CHAT are on
+    LOG_CHAT_SAMPLE_RATE: float = 1.0  # pylint: disable=invalid-name
+    # Records buffered for the background log writer, 0 logs synchronously
+    LOG_QUEUE_SIZE: int = 10000  # pylint: disable=invalid-name
+    # "drop_newest" or "drop_oldest" once the buffer is full, only records below WARNING are dropped
+    LOG_DROP_POLICY: str = "drop_newest"  # pylint: disable=invalid-name
     MAX_RETRIES: int = 3  # pylint: disable=invalid-name
     USE_DEFAULT_AGENT_IF_NONE_IDENTIFIED: bool = True  # pylint: disable=invalid-name
     CLASSIFICATION_ERROR_MESSAGE: str = None
@@ -66,3 +190,23 @@ class OrchestratorConfig:
     )
     GENERAL_ROUTING_ERROR_MSG_MESSAGE: str = None
     MAX_MESSAGE_PAIRS_PER_AGENT: int = 100  # pylint: disable=invalid-name
+    # Cache of classifier results keyed on the normalized user input, 0 disables it.
+    # Cached routing ignores chat history, so follow ups like "and tomorrow?" reuse the first decision.
+    CLASSIFIER_CACHE_SIZE: int = 0  # pylint: disable=invalid-name
+    CLASSIFIER_CACHE_TTL: float = 300  # pylint: disable=invalid-name
+    CLASSIFIER_CACHE_PER_SESSION: bool = False  # pylint: disable=invalid-name
+    # Run the agent's retriever concurrently with the chat history fetch
+    OVERLAP_RETRIEVAL: bool = True  # pylint: disable=invalid-name
+    # Requests of the same (user_id, session_id) run one at a time, in arrival order
+    SERIALIZE_SESSION_REQUESTS: bool = True  # pylint: disable=invalid-name
+    # Start the session's previous agent while the classifier runs, keep its answer if it is picked again
+    SPECULATIVE_EXECUTION: bool = False  # pylint: disable=invalid-name
+    # Speculation pauses itself when fewer guesses than this are right
+    SPECULATION_MIN_HIT_RATE: float = 0.5  # pylint: disable=invalid-name
+    # Let the manager agent split multi-part requests across several agents. Needs a manager
+    # with a model to decompose requests, without one every request goes to a single agent.
+    # The decomposition runs alongside classification, skipped for obviously single-part requests
+    FAN_OUT_ENABLED: bool = False  # pylint: disable=invalid-name
+    FAN_OUT_MAX_PARALLEL: int = 4  # pylint: disable=invalid-name
+    # Seconds to wait for sub-agents, whatever answered by then is merged
+    FAN_OUT_DEADLINE: float = 30  # pylint: disable=invalid-name
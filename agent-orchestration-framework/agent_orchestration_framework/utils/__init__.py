@@ -0,0 +1 @@
+from agent_orchestration_framework.utils.logger.logger import Logger
@@ -1,7 +1,13 @@
 from typing import List, Optional, Dict, Any
 import json
+import logging
+import random
 from agent_orchestration_framework.types import ConversationMessage, OrchestratorConfig
-from logger_config import setup_logger
+from agent_orchestration_framework.utils.logger.logger_config import (
+    DroppingQueueHandler,
+    setup_logger,
+)
+from agent_orchestration_framework.utils.tracing import Span
 
 
 class Logger:
@@ -13,11 +19,61 @@ class Logger:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, config: Optional[Dict[str, bool]] = None):
+    def __init__(
+        self,
+        config: Optional[Dict[str, bool]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.config: OrchestratorConfig = config or OrchestratorConfig()
         if not hasattr(self, "initialized"):
-            Logger._logger = setup_logger()
+            Logger._logger = logger or setup_logger(
+                queue_size=self.config.LOG_QUEUE_SIZE,
+                drop_policy=self.config.LOG_DROP_POLICY,
+            )
             self.initialized = True
-        self.config: OrchestratorConfig = config or OrchestratorConfig()
+        elif logger:
+            Logger._logger = logger
+
+    @classmethod
+    def get_logger(cls) -> logging.Logger:
+        if cls._logger is None:
+            cls._logger = setup_logger()
+        return cls._logger
+
+    @classmethod
+    def is_enabled(cls, level: int = logging.INFO) -> bool:
+        """Check before building log lines that would be discarded anyway."""
+        return cls.get_logger().isEnabledFor(level)
+
+    @classmethod
+    def dropped_records(cls) -> int:
+        """Records dropped because the log buffer was full."""
+        return sum(
+            handler.dropped
+            for handler in logging.getLogger().handlers + cls.get_logger().handlers
+            if isinstance(handler, DroppingQueueHandler)
+        )
+
+    @classmethod
+    def info(cls, message: str, *args: Any) -> None:
+        cls.get_logger().info(message, *args)
+
+    @classmethod
+    def warning(cls, message: str, *args: Any) -> None:
+        cls.get_logger().warning(message, *args)
+
+    @classmethod
+    def error(cls, message: str, *args: Any) -> None:
+        cls.get_logger().error(message, *args)
+
+    @classmethod
+    def debug(cls, message: str, *args: Any) -> None:
+        cls.get_logger().debug(message, *args)
+
+    def log_header(self, title: str) -> None:
+        """Log a section header."""
+        self.get_logger().info("** %s **", title.upper())
+        self.get_logger().info("%s", "=" * (len(title) + 6))
 
     def print_chat_history(
         self, chat_history: List[ConversationMessage], agent_id: Optional[str] = None
@@ -28,6 +84,11 @@ class Logger:
             not is_agent_chat and not self.config.LOG_CLASSIFIER_CHAT
         ):
             return
+        if not self.is_enabled() or (
+            self.config.LOG_CHAT_SAMPLE_RATE < 1
+            and random.random() >= self.config.LOG_CHAT_SAMPLE_RATE
+        ):
+            return
 
         title = (
             f"Agent {agent_id} Chat History"
@@ -45,14 +106,14 @@ class Logger:
                 text = content[0] if isinstance(content, list) else content
                 text = text.get("text", "") if isinstance(text, dict) else str(text)
                 trimmed_text = f"{text[:80]}..." if len(text) > 80 else text
-                self.get_logger().info(f"> {index}. {role}: {trimmed_text}")
+                self.get_logger().info("> %d. %s: %s", index, role, trimmed_text)
         self.get_logger().info("")
 
     def log_classifier_output(self, output: Any, is_raw: bool = False) -> None:
         """Log the classifier output."""
         if (is_raw and not self.config.LOG_CLASSIFIER_RAW_OUTPUT) or (
             not is_raw and not self.config.LOG_CLASSIFIER_OUTPUT
-        ):
+        ) or not self.is_enabled():
             return
 
         self.log_header(
@@ -61,15 +122,22 @@ class Logger:
         self.get_logger().info(output if is_raw else json.dumps(output, indent=2))
         self.get_logger().info("")
 
-    def print_execution_times(self, execution_times: Dict[str, float]) -> None:
-        """Print execution times."""
-        if not self.config.LOG_EXECUTION_TIMES:
+    def print_execution_times(self, trace: Span) -> None:
+        """Print the spans of a request trace."""
+        if not self.config.LOG_EXECUTION_TIMES or not self.is_enabled():
             return
 
         self.log_header("Execution Times")
-        if not execution_times:
-            self.get_logger().info("> - None -")
-        else:
-            for timer_name, duration in execution_times.items():
-                self.get_logger().info(f"> {timer_name}: {duration}s")
+        for depth, span in trace.walk():
+            self.get_logger().info("> %s%s: %ss", "  " * depth, span.name, span.duration)
+        self.get_logger().info("")
+
+    def print_cache_stats(self, title: str, stats: Dict[str, int]) -> None:
+        """Print cache hit/miss counters next to the execution times."""
+        if not self.config.LOG_EXECUTION_TIMES or not self.is_enabled():
+            return
+
+        self.log_header(title)
+        for name, value in stats.items():
+            self.get_logger().info("> %s: %s", name, value)
         self.get_logger().info("")
@@ -1,7 +1,105 @@
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Tuple
+import atexit
 import logging.config
+import queue
 
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+_listener: Optional[QueueListener] = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue and drops instead of blocking when it is full.
+    Only records below WARNING are dropped, warnings and errors wait for room instead
+    (up to `block_timeout` seconds, in case the listener is gone).
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        drop_policy: str = DROP_NEWEST,
+        block_timeout: float = 5.0,
+    ):
+        super().__init__(log_queue)
+        if drop_policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown drop policy '{drop_policy}'")
+        self.drop_policy = drop_policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener thread formats the record, the caller only pays for the enqueue.
+        # Args are formatted late, so pass values that won't be mutated afterwards.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if record.levelno >= logging.WARNING:
+            self._put_blocking(record)
+        elif self.drop_policy == DROP_NEWEST:
+            self.dropped += 1
+        else:
+            try:
+                oldest = self.queue.get_nowait()
+            except queue.Empty:
+                oldest = None
+            if oldest is not None and oldest.levelno >= logging.WARNING:
+                # Keep it, even if it now comes after newer records, and drop this one
+                self._put_blocking(oldest)
+                self.dropped += 1
+                return
+            if oldest is not None:
+                self.dropped += 1
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def _put_blocking(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put(record, timeout=self.block_timeout)
+        except queue.Full:
+            self.dropped += 1
+
+
+def create_queue_handler(
+    *handlers: logging.Handler,
+    queue_size: int = 10000,
+    drop_policy: str = DROP_NEWEST,
+) -> Tuple[DroppingQueueHandler, QueueListener]:
+    """Wrap `handlers` so their I/O happens on a background listener thread."""
+    log_queue = queue.Queue(maxsize=queue_size)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    return DroppingQueueHandler(log_queue, drop_policy), listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logger(
+    level: str = "DEBUG",
+    queue_size: int = 10000,
+    drop_policy: str = DROP_NEWEST,
+):
+    """Configure JSON logs to stdout.
+
+    With a `queue_size` records are written by a background thread, 0 writes synchronously.
+    """
+    global _listener
 
-def setup_logger():
     LOGGING = {
         "version": 1,
         "disable_existing_loggers": False,
@@ -24,7 +122,7 @@ def setup_logger():
         "loggers": {
             "": {
                 "handlers": ["stdout"],
-                "level": "DEBUG",
+                "level": level,
             },
         },
     }
@@ -48,6 +146,22 @@ def setup_logger():
         }
 
     logging.config.dictConfig(LOGGING)
+
+    if queue_size:
+        stop_logging()
+        stdout_handler = logging.getLogger().handlers[0]
+        queue_handler, _listener = create_queue_handler(
+            stdout_handler, queue_size=queue_size, drop_policy=drop_policy
+        )
+        for name in ["", *third_party_loggers]:
+            configured = logging.getLogger(name)
+            configured.removeHandler(stdout_handler)
+            configured.addHandler(queue_handler)
+        _listener.start()
+
     logger = logging.getLogger(__name__)
 
     return logger
+
+
+atexit.register(stop_logging)
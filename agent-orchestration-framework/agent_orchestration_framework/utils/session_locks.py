@@ -0,0 +1,65 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable
+import asyncio
+
+
+class _SessionLock:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        # Holder plus waiters, the entry is evicted when it drops to 0
+        self.users = 0
+
+
+class SessionLocks:
+    """One FIFO lock per session so turns of a session run in order while sessions run in parallel."""
+
+    def __init__(self):
+        self._locks: Dict[Hashable, _SessionLock] = {}
+        self.acquired = 0
+        self.contended = 0
+
+    async def acquire(self, key: Hashable) -> None:
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = _SessionLock()
+        entry.users += 1
+        self.acquired += 1
+        if entry.lock.locked():
+            self.contended += 1
+        try:
+            # asyncio.Lock wakes waiters in arrival order
+            await entry.lock.acquire()
+        except BaseException:
+            self._leave(key, entry)
+            raise
+
+    def release(self, key: Hashable) -> None:
+        entry = self._locks[key]
+        entry.lock.release()
+        self._leave(key, entry)
+
+    def _leave(self, key: Hashable, entry: _SessionLock) -> None:
+        entry.users -= 1
+        if entry.users == 0:
+            # Idle sessions keep no lock around
+            del self._locks[key]
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        await self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release(key)
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "acquired": self.acquired,
+            "contended": self.contended,
+            "active_sessions": len(self._locks),
+        }
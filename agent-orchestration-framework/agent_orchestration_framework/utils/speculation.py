@@ -0,0 +1,72 @@
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Hashable, Optional
+
+
+class SpeculationTracker:
+    """
+    Remembers the last agent of each session and the outcome of recent speculations.
+    Speculation turns itself off when fewer than `min_hit_rate` of the last `window`
+    guesses were right, and probes again after `retry_after` requests.
+    """
+
+    def __init__(
+        self,
+        min_hit_rate: float = 0.5,
+        window: int = 100,
+        min_samples: int = 20,
+        retry_after: int = 500,
+        max_sessions: int = 10000,
+    ):
+        self.min_hit_rate = min_hit_rate
+        self.min_samples = min_samples
+        self.retry_after = retry_after
+        self.max_sessions = max_sessions
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self._last_agents: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._skipped = 0
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    def last_agent(self, session_key: Hashable) -> Optional[str]:
+        return self._last_agents.get(session_key)
+
+    def remember(self, session_key: Hashable, agent_id: str) -> None:
+        self._last_agents[session_key] = agent_id
+        self._last_agents.move_to_end(session_key)
+        while len(self._last_agents) > self.max_sessions:
+            self._last_agents.popitem(last=False)
+
+    def should_speculate(self) -> bool:
+        if self.enabled:
+            return True
+        self._skipped += 1
+        if self._skipped >= self.retry_after:
+            # Traffic may have changed, start a fresh window
+            self.enabled = True
+            self.outcomes.clear()
+            self._skipped = 0
+        return self.enabled
+
+    def record(self, hit: bool) -> None:
+        self.outcomes.append(hit)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if (
+            len(self.outcomes) >= self.min_samples
+            and self.hit_rate() < self.min_hit_rate
+        ):
+            self.enabled = False
+
+    def hit_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate(), 3),
+            "enabled": self.enabled,
+        }
@@ -0,0 +1,49 @@
+from typing import Any, AsyncIterable, Callable, Optional
+
+
+class ClosingStream:
+    """
+    Async iterator over `stream` calling `on_close` once: when the stream ends or fails,
+    on `aclose()`, or when it is garbage collected. Unlike the `finally` of an async
+    generator, this also runs when the caller never started iterating.
+    """
+
+    def __init__(self, stream: AsyncIterable[Any], on_close: Callable[[], None]):
+        self._stream = stream
+        self._iterator = stream.__aiter__()
+        self._on_close: Optional[Callable[[], None]] = on_close
+
+    @property
+    def closed(self) -> bool:
+        return self._on_close is None
+
+    def __aiter__(self) -> "ClosingStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self.closed:
+            raise StopAsyncIteration
+        try:
+            return await self._iterator.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self) -> None:
+        if self.closed:
+            return
+        try:
+            aclose = getattr(self._iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        finally:
+            self._close()
+
+    def _close(self) -> None:
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+
+    def __del__(self) -> None:
+        # A started generator is finalized by the event loop, this only runs `on_close`
+        self._close()
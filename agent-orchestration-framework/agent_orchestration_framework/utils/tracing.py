@@ -0,0 +1,195 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, IO, Iterator, List, Optional, Tuple, Union
+import json
+import threading
+import time
+
+
+@dataclass
+class Span:
+    name: str
+    start: float = field(default_factory=time.perf_counter)
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    children: List["Span"] = field(default_factory=list)
+    # Set when the span outlives the code that opened it (e.g. a response stream)
+    deferred: bool = False
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def child(self, name: str, start: Optional[float] = None, **attributes: Any) -> "Span":
+        span = Span(name, start=start or time.perf_counter(), attributes=attributes)
+        self.children.append(span)
+        return span
+
+    def finish(self) -> None:
+        if self.end is None:
+            self.end = time.perf_counter()
+
+    def walk(self, depth: int = 0) -> Iterator[Tuple[int, "Span"]]:
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+# Context of the running request, copied into tasks created by asyncio.gather/create_task
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_current_trace: ContextVar[Optional[Span]] = ContextVar("current_trace", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace() -> Optional[Span]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, parent: Optional[Span] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time a block as a child of the current span, a no-op outside of a trace."""
+    parent = parent or _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = parent.child(name, **attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except Exception as error:
+        child.attributes["error"] = str(error)
+        raise
+    finally:
+        child.finish()
+        _current_span.reset(token)
+
+
+@contextmanager
+def use_span(parent: Optional[Span]) -> Iterator[Optional[Span]]:
+    """Make `parent` the current span, e.g. when resuming work of a request from another context."""
+    token = _current_span.set(parent)
+    try:
+        yield parent
+    finally:
+        _current_span.reset(token)
+
+
+async def measure(name: str, fn: Callable[[], Awaitable[Any]], **attributes: Any) -> Any:
+    with span(name, **attributes):
+        return await fn()
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, trace: Span) -> None:
+        pass
+
+
+class JsonLinesExporter(SpanExporter):
+    """Write each finished trace as one JSON line."""
+
+    def __init__(self, destination: Union[str, IO[str]]):
+        self._owns_stream = isinstance(destination, str)
+        self.stream = (
+            open(destination, "a", encoding="utf-8") if self._owns_stream else destination
+        )
+        self._lock = threading.Lock()
+
+    def export(self, trace: Span) -> None:
+        line = json.dumps(trace.to_dict())
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def close(self) -> None:
+        if self._owns_stream:
+            self.stream.close()
+
+
+class CallbackExporter(SpanExporter):
+    def __init__(self, callback: Callable[[Span], None]):
+        self.callback = callback
+
+    def export(self, trace: Span) -> None:
+        self.callback(trace)
+
+
+class InMemoryAggregator(SpanExporter):
+    """Keep the latest durations per span name and report p50/p95/p99."""
+
+    def __init__(self, max_samples: int = 10000):
+        self.max_samples = max_samples
+        self.durations: Dict[str, Deque[float]] = {}
+
+    def export(self, trace: Span) -> None:
+        for _, node in trace.walk():
+            self.durations.setdefault(node.name, deque(maxlen=self.max_samples)).append(
+                node.duration
+            )
+
+    @staticmethod
+    def percentile(sorted_durations: List[float], value: float) -> float:
+        index = max(int(round(value * len(sorted_durations))) - 1, 0)
+        return sorted_durations[min(index, len(sorted_durations) - 1)]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        summary = {}
+        for name, durations in self.durations.items():
+            ordered = sorted(durations)
+            summary[name] = {
+                "count": len(ordered),
+                "p50": self.percentile(ordered, 0.50),
+                "p95": self.percentile(ordered, 0.95),
+                "p99": self.percentile(ordered, 0.99),
+            }
+        return summary
+
+    def clear(self) -> None:
+        self.durations.clear()
+
+
+class Tracer:
+    def __init__(self, exporters: Optional[List[SpanExporter]] = None, enabled: bool = True):
+        self.exporters = exporters or []
+        self.enabled = enabled
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Start a per request trace, exported when the block ends unless it is deferred."""
+        if not self.enabled:
+            yield None
+            return
+
+        root = Span(name, attributes=attributes)
+        span_token = _current_span.set(root)
+        trace_token = _current_trace.set(root)
+        try:
+            yield root
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            if not root.deferred:
+                self.end_trace(root)
+
+    def end_trace(self, root: Span) -> None:
+        """Finish and export `root`, only the first call for a trace does anything."""
+        if root.end is not None:
+            return
+        root.finish()
+        for exporter in self.exporters:
+            exporter.export(root)
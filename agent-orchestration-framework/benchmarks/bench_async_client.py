@@ -0,0 +1,99 @@
+"""
+Requests/sec of concurrent `route_request` calls with a sync `OpenAI` vs an `AsyncOpenAI` client.
+
+Run from the project root:
+    python -m benchmarks.bench_async_client --requests 200 --latency 0.05
+"""
+
+from typing import List
+import argparse
+import asyncio
+import logging
+import time
+
+from openai import AsyncOpenAI, OpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.types import ConversationMessage
+from benchmarks.fake_llm_server import FakeLLMServer
+
+
+class SingleAgentClassifier(Classifier):
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        return ClassifierResult(
+            selected_agent=next(iter(self.agents.values())), confidence=1.0
+        )
+
+
+class NoopStorage:
+    async def fetch_chat(self, user_id, session_id, agent_id, max_history_size=None):
+        return []
+
+    async def fetch_all_chats(self, user_id, session_id):
+        return []
+
+    async def save_chat_message(
+        self, user_id, session_id, agent_id, new_message, max_history_size=None
+    ):
+        return True
+
+
+def build_orchestrator(client) -> MultiAgentOrchestrator:
+    orchestrator = MultiAgentOrchestrator(
+        storage=NoopStorage(),
+        classifier=SingleAgentClassifier(),
+        logger=logging.getLogger("benchmark"),
+    )
+    orchestrator.add_agent(
+        Agent(
+            AgentOptions(
+                name="Bench Agent",
+                description="Answers benchmark questions",
+                model="fake",
+                client=client,
+            )
+        )
+    )
+    return orchestrator
+
+
+async def run(orchestrator: MultiAgentOrchestrator, requests: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            orchestrator.route_request("hello", f"user-{i}", f"session-{i}")
+            for i in range(requests)
+        ]
+    )
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with FakeLLMServer(latency=args.latency) as server:
+        sync_client = OpenAI(base_url=server.base_url, api_key="fake")
+        async_client = AsyncOpenAI(
+            base_url=server.base_url, api_key="fake", max_retries=0
+        )
+
+        sync_rps = asyncio.run(run(build_orchestrator(sync_client), args.requests))
+        async_rps = asyncio.run(run(build_orchestrator(async_client), args.requests))
+
+    print(f"requests={args.requests} latency={args.latency}s")
+    print(f"sync client:  {sync_rps:8.1f} req/s")
+    print(f"async client: {async_rps:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
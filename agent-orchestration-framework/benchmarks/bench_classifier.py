@@ -0,0 +1,99 @@
+"""
+Routing latency and accuracy of the local EmbeddingClassifier on a labeled utterance set.
+
+Run from the project root:
+    python -m benchmarks.bench_classifier
+"""
+
+from typing import List
+import argparse
+import asyncio
+import statistics
+import time
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.classifiers.embedding_classifier import (
+    EmbeddingClassifier,
+)
+
+AGENTS = {
+    "Travel Agent": "Books flights and hotels, checks flight status, baggage rules and visa requirements for trips.",
+    "Weather Agent": "Gives the weather forecast, temperature, rain and storm warnings for a city.",
+    "Billing Agent": "Handles invoices, refunds, payment methods, charges and subscription plans.",
+    "Tech Support Agent": "Fixes login problems, password resets, app crashes, errors and account access issues.",
+    "Health Agent": "Answers questions about symptoms, medicine, diet, exercise and sleep.",
+}
+
+UTTERANCES = [
+    ("What's the status of flight PR102?", "travel-agent"),
+    ("Book me a hotel in Tokyo for next week", "travel-agent"),
+    ("Do I need a visa to visit Japan?", "travel-agent"),
+    ("How many bags can I check on my flight?", "travel-agent"),
+    ("Find a cheap flight from Manila to Singapore", "travel-agent"),
+    ("Will it rain in Manila tomorrow?", "weather-agent"),
+    ("What's the temperature in London right now?", "weather-agent"),
+    ("Is there a storm warning for Cebu?", "weather-agent"),
+    ("Weather forecast for the weekend in Paris", "weather-agent"),
+    ("Should I bring an umbrella, is rain expected?", "weather-agent"),
+    ("I was charged twice this month", "billing-agent"),
+    ("How do I get a refund?", "billing-agent"),
+    ("Update my payment method to a new credit card", "billing-agent"),
+    ("Send me last month's invoice", "billing-agent"),
+    ("Cancel my subscription plan", "billing-agent"),
+    ("Reset my password", "tech-support-agent"),
+    ("The app crashes when I open it", "tech-support-agent"),
+    ("I can't login to my account", "tech-support-agent"),
+    ("I get an error 500 when saving", "tech-support-agent"),
+    ("My account access is locked", "tech-support-agent"),
+    ("What medicine helps with a headache?", "health-agent"),
+    ("How much sleep do adults need?", "health-agent"),
+    ("Is a fever a symptom of the flu?", "health-agent"),
+    ("Suggest a healthy diet for weight loss", "health-agent"),
+    ("What exercise is good for back pain?", "health-agent"),
+]
+
+
+def percentile(durations: List[float], value: float) -> float:
+    durations = sorted(durations)
+    return durations[max(int(len(durations) * value) - 1, 0)]
+
+
+async def run(threshold: float, rounds: int) -> None:
+    classifier = EmbeddingClassifier(threshold=threshold)
+    agents = {}
+    for name, description in AGENTS.items():
+        agent = Agent(AgentOptions(name=name, description=description, model=None))
+        agents[agent.id] = agent
+        classifier.set_agents(agents)
+
+    durations, correct, escalated = [], 0, 0
+    for _ in range(rounds):
+        for utterance, expected in UTTERANCES:
+            start = time.perf_counter()
+            result = await classifier.classify(utterance, [])
+            durations.append((time.perf_counter() - start) * 1000)
+            if result.selected_agent is None:
+                escalated += 1
+            elif result.selected_agent.id == expected:
+                correct += 1
+
+    total = rounds * len(UTTERANCES)
+    print(
+        f"threshold={threshold:.2f} accuracy={correct / total:.0%} "
+        f"escalated={escalated / total:.0%} "
+        f"p50={statistics.median(durations):.3f}ms p99={percentile(durations, 0.99):.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=40)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.0, 0.05, 0.1, 0.2])
+    args = parser.parse_args()
+
+    for threshold in args.thresholds:
+        asyncio.run(run(threshold, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
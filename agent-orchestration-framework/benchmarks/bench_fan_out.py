@@ -0,0 +1,113 @@
+"""
+What FAN_OUT_ENABLED costs requests that end up going to a single agent: p50 latency of
+`route_request` with fan-out off, then on for a plainly single-part request and for one
+that reads like several parts but that the manager keeps whole.
+
+The classifier and the manager's decomposition stand in for LLM calls
+(`--classifier-latency`, `--decompose-latency`), agents answer from the fake server.
+
+Run from the project root:
+    python -m benchmarks.bench_fan_out --requests 50
+"""
+
+from typing import List
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.agents.manager_agent import ManagerAgent, SubTask
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.types import ConversationMessage
+from benchmarks.fake_llm_server import FakeLLMServer
+
+REQUESTS = {
+    "single-part": "Book a flight to Paris for next Monday",
+    "reads multi-part": "My flight is AA100. What is its status?",
+}
+
+
+class SlowClassifier(Classifier):
+    """Picks the first agent after `latency` seconds."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        await asyncio.sleep(self.latency)
+        return ClassifierResult(next(iter(self.agents.values())), 1.0)
+
+
+class SlowManager(ManagerAgent):
+    """Keeps every request whole after `latency` seconds."""
+
+    def __init__(self, latency: float):
+        super().__init__(AgentOptions(name="Manager", description="Manager", model=None))
+        self.latency = latency
+
+    async def decompose(self, input_text, agents) -> List[SubTask]:
+        await asyncio.sleep(self.latency)
+        return [SubTask(input_text)]
+
+
+async def run(base_url: str, args, fan_out: bool, user_input: str) -> float:
+    client = AsyncOpenAI(base_url=base_url, api_key="fake", max_retries=0)
+    orchestrator = MultiAgentOrchestrator(
+        {"FAN_OUT_ENABLED": fan_out},
+        classifier=SlowClassifier(args.classifier_latency),
+        logger=logging.getLogger("benchmark"),
+        manager=SlowManager(args.decompose_latency),
+    )
+    orchestrator.add_agent(
+        Agent(
+            AgentOptions(
+                name="Travel Agent", description="Travel", model="fake", client=client
+            )
+        )
+    )
+
+    latencies = []
+    for index in range(args.requests):
+        start = time.perf_counter()
+        await orchestrator.route_request(user_input, "user", f"session-{index}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    await client.close()
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--classifier-latency", type=float, default=0.1)
+    parser.add_argument("--decompose-latency", type=float, default=0.15)
+    args = parser.parse_args()
+
+    print(
+        f"requests={args.requests} llm={args.latency * 1000:.0f}ms "
+        f"classifier={args.classifier_latency * 1000:.0f}ms "
+        f"decompose={args.decompose_latency * 1000:.0f}ms"
+    )
+    with FakeLLMServer(latency=args.latency) as server:
+        print(
+            f"fan-out off                  "
+            f"p50={asyncio.run(run(server.base_url, args, False, REQUESTS['single-part'])):6.1f}ms"
+        )
+        for name, user_input in REQUESTS.items():
+            p50 = asyncio.run(run(server.base_url, args, True, user_input))
+            print(f"fan-out on, {name:<17}p50={p50:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Prompt size and latency against session length, with and without a HistoryWindow.
+
+Run from the project root:
+    python -m benchmarks.bench_history_window --prefill-delay 0.05
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.agents.history_window import HistoryWindow
+from agent_orchestration_framework.types import ParticipantRole, TimestampedMessage
+from benchmarks.fake_llm_server import FakeLLMServer
+
+TURN_TEXT = "Can you tell me more about the baggage allowance and the visa rules? " * 3
+
+
+def build_history(messages: int):
+    roles = [ParticipantRole.USER.value, ParticipantRole.ASSISTANT.value]
+    return [
+        TimestampedMessage(
+            role=roles[i % 2], content=[{"text": f"{i}: {TURN_TEXT}"}], timestamp=i
+        )
+        for i in range(messages)
+    ]
+
+
+async def summarize(messages, previous_summary):
+    # Stand-in for an LLM summarizer, the bench measures the window not the summary quality
+    return (previous_summary or "") + f" {len(messages)} earlier turns about travel."
+
+
+async def run(server: FakeLLMServer, agent: Agent, history, requests: int):
+    durations, prompt_tokens = [], []
+    for i in range(requests):
+        server.prompt_tokens.clear()
+        start = time.perf_counter()
+        await agent.process_request("And the weather?", "user", "session", history)
+        durations.append((time.perf_counter() - start) * 1000)
+        prompt_tokens.extend(server.prompt_tokens)
+    return statistics.median(prompt_tokens), statistics.median(durations)
+
+
+async def main(args):
+    with FakeLLMServer(latency=args.latency, prefill_delay=args.prefill_delay) as server:
+        client = AsyncOpenAI(base_url=server.base_url, api_key="fake")
+
+        def make_agent(history_window=None):
+            return Agent(
+                AgentOptions(
+                    name="Travel Agent",
+                    description="Answers travel questions",
+                    model="fake",
+                    client=client,
+                    history_window=history_window,
+                )
+            )
+
+        full = make_agent()
+        windowed = make_agent(HistoryWindow(args.max_tokens, summarizer=summarize))
+
+        print(f"{'messages':>8} {'full tokens':>12} {'full ms':>9} {'window tokens':>14} {'window ms':>10}")
+        for messages in args.session_lengths:
+            history = build_history(messages)
+            full_tokens, full_ms = await run(server, full, history, args.requests)
+            window_tokens, window_ms = await run(server, windowed, history, args.requests)
+            print(
+                f"{messages:>8} {full_tokens:>12.0f} {full_ms:>9.1f} "
+                f"{window_tokens:>14.0f} {window_ms:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--session-lengths", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--max-tokens", type=int, default=1500)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--prefill-delay", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""
+Logging cost per request on the caller's thread: synchronous JSON handler vs the queue pipeline.
+
+Each request logs the agent chat history and the execution times, as with
+LOG_AGENT_CHAT and LOG_EXECUTION_TIMES enabled. The queue is unbounded by default so
+no record is dropped and both pipelines write the same lines, a bounded `--queue-size`
+shows the drops next to each timing.
+
+Run from the project root:
+    python -m benchmarks.bench_logging --requests 5000 --history 20
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from pythonjsonlogger import jsonlogger
+
+from agent_orchestration_framework.types import ConversationMessage, OrchestratorConfig
+from agent_orchestration_framework.utils import Logger
+from agent_orchestration_framework.utils.logger.logger_config import (
+    create_queue_handler,
+)
+from agent_orchestration_framework.utils.tracing import Span
+
+
+def build_trace() -> Span:
+    root = Span("Route request")
+    for name in ["Fetching all chats", "Classifying user intent", "Fetching chat history"]:
+        root.child(name).finish()
+    agent = root.child("Agent Bench | Processing request")
+    agent.child("Retrieving context").finish()
+    agent.finish()
+    root.child("Saving chat messages").finish()
+    root.finish()
+    return root
+
+
+def build_history(size: int):
+    return [
+        ConversationMessage(
+            role="user" if i % 2 == 0 else "assistant",
+            content=[{"text": f"message {i} " + "lorem ipsum " * 20}],
+        )
+        for i in range(size)
+    ]
+
+
+def run(logger: Logger, requests: int, history, trace) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        logger.print_chat_history(history, "bench-agent")
+        logger.print_execution_times(trace)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--history", type=int, default=20)
+    parser.add_argument("--queue-size", type=int, default=0, help="0 is unbounded")
+    args = parser.parse_args()
+
+    history = build_history(args.history)
+    trace = build_trace()
+    formatter = jsonlogger.JsonFormatter(
+        "%(asctime)s %(levelname)s %(message)s", rename_fields={"levelname": "severity"}
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_handler = logging.FileHandler(os.path.join(directory, "bench.log"))
+        file_handler.setFormatter(formatter)
+
+        sync_logger = logging.getLogger("benchmark.sync")
+        sync_logger.propagate = False
+        sync_logger.setLevel(logging.DEBUG)
+        sync_logger.addHandler(file_handler)
+
+        queue_handler, listener = create_queue_handler(
+            file_handler, queue_size=args.queue_size
+        )
+        queued_logger = logging.getLogger("benchmark.queued")
+        queued_logger.propagate = False
+        queued_logger.setLevel(logging.DEBUG)
+        queued_logger.addHandler(queue_handler)
+
+        quiet_logger = logging.getLogger("benchmark.quiet")
+        quiet_logger.propagate = False
+        quiet_logger.setLevel(logging.WARNING)
+        quiet_logger.addHandler(file_handler)
+
+        verbose = OrchestratorConfig(LOG_AGENT_CHAT=True, LOG_EXECUTION_TIMES=True)
+        sampled = OrchestratorConfig(
+            LOG_AGENT_CHAT=True, LOG_EXECUTION_TIMES=True, LOG_CHAT_SAMPLE_RATE=0.1
+        )
+        cases = [
+            ("sync handler", verbose, sync_logger),
+            ("queue handler", verbose, queued_logger),
+            ("queue handler, 10% chat sampling", sampled, queued_logger),
+            ("level above INFO", verbose, quiet_logger),
+        ]
+
+        listener.start()
+        print(f"requests={args.requests} history={args.history} messages")
+        for name, config, logger in cases:
+            dropped = queue_handler.dropped
+            us = run(Logger(config, logger), args.requests, history, trace)
+            print(
+                f"{name:36s} {us:8.1f}us/request dropped={queue_handler.dropped - dropped}"
+            )
+        started = time.perf_counter()
+        listener.stop()
+        print(f"queue drained in {time.perf_counter() - started:.2f}s, dropped={queue_handler.dropped}")
+        file_handler.close()
+
+
+if __name__ == "__main__":
+    main()
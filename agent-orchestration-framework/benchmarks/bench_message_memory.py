@@ -0,0 +1,71 @@
+"""
+Memory held by stored chat messages: the former `__dict__` classes vs the slotted types.
+
+Run from the project root:
+    python -m benchmarks.bench_message_memory --messages 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from agent_orchestration_framework.types import TimestampedMessage
+
+
+class DictTimestampedMessage:
+    # Layout of TimestampedMessage before it used __slots__
+    def __init__(self, role, content=None, timestamp=0):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp
+
+
+def build(message_class, count: int, texts):
+    return [
+        message_class(
+            "user" if i % 2 == 0 else "assistant",
+            [{"text": texts[i % len(texts)]}],
+            i,
+        )
+        for i in range(count)
+    ]
+
+
+def measure(message_class, count: int, texts):
+    tracemalloc.start()
+    messages = build(message_class, count, texts)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return messages, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1000000)
+    args = parser.parse_args()
+
+    # Texts are shared so the numbers show the per message overhead, not the text itself
+    texts = [f"message text number {i}" for i in range(1000)]
+    print(f"messages={args.messages}")
+    for name, message_class in [
+        ("__dict__ + content list", DictTimestampedMessage),
+        ("__slots__ + text fast path", TimestampedMessage),
+    ]:
+        messages, size = measure(message_class, args.messages, texts)
+        print(f"{name:28s} {size / 2**20:8.1f}MB {size / args.messages:6.1f}B/message")
+        del messages
+
+    messages = build(TimestampedMessage, 100000, texts)
+    start = time.perf_counter()
+    encoded = [message.to_bytes() for message in messages]
+    decoded = [TimestampedMessage.from_bytes(data) for data in encoded]
+    elapsed = time.perf_counter() - start
+    assert decoded[1].to_dict() == messages[1].to_dict()
+    print(
+        f"json round trip: {elapsed / len(messages) * 1e6:.2f}us/message, "
+        f"{sum(map(len, encoded)) / len(encoded):.0f}B/message"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+p50/p99 latency of a ModelPool per routing policy, against local fake endpoints where
+a fraction of requests is much slower than usual.
+
+Run from the project root:
+    python -m benchmarks.bench_model_pool --requests 400
+"""
+
+from typing import List
+import argparse
+import asyncio
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.llm.model_pool import (
+    ModelEndpoint,
+    ModelPool,
+    RoutingPolicy,
+)
+from benchmarks.fake_llm_server import FakeLLMServer
+
+
+def percentile(durations: List[float], value: float) -> float:
+    durations = sorted(durations)
+    return durations[max(int(len(durations) * value) - 1, 0)]
+
+
+async def run(pool: ModelPool, requests: int, concurrency: int) -> List[float]:
+    agent = Agent(
+        AgentOptions(name="Pool Agent", description="Benchmark agent", model=pool)
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    durations = []
+
+    async def one(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await agent.process_request("hello", f"user-{index}", "session", [])
+            durations.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*[one(i) for i in range(requests)])
+    return durations
+
+
+async def main(args):
+    servers = [
+        FakeLLMServer(latency=args.latency, slow_rate=args.slow_rate, slow_latency=args.slow_latency),
+        FakeLLMServer(latency=args.latency * 1.5, slow_rate=args.slow_rate, slow_latency=args.slow_latency),
+    ]
+    for server in servers:
+        server.start()
+    try:
+        print(
+            f"requests={args.requests} latency={args.latency}s "
+            f"slow_rate={args.slow_rate} slow_latency={args.slow_latency}s"
+        )
+        for policy in RoutingPolicy:
+            pool = ModelPool(
+                [
+                    ModelEndpoint(
+                        AsyncOpenAI(base_url=server.base_url, api_key="fake", max_retries=0),
+                        "fake",
+                        name=f"endpoint-{index}",
+                    )
+                    for index, server in enumerate(servers)
+                ],
+                policy=policy,
+                default_hedge_delay=args.latency * 3,
+            )
+            durations = await run(pool, args.requests, args.concurrency)
+            stats = pool.get_stats()
+            print(
+                f"{policy.value:<14} p50={statistics.median(durations):7.1f}ms "
+                f"p99={percentile(durations, 0.99):7.1f}ms "
+                f"hedged={stats['hedged_requests']} hedge_wins={stats['hedge_wins']}"
+            )
+    finally:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,287 @@
+"""
+End-to-end harness: replays a synthetic multi-user conversation workload through
+`MultiAgentOrchestrator.route_request` against the local fake LLM server.
+
+Reports throughput, latency percentiles, retained memory per session and the per-stage
+span breakdown, and saves them as JSON. Pass `--compare` with an earlier result to
+print the differences. The stub's own round trip is measured first, what the framework
+adds on top of it is reported as the overhead, and baselines recorded against a stub
+that answered at a different speed are flagged.
+
+Run from the project root:
+    python -m benchmarks.bench_orchestrator --users 50 --sessions 2 --turns 5 --output before.json
+    python -m benchmarks.bench_orchestrator --users 50 --sessions 2 --turns 5 --compare before.json
+"""
+
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+
+from openai import AsyncOpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.utils.tracing import InMemoryAggregator, Tracer
+from benchmarks.fake_llm_server import fake_llm_server_process
+
+AGENTS = [
+    (
+        "Weather Agent",
+        "Weather forecasts, rain, temperature and wind for any city",
+        ["Will it rain in {city} tomorrow?", "What is the temperature in {city}?", "How windy is {city} this week?"],
+    ),
+    (
+        "Travel Agent",
+        "Books flights and hotels and plans trips",
+        ["Book me a flight to {city}.", "Find a hotel in {city} for two nights.", "Plan a weekend trip to {city}."],
+    ),
+    (
+        "Billing Agent",
+        "Invoices, refunds, payments and subscription billing",
+        ["Why was I charged twice on my invoice?", "I want a refund for my last payment.", "Update my billing address to {city}."],
+    ),
+]
+CITIES = ["Paris", "Tokyo", "Lima", "Oslo", "Cairo", "Austin"]
+
+
+def build_workload(users: int, sessions: int, turns: int, seed: int) -> List[List[tuple]]:
+    """One list of (user_id, session_id, text) turns per session."""
+    rng = random.Random(seed)
+    workload = []
+    for user in range(users):
+        for session in range(sessions):
+            workload.append(
+                [
+                    (
+                        f"user-{user}",
+                        f"session-{user}-{session}",
+                        rng.choice(rng.choice(AGENTS)[2]).format(city=rng.choice(CITIES)),
+                    )
+                    for _ in range(turns)
+                ]
+            )
+    return workload
+
+
+def build_orchestrator(base_url: str, streaming: bool, aggregator) -> MultiAgentOrchestrator:
+    tracer = Tracer(exporters=[aggregator] if aggregator else [], enabled=aggregator is not None)
+    orchestrator = MultiAgentOrchestrator(
+        tracer=tracer, logger=logging.getLogger("benchmark")
+    )
+    client = AsyncOpenAI(base_url=base_url, api_key="fake", max_retries=0)
+    for name, description, _ in AGENTS:
+        orchestrator.add_agent(
+            Agent(
+                AgentOptions(
+                    name=name,
+                    description=description,
+                    model="fake",
+                    client=client,
+                    streaming=streaming,
+                )
+            )
+        )
+    return orchestrator
+
+
+async def replay(orchestrator, workload, concurrency: int, think_time: float):
+    """Latency of every turn and the number of turns no agent was selected for."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    unrouted = 0
+
+    async def session(turns):
+        async with semaphore:
+            nonlocal unrouted
+            for user_id, session_id, text in turns:
+                start = time.perf_counter()
+                response = await orchestrator.route_request(text, user_id, session_id)
+                unrouted += response["metadata"]["agent_id"] == "no_agent_selected"
+                if response["streaming"]:
+                    async for _ in response["output"]:
+                        pass
+                latencies.append(time.perf_counter() - start)
+                if think_time:
+                    await asyncio.sleep(think_time)
+
+    await asyncio.gather(*[session(turns) for turns in workload])
+    return latencies, unrouted
+
+
+async def close(orchestrator) -> None:
+    # Agents share one client
+    await next(iter(orchestrator.agents.values())).client.close()
+
+
+async def measure_stub(base_url: str, args, samples: int = 50) -> Dict[str, float]:
+    """Round trip of bare completions, without the orchestrator."""
+    client = AsyncOpenAI(base_url=base_url, api_key="fake", max_retries=0)
+    durations = []
+    # The first request also opens the connection
+    for index in range(samples + 1):
+        start = time.perf_counter()
+        response = await client.chat.completions.create(
+            model="fake",
+            messages=[{"role": "user", "content": "ping"}],
+            stream=args.streaming,
+        )
+        if args.streaming:
+            async for _ in response:
+                pass
+        if index:
+            durations.append(time.perf_counter() - start)
+    await client.close()
+    ordered = sorted(durations)
+    return {
+        "p50": round(InMemoryAggregator.percentile(ordered, 0.50) * 1000, 3),
+        "p99": round(InMemoryAggregator.percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+async def run_timed(base_url: str, workload, args) -> Dict[str, Any]:
+    aggregator = InMemoryAggregator(max_samples=100000)
+    orchestrator = build_orchestrator(base_url, args.streaming, aggregator)
+    start = time.perf_counter()
+    latencies, unrouted = await replay(
+        orchestrator, workload, args.concurrency, args.think_time
+    )
+    elapsed = time.perf_counter() - start
+    await close(orchestrator)
+
+    ordered = sorted(latencies)
+    milliseconds = lambda value: round(value * 1000, 3)
+    return {
+        "requests": len(latencies),
+        "unrouted": unrouted,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "latency_ms": {
+            "mean": milliseconds(statistics.fmean(ordered)),
+            "p50": milliseconds(InMemoryAggregator.percentile(ordered, 0.50)),
+            "p95": milliseconds(InMemoryAggregator.percentile(ordered, 0.95)),
+            "p99": milliseconds(InMemoryAggregator.percentile(ordered, 0.99)),
+        },
+        "stages_ms": {
+            name: {
+                key: value if key == "count" else milliseconds(value)
+                for key, value in stats.items()
+            }
+            for name, stats in sorted(aggregator.summary().items())
+        },
+    }
+
+
+async def run_memory(base_url: str, workload, args) -> Dict[str, Any]:
+    # Separate pass, tracemalloc slows allocation heavy code down too much for the timed run
+    orchestrator = build_orchestrator(base_url, args.streaming, None)
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    await replay(orchestrator, workload, args.concurrency, 0)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await close(orchestrator)
+    return {
+        "retained_bytes": retained - baseline,
+        "peak_bytes": peak - baseline,
+        "bytes_per_session": round((retained - baseline) / len(workload)),
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    def change(new, old):
+        return f"{old:.3f} -> {new:.3f} ({(new - old) / old * 100 if old else 0:+.1f}%)"
+
+    print("\ncompared to baseline:")
+    stub, baseline_stub = result["stub_ms"]["p50"], baseline.get("stub_ms", {}).get("p50")
+    if baseline_stub is None or abs(stub - baseline_stub) > 0.1 * baseline_stub:
+        print(
+            f"  warning: stub p50 {baseline_stub} -> {stub} ms, "
+            "latencies are not comparable, look at the overhead"
+        )
+    if "overhead_ms" in baseline:
+        print(f"  overhead p50 ms {change(result['overhead_ms']['p50'], baseline['overhead_ms']['p50'])}")
+    print(f"  throughput_rps  {change(result['throughput_rps'], baseline['throughput_rps'])}")
+    for key in ("p50", "p99"):
+        print(f"  latency {key:3s} ms  {change(result['latency_ms'][key], baseline['latency_ms'][key])}")
+    if "memory" in result and "memory" in baseline:
+        print(
+            "  bytes/session   "
+            + change(result["memory"]["bytes_per_session"], baseline["memory"]["bytes_per_session"])
+        )
+    for name, stats in result["stages_ms"].items():
+        if name in baseline["stages_ms"]:
+            print(f"  {name[:45]:45s} p50 {change(stats['p50'], baseline['stages_ms'][name]['p50'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=2, help="sessions per user")
+    parser.add_argument("--turns", type=int, default=5, help="turns per session")
+    parser.add_argument("--concurrency", type=int, default=50, help="sessions in flight")
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds to first token")
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between tokens")
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--skip-memory", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_orchestrator.json")
+    parser.add_argument("--compare", help="earlier JSON result to diff against")
+    args = parser.parse_args()
+
+    workload = build_workload(args.users, args.sessions, args.turns, args.seed)
+    with fake_llm_server_process(
+        latency=args.latency, tokens=args.tokens, token_delay=args.token_delay
+    ) as base_url:
+        result = {
+            "config": vars(args),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "stub_ms": asyncio.run(measure_stub(base_url, args)),
+            **asyncio.run(run_timed(base_url, workload, args)),
+        }
+        # Differences of tail percentiles mostly measure the stub's jitter, only p50 is kept
+        result["overhead_ms"] = {
+            "p50": round(result["latency_ms"]["p50"] - result["stub_ms"]["p50"], 3)
+        }
+        if not args.skip_memory:
+            result["memory"] = asyncio.run(run_memory(base_url, workload, args))
+
+    print(
+        f"{result['requests']} requests in {result['elapsed_s']}s: "
+        f"{result['throughput_rps']} req/s, "
+        f"p50={result['latency_ms']['p50']}ms p99={result['latency_ms']['p99']}ms, "
+        f"{result['unrouted']} unrouted"
+    )
+    print(
+        f"stub alone: p50={result['stub_ms']['p50']}ms, "
+        f"framework overhead: p50={result['overhead_ms']['p50']}ms"
+    )
+    if "memory" in result:
+        print(f"memory: {result['memory']['bytes_per_session']} bytes/session retained")
+    print("stages (ms):")
+    for name, stats in result["stages_ms"].items():
+        print(f"  {name[:45]:45s} n={stats['count']:<6d} p50={stats['p50']:<9} p99={stats['p99']}")
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(result, output, indent=2)
+    print(f"saved {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline:
+            compare(result, json.load(baseline))
+
+
+if __name__ == "__main__":
+    main()
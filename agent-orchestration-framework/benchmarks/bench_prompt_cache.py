@@ -0,0 +1,140 @@
+"""
+Cached against uncached input tokens and latency over long sessions, for the plain
+sliding history window and for the cache friendly setup (prompt cache hints plus a
+window evicting in blocks). The fake server caches prompt prefixes like a provider
+and only charges prefill time for the uncached tokens. Numbers are for the turns after
+`--warmup`, once the history no longer fits in the window.
+
+Run from the project root:
+    python -m benchmarks.bench_prompt_cache --turns 40 --prefill-delay 0.2
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.agents.history_window import HistoryWindow
+from agent_orchestration_framework.agents.prompt_cache import PromptCacheOptions
+from agent_orchestration_framework.types import ParticipantRole, TimestampedMessage
+from benchmarks.fake_llm_server import FakeLLMServer
+
+QUESTION = "What about the baggage allowance and the visa rules for my next leg? "
+
+
+class PerTurnRetriever:
+    """Different context on every turn, like a retriever keyed on the question."""
+
+    async def retrieve_and_combine_results(self, text: str) -> str:
+        return f"Relevant policy for: {text}\n" + "Policy excerpt. " * 20
+
+
+async def summarize(messages, previous_summary):
+    return (previous_summary or "") + f" {len(messages)} earlier turns about travel."
+
+
+async def run_session(
+    server: FakeLLMServer, agent: Agent, session_id: str, args, measured
+):
+    history = []
+    for turn in range(args.turns):
+        question = f"{session_id} {turn}: {QUESTION * 2}"
+        start = time.perf_counter()
+        response = await agent.process_request(question, "user", session_id, history)
+        if turn >= args.warmup:
+            measured["durations"].append((time.perf_counter() - start) * 1000)
+            measured["input"].append(server.prompt_tokens[-1])
+            measured["cached"].append(server.cached_tokens[-1])
+        history.append(
+            TimestampedMessage(
+                role=ParticipantRole.USER.value,
+                content=[{"text": question}],
+                timestamp=2 * turn,
+            )
+        )
+        history.append(
+            TimestampedMessage(
+                role=ParticipantRole.ASSISTANT.value,
+                content=response.content,
+                timestamp=2 * turn + 1,
+            )
+        )
+
+
+async def run(args, prompt_cache, eviction_block):
+    with FakeLLMServer(
+        latency=args.latency,
+        tokens=args.answer_tokens,
+        prefill_delay=args.prefill_delay,
+        prompt_cache=True,
+    ) as server:
+        client = AsyncOpenAI(base_url=server.base_url, api_key="fake")
+        agent = Agent(
+            AgentOptions(
+                name="Travel Agent",
+                description="Answers travel questions",
+                model="fake",
+                client=client,
+                retriever=PerTurnRetriever(),
+                history_window=HistoryWindow(
+                    max_tokens=args.max_tokens,
+                    summarizer=summarize,
+                    eviction_block=eviction_block,
+                ),
+                prompt_cache=prompt_cache,
+            )
+        )
+        measured = {"durations": [], "input": [], "cached": []}
+        for i in range(args.sessions):
+            await run_session(server, agent, f"session-{i}", args, measured)
+        await client.close()
+
+        requests = len(measured["input"])
+        input_tokens = sum(measured["input"])
+        cached_tokens = sum(measured["cached"])
+        durations = sorted(measured["durations"])
+        return {
+            "input tokens/request": input_tokens / requests,
+            "uncached tokens/request": (input_tokens - cached_tokens) / requests,
+            "cached ratio": cached_tokens / input_tokens,
+            "p50 ms": statistics.median(durations),
+            "p99 ms": durations[int(len(durations) * 0.99) - 1],
+            "agent stats": agent.prompt_cache.stats() if agent.prompt_cache else None,
+        }
+
+
+async def main(args):
+    results = {
+        "sliding window": await run(args, None, 0),
+        "cache friendly": await run(
+            args, PromptCacheOptions(provider=args.provider), args.eviction_block
+        ),
+    }
+    for name, result in results.items():
+        stats = result.pop("agent stats")
+        print(
+            f"{name:15} "
+            + "  ".join(
+                f"{key} {value:.3f}" if key == "cached ratio" else f"{key} {value:.0f}"
+                for key, value in result.items()
+            )
+        )
+        if stats:
+            print(f"{'':15} agent accounting {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--warmup", type=int, default=15)
+    parser.add_argument("--max-tokens", type=int, default=2000)
+    parser.add_argument("--eviction-block", type=int, default=8)
+    parser.add_argument("--provider", default="openai", choices=["openai", "anthropic", "local"])
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--prefill-delay", type=float, default=0.2)
+    parser.add_argument("--answer-tokens", type=int, default=40)
+    asyncio.run(main(parser.parse_args()))
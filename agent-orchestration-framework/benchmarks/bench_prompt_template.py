@@ -0,0 +1,66 @@
+"""
+Render cost of large system prompt templates: per request regex substitution vs PromptTemplate.
+
+Run from the project root:
+    python -m benchmarks.bench_prompt_template --size-kb 50 --variables 200
+"""
+
+import argparse
+import re
+import timeit
+
+from agent_orchestration_framework.agents.prompt_template import PromptTemplate
+
+
+def regex_replace(template, variables):
+    # What Agent.replace_placeholders did on every request before templates were compiled
+    def replace(match):
+        key = match.group(1)
+        if key in variables:
+            value = variables[key]
+            return "\n".join(value) if isinstance(value, list) else str(value)
+        return match.group(0)
+
+    return re.sub(r"{{(\w+)}}", replace, template)
+
+
+def build_template(size_kb: int, variable_count: int):
+    filler = "Follow the instructions carefully and answer politely. "
+    chunk = filler * max(1, (size_kb * 1024) // (len(filler) * variable_count))
+    template = "".join(f"{chunk}{{{{var_{i}}}}}\n" for i in range(variable_count))
+    variables = {f"var_{i}": f"value {i}" for i in range(variable_count)}
+    variables["var_0"] = ["first line", "second line"]
+    return template, variables
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-kb", type=int, default=50)
+    parser.add_argument("--variables", type=int, default=200)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    template, variables = build_template(args.size_kb, args.variables)
+    compiled = PromptTemplate(template)
+    assert compiled.render(variables) == regex_replace(template, variables)
+
+    changing = dict(variables)
+
+    def render_changed():
+        # Defeat the render cache to measure the segment join alone
+        changing["var_1"] = changing["var_1"] + "x" if len(changing["var_1"]) < 20 else "value 1"
+        return compiled.render(changing)
+
+    results = {
+        "regex re.sub per request": lambda: regex_replace(template, variables),
+        "compiled, variables changed": render_changed,
+        "compiled, cached render": lambda: compiled.render(variables),
+    }
+    print(f"template={len(template) / 1024:.1f}KB variables={args.variables}")
+    for name, fn in results.items():
+        seconds = timeit.timeit(fn, number=args.number)
+        print(f"{name:<30} {seconds / args.number * 1e6:10.2f} us/render")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+End-to-end `route_request` latency of a retrieval agent with the retriever awaited after
+the history fetch vs overlapped with it (OVERLAP_RETRIEVAL).
+
+The local HybridRetriever is searched for real. `--retrieval-latency` adds the round trip
+of a remote vector store and `--storage-latency` the one of a remote chat storage.
+
+Run from the project root:
+    python -m benchmarks.bench_retrieval --documents 20000 --requests 50
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import random
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.retrievers.hybrid_retriever import HybridRetriever
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from benchmarks.bench_async_client import SingleAgentClassifier
+from benchmarks.fake_llm_server import FakeLLMServer
+
+TOPICS = ["billing", "refund", "shipping", "password", "warranty", "invoice", "delivery", "account"]
+
+
+class RemoteRetriever(HybridRetriever):
+    def __init__(self, documents, latency: float):
+        super().__init__(documents)
+        self.latency = latency
+
+    async def retrieve(self, text, top_k):
+        await asyncio.sleep(self.latency)
+        return await super().retrieve(text, top_k)
+
+
+class RemoteStorage(InMemoryChatStorage):
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    async def fetch_chat(self, user_id, session_id, agent_id, max_history_size=None):
+        await asyncio.sleep(self.latency)
+        return await super().fetch_chat(user_id, session_id, agent_id, max_history_size)
+
+
+def build_corpus(count: int):
+    rng = random.Random(0)
+    return [
+        f"Article {i} about {rng.choice(TOPICS)} and {rng.choice(TOPICS)}: "
+        + " ".join(rng.choice(TOPICS) + str(rng.randrange(500)) for _ in range(30))
+        for i in range(count)
+    ]
+
+
+async def run(base_url: str, retriever, storage_latency: float, requests: int, overlap: bool):
+    client = AsyncOpenAI(base_url=base_url, api_key="fake", max_retries=0)
+    orchestrator = MultiAgentOrchestrator(
+        {"OVERLAP_RETRIEVAL": overlap},
+        storage=RemoteStorage(storage_latency),
+        classifier=SingleAgentClassifier(),
+        logger=logging.getLogger("benchmark"),
+    )
+    orchestrator.add_agent(
+        Agent(
+            AgentOptions(
+                name="Support Agent",
+                description="Answers support questions from the knowledge base",
+                model="fake",
+                client=client,
+                retriever=retriever,
+            )
+        )
+    )
+
+    # Untimed, opens the connection to the server so the first variant isn't penalized
+    await orchestrator.route_request("warmup", "user", "warmup")
+    latencies = []
+    for i in range(requests):
+        query = f"question {i} about {TOPICS[i % len(TOPICS)]}{i}"
+        start = time.perf_counter()
+        await orchestrator.route_request(query, "user", f"session-{i}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    await client.close()
+    return (
+        statistics.median(latencies),
+        statistics.quantiles(latencies, n=100, method="inclusive")[98],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--retrieval-latency", type=float, default=0.03)
+    parser.add_argument("--storage-latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.documents)
+    start = time.perf_counter()
+    retriever = RemoteRetriever(corpus, args.retrieval_latency)
+    print(f"indexed {args.documents} documents in {time.perf_counter() - start:.2f}s")
+    # The index lives for the whole run, a full collection walking it stalls a request by ~100ms
+    gc.collect()
+    gc.freeze()
+
+    start = time.perf_counter()
+    for i in range(100):
+        retriever.search(f"{TOPICS[i % len(TOPICS)]}{i} refund")
+    print(f"local hybrid search: {(time.perf_counter() - start) * 10:.2f}ms/query")
+
+    print(
+        f"llm={args.latency * 1000:.0f}ms retrieval={args.retrieval_latency * 1000:.0f}ms "
+        f"storage={args.storage_latency * 1000:.0f}ms"
+    )
+    with FakeLLMServer(latency=args.latency) as server:
+        for overlap in (False, True):
+            p50, p99 = asyncio.run(
+                run(server.base_url, retriever, args.storage_latency, args.requests, overlap)
+            )
+            print(f"overlap={overlap!s:5s} p50={p50:6.1f}ms p99={p99:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
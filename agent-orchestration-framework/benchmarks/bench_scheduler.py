@@ -0,0 +1,94 @@
+"""
+LLMScheduler against a local fake server that throttles a fraction of requests with 429s.
+Reports completed/failed requests, retries and latency of interactive vs background agents.
+
+Run from the project root:
+    python -m benchmarks.bench_scheduler --requests 200 --error-rate 0.3 --rpm 1200
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.llm.scheduler import (
+    LLMScheduler,
+    ModelLimits,
+    Priority,
+)
+from agent_orchestration_framework.utils import Logger
+from benchmarks.fake_llm_server import FakeLLMServer
+
+
+async def timed(agent: Agent, index: int):
+    start = time.perf_counter()
+    try:
+        await agent.process_request("hello", f"user-{index}", "session", [])
+        return agent.priority, time.perf_counter() - start, None
+    except Exception as error:
+        return agent.priority, time.perf_counter() - start, error
+
+
+async def main(args):
+    # Retry warnings would dominate the output
+    quiet_logger = logging.getLogger("benchmark")
+    quiet_logger.addHandler(logging.NullHandler())
+    quiet_logger.propagate = False
+    Logger(logger=quiet_logger)
+
+    with FakeLLMServer(latency=args.latency, error_rate=args.error_rate) as server:
+        client = AsyncOpenAI(base_url=server.base_url, api_key="fake", max_retries=0)
+        scheduler = LLMScheduler(
+            limits={"fake": ModelLimits(requests_per_minute=args.rpm, burst_seconds=1)},
+            max_retries=args.max_retries,
+            base_delay=0.05,
+            max_delay=1.0,
+        )
+        agents = [
+            Agent(
+                AgentOptions(
+                    name=f"{priority.name.title()} Agent",
+                    description="Benchmark agent",
+                    model="fake",
+                    client=client,
+                    scheduler=scheduler,
+                    priority=priority,
+                )
+            )
+            for priority in (Priority.INTERACTIVE, Priority.BACKGROUND)
+        ]
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *[timed(agents[i % 2], i) for i in range(args.requests)]
+        )
+        elapsed = time.perf_counter() - start
+
+    failed = sum(1 for _, _, error in results if error)
+    print(
+        f"requests={args.requests} error_rate={args.error_rate} rpm={args.rpm} "
+        f"max_retries={args.max_retries}"
+    )
+    print(f"completed={args.requests - failed} failed={failed} in {elapsed:.2f}s")
+    print(f"server 429s={server.error_count} scheduler={scheduler.stats()}")
+    for priority in Priority:
+        durations = [d for p, d, error in results if p == priority and not error]
+        if durations:
+            print(
+                f"{priority.name.lower():<12} p50={statistics.median(durations) * 1000:.0f}ms "
+                f"max={max(durations) * 1000:.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.3)
+    parser.add_argument("--rpm", type=float, default=1200)
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,142 @@
+"""
+Load test of the multi-process server: requests/s through the dispatcher for 1..N workers.
+
+Agents answer through an in-process client (no network, `--llm-latency` of simulated
+wait), so the measured work is the framework's own CPU: HTTP and JSON handling,
+classification embeddings, prompt rendering and history. Scaling is bounded by the
+cores of the machine, the dispatcher and the load generator need some too.
+
+Run from the project root:
+    python -m benchmarks.bench_serving --workers 1 2 4 --duration 5
+"""
+
+from types import SimpleNamespace
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.serving.server import Dispatcher, read_body, read_head
+from agent_orchestration_framework.utils import Logger
+from benchmarks.bench_orchestrator import AGENTS, CITIES
+
+
+class InstantClient:
+    """Stands in for AsyncOpenAI, answers after `latency` seconds without any I/O."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **options):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="token " * 20))],
+            usage=None,
+        )
+
+
+def quiet_logger() -> logging.Logger:
+    logger = logging.getLogger("benchmark")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    return logger
+
+
+def create_orchestrator() -> MultiAgentOrchestrator:
+    """Worker factory, configured through the environment of the parent process."""
+    orchestrator = MultiAgentOrchestrator(logger=quiet_logger())
+    client = InstantClient(float(os.environ.get("BENCH_LLM_LATENCY", "0")))
+    for name, description, _ in AGENTS:
+        orchestrator.add_agent(
+            Agent(AgentOptions(name=name, description=description, model="fake", client=client))
+        )
+    return orchestrator
+
+
+async def client_loop(port: int, sessions, deadline: float, latencies) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    turn = 0
+    while time.perf_counter() < deadline:
+        session_id, user_input = sessions[turn % len(sessions)]
+        body = json.dumps(
+            {"user_input": user_input, "user_id": "user", "session_id": session_id}
+        ).encode()
+        start = time.perf_counter()
+        writer.write(
+            b"POST /route HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+            + f"X-Session-Id: {session_id}\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        _, headers = await read_head(reader)
+        await read_body(reader, headers)
+        latencies.append(time.perf_counter() - start)
+        turn += 1
+    writer.close()
+
+
+async def run(workers: int, connections: int, duration: float):
+    dispatcher = Dispatcher("benchmarks.bench_serving:create_orchestrator", workers, port=0)
+    port = await dispatcher.start()
+
+    sessions_per_connection = 4
+    latencies = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *[
+            client_loop(
+                port,
+                [
+                    (
+                        f"session-{connection}-{index}",
+                        AGENTS[index % len(AGENTS)][2][0].format(city=CITIES[index % len(CITIES)]),
+                    )
+                    for index in range(sessions_per_connection)
+                ],
+                deadline,
+                latencies,
+            )
+            for connection in range(connections)
+        ]
+    )
+    metrics = await dispatcher.metrics()
+    await dispatcher.drain()
+
+    latencies.sort()
+    forwarded = [worker["forwarded"] for worker in metrics["workers"].values()]
+    return len(latencies) / duration, latencies[len(latencies) // 2] * 1000, forwarded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    cores = multiprocessing.cpu_count()
+    worker_counts = args.workers or sorted({1, 2, max(cores, 1)})
+    os.environ["BENCH_LLM_LATENCY"] = str(args.llm_latency)
+    # Keep the dispatcher's own logs out of the numbers
+    Logger(logger=quiet_logger())
+
+    print(f"cores={cores} connections={args.connections} duration={args.duration}s")
+    baseline = None
+    for workers in worker_counts:
+        rps, p50, forwarded = asyncio.run(run(workers, args.connections, args.duration))
+        baseline = baseline or rps
+        print(
+            f"workers={workers:<3d} {rps:8.1f} req/s  p50={p50:7.2f}ms  "
+            f"speedup={rps / baseline:4.2f}x  per worker={forwarded}"
+        )
+
+
+if __name__ == "__main__":
+    main()
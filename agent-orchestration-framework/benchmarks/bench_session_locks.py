@@ -0,0 +1,109 @@
+"""
+Bursty multi-session load through `route_request` with and without per-session serialization.
+
+Every session sends a burst of messages at once. Counted per session:
+- stale reads: a turn fetched history that was missing earlier turns of the burst
+- out of order: the saved user messages are not in the order they were sent
+
+Run from the project root:
+    python -m benchmarks.bench_session_locks --sessions 200 --burst 5
+"""
+
+from collections import defaultdict
+import argparse
+import asyncio
+import logging
+import time
+
+from openai import AsyncOpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from benchmarks.bench_async_client import SingleAgentClassifier
+from benchmarks.fake_llm_server import FakeLLMServer
+
+
+class RecordingStorage(InMemoryChatStorage):
+    def __init__(self):
+        super().__init__()
+        self.history_seen = defaultdict(list)
+
+    async def fetch_chat(self, user_id, session_id, agent_id, max_history_size=None):
+        history = await super().fetch_chat(user_id, session_id, agent_id, max_history_size)
+        self.history_seen[session_id].append(len(history))
+        return history
+
+
+async def run(base_url: str, sessions: int, burst: int, serialize: bool):
+    # One client per event loop, its connection pool is bound to the loop
+    client = AsyncOpenAI(base_url=base_url, api_key="fake", max_retries=0)
+    storage = RecordingStorage()
+    orchestrator = MultiAgentOrchestrator(
+        {"SERIALIZE_SESSION_REQUESTS": serialize},
+        storage=storage,
+        classifier=SingleAgentClassifier(),
+        logger=logging.getLogger("benchmark"),
+    )
+    agent = Agent(
+        AgentOptions(
+            name="Bench Agent",
+            description="Answers benchmark questions",
+            model="fake",
+            client=client,
+        )
+    )
+    orchestrator.add_agent(agent)
+
+    async def session(index: int):
+        await asyncio.gather(
+            *[
+                orchestrator.route_request(f"message {turn}", "user", f"session-{index}")
+                for turn in range(burst)
+            ]
+        )
+
+    start = time.perf_counter()
+    await asyncio.gather(*[session(i) for i in range(sessions)])
+    elapsed = time.perf_counter() - start
+    await client.close()
+
+    stale_reads = 0
+    out_of_order = 0
+    for index in range(sessions):
+        seen = storage.history_seen[f"session-{index}"]
+        stale_reads += sum(1 for turn, size in enumerate(seen) if size < 2 * turn)
+        saved = await storage.fetch_chat("user", f"session-{index}", agent.id)
+        sent = [message.content[0]["text"] for message in saved if message.role == "user"]
+        out_of_order += sent != [f"message {turn}" for turn in range(burst)]
+
+    return {
+        "requests/s": sessions * burst / elapsed,
+        "stale reads": stale_reads,
+        "sessions out of order": out_of_order,
+        "locks left": len(orchestrator.session_locks),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    # Slow responses reorder the turns of a burst when nothing serializes them
+    with FakeLLMServer(latency=args.latency, slow_rate=0.3, slow_latency=args.latency * 5) as server:
+        print(f"sessions={args.sessions} burst={args.burst} latency={args.latency}s")
+        for serialize in (False, True):
+            result = asyncio.run(run(server.base_url, args.sessions, args.burst, serialize))
+            print(
+                f"serialize={serialize!s:5s} "
+                + " ".join(f"{name}={value:.1f}" if isinstance(value, float) else f"{name}={value}" for name, value in result.items())
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Latency of `route_request` with and without SPECULATIVE_EXECUTION, for workloads where
+the next turn stays with the previous agent with different probabilities.
+
+The classifier stands in for an LLM classifier (`--classifier-latency`), wasted
+completions are the LLM calls whose answer was thrown away.
+
+Run from the project root:
+    python -m benchmarks.bench_speculation --sessions 10 --turns 20
+"""
+
+from typing import List
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.types import ConversationMessage
+from benchmarks.fake_llm_server import FakeLLMServer
+
+
+class ScriptedClassifier(Classifier):
+    """Picks the agent named in the input after `latency` seconds."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        await asyncio.sleep(self.latency)
+        return ClassifierResult(self.get_agent_by_id(input_text.split(":")[0]), 1.0)
+
+
+async def run(base_url: str, args, stickiness: float, speculative: bool):
+    client = AsyncOpenAI(base_url=base_url, api_key="fake", max_retries=0)
+    orchestrator = MultiAgentOrchestrator(
+        {"SPECULATIVE_EXECUTION": speculative},
+        classifier=ScriptedClassifier(args.classifier_latency),
+        logger=logging.getLogger("benchmark"),
+    )
+    agent_ids = []
+    for index in range(4):
+        agent = Agent(
+            AgentOptions(
+                name=f"Agent {index}", description=f"Agent {index}", model="fake", client=client
+            )
+        )
+        orchestrator.add_agent(agent)
+        agent_ids.append(agent.id)
+
+    rng = random.Random(0)
+    latencies = []
+
+    async def session(index: int):
+        agent_id = rng.choice(agent_ids)
+        for turn in range(args.turns):
+            if rng.random() > stickiness:
+                agent_id = rng.choice([other for other in agent_ids if other != agent_id])
+            start = time.perf_counter()
+            await orchestrator.route_request(
+                f"{agent_id}: turn {turn}", "user", f"session-{index}"
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*[session(index) for index in range(args.sessions)])
+    await client.close()
+    stats = orchestrator.speculation.stats() if orchestrator.speculation else {}
+    return statistics.median(latencies), stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--classifier-latency", type=float, default=0.1)
+    parser.add_argument("--stickiness", type=float, nargs="+", default=[0.9, 0.6, 0.2])
+    args = parser.parse_args()
+
+    print(
+        f"sessions={args.sessions} turns={args.turns} "
+        f"llm={args.latency * 1000:.0f}ms classifier={args.classifier_latency * 1000:.0f}ms"
+    )
+    with FakeLLMServer(latency=args.latency) as server:
+        for stickiness in args.stickiness:
+            for speculative in (False, True):
+                before = server.request_count
+                p50, stats = asyncio.run(run(server.base_url, args, stickiness, speculative))
+                completions = server.request_count - before
+                wasted = completions - args.sessions * args.turns
+                print(
+                    f"stickiness={stickiness:.1f} speculative={speculative!s:5s} "
+                    f"p50={p50:6.1f}ms wasted completions={wasted:<4d} {stats}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+fetch_chat / save_chat_message latency with one million stored messages.
+
+Run from the project root:
+    python -m benchmarks.bench_storage --messages 1000000
+"""
+
+from typing import Awaitable, Callable, List
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from agent_orchestration_framework.storage.chat_storage import ChatStorage
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from agent_orchestration_framework.storage.sqlite_chat_storage import (
+    SqliteChatStorage,
+)
+from agent_orchestration_framework.types import ParticipantRole, TimestampedMessage
+
+MAX_MESSAGE_PAIRS = 100
+MESSAGES_PER_CONVERSATION = MAX_MESSAGE_PAIRS * 2
+ROLES = [ParticipantRole.USER.value, ParticipantRole.ASSISTANT.value]
+
+
+def conversation_key(index: int):
+    return f"user-{index}", f"session-{index}", "agent"
+
+
+def fill_in_memory(storage: InMemoryChatStorage, conversations: int) -> None:
+    for index in range(conversations):
+        user_id, session_id, agent_id = conversation_key(index)
+        buffer = storage._get_buffer(user_id, session_id, agent_id, MAX_MESSAGE_PAIRS)
+        buffer.extend(
+            TimestampedMessage(
+                role=ROLES[i % 2], content=[{"text": f"message {i}"}], timestamp=i
+            )
+            for i in range(MESSAGES_PER_CONVERSATION)
+        )
+
+
+def fill_sqlite(storage: SqliteChatStorage, conversations: int) -> None:
+    with storage.connection:
+        for index in range(conversations):
+            key = conversation_key(index)
+            storage.connection.executemany(
+                """
+                INSERT INTO conversations
+                    (user_id, session_id, agent_id, role, content, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (*key, ROLES[i % 2], json.dumps([{"text": f"message {i}"}]), i)
+                    for i in range(MESSAGES_PER_CONVERSATION)
+                ],
+            )
+
+
+async def measure(fn: Callable[[], Awaitable], iterations: int) -> List[float]:
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def report(name: str, durations: List[float]) -> None:
+    durations.sort()
+    p99 = durations[int(len(durations) * 0.99) - 1]
+    print(
+        f"{name:<28} p50={statistics.median(durations):.3f}ms p99={p99:.3f}ms"
+    )
+
+
+async def bench(name: str, storage: ChatStorage, conversations: int, iterations: int):
+    turn = [0]
+    # Index in ROLES of the last stored message per conversation, the seeded ones end
+    # with an assistant message. A save repeating it would be skipped without writing
+    last_roles = {}
+
+    async def fetch():
+        user_id, session_id, agent_id = conversation_key(random.randrange(conversations))
+        await storage.fetch_chat(user_id, session_id, agent_id, MAX_MESSAGE_PAIRS)
+
+    async def save():
+        index = random.randrange(conversations)
+        user_id, session_id, agent_id = conversation_key(index)
+        role = 1 - last_roles.get(index, 1)
+        last_roles[index] = role
+        turn[0] += 1
+        await storage.save_chat_message(
+            user_id,
+            session_id,
+            agent_id,
+            TimestampedMessage(
+                role=ROLES[role],
+                content=[{"text": "new message"}],
+                timestamp=MESSAGES_PER_CONVERSATION + turn[0],
+            ),
+            MAX_MESSAGE_PAIRS,
+        )
+
+    report(f"{name} fetch_chat", await measure(fetch, iterations))
+    report(f"{name} save_chat_message", await measure(save, iterations))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    conversations = args.messages // MESSAGES_PER_CONVERSATION
+
+    print(f"{conversations * MESSAGES_PER_CONVERSATION} stored messages")
+
+    in_memory = InMemoryChatStorage(MAX_MESSAGE_PAIRS)
+    fill_in_memory(in_memory, conversations)
+    asyncio.run(bench("in-memory", in_memory, conversations, args.iterations))
+
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite = SqliteChatStorage(
+            os.path.join(directory, "chat.db"), MAX_MESSAGE_PAIRS
+        )
+        fill_sqlite(sqlite, conversations)
+        asyncio.run(bench("sqlite", sqlite, conversations, args.iterations))
+        sqlite.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Local OpenAI compatible `/v1/chat/completions` stub used by the benchmarks."""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+import hashlib
+import json
+import multiprocessing
+import random
+import sys
+import threading
+import time
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Default backlog of 5 drops connections when hundreds of requests arrive at once
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on cancelled requests (e.g. the loser of a hedged request)
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _message_text(message) -> str:
+    # Content blocks (e.g. with a `cache_control` breakpoint) count as their text
+    content = message.get("content", "")
+    if isinstance(content, list):
+        return "".join(str(block.get("text", "")) for block in content)
+    return str(content)
+
+
+class FakeLLMServer:
+    def __init__(
+        self,
+        latency: float = 0.05,
+        tokens: int = 20,
+        token_delay: float = 0.0,
+        prefill_delay: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        retry_after: Optional[float] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        prompt_cache: bool = False,
+        prompt_cache_size: int = 100000,
+    ):
+        # latency: seconds before the first token, token_delay: seconds between streamed tokens,
+        # prefill_delay: extra seconds per 1k prompt tokens (estimated at 4 characters per token)
+        self.latency = latency
+        self.tokens = tokens
+        self.token_delay = token_delay
+        self.prefill_delay = prefill_delay
+        self.prompt_tokens: list[int] = []
+        # Fraction of requests delayed by an extra `slow_latency` seconds (tail latency)
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        # Fraction of requests answered with `error_status` (e.g. 429 throttling, 503)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        # Prompt prefixes seen before are not prefilled again and are reported in
+        # `usage.prompt_tokens_details.cached_tokens`, like provider prompt caching
+        self.prompt_cache = prompt_cache
+        self.prompt_cache_size = prompt_cache_size
+        self.cached_tokens: list[int] = []
+        self._prefixes: "OrderedDict[str, None]" = OrderedDict()
+        self.error_count = 0
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _cached_prefix_tokens(self, messages) -> int:
+        """Tokens of the longest message prefix seen in an earlier prompt, then remember this one."""
+        if not self.prompt_cache:
+            return 0
+        cached, matching, digest = 0, True, hashlib.sha256()
+        for message in messages:
+            digest.update(f"{message.get('role')}\0{_message_text(message)}\0".encode())
+            key = digest.hexdigest()
+            if matching and key in self._prefixes:
+                cached += len(_message_text(message)) // 4
+                self._prefixes.move_to_end(key)
+            else:
+                matching = False
+                self._prefixes[key] = None
+        while len(self._prefixes) > self.prompt_cache_size:
+            self._prefixes.popitem(last=False)
+        return cached
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate sends, with Nagle's algorithm the body
+            # waits for the client's delayed ACK (~40 ms)
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                messages = body.get("messages", [])
+                prompt_tokens = sum(len(_message_text(message)) // 4 for message in messages)
+                with server._lock:
+                    server.request_count += 1
+                    server.prompt_tokens.append(prompt_tokens)
+                    cached_tokens = server._cached_prefix_tokens(messages)
+                    server.cached_tokens.append(cached_tokens)
+                    fail = random.random() < server.error_rate
+                    slow = random.random() < server.slow_rate
+                    if fail:
+                        server.error_count += 1
+
+                if fail:
+                    self._error()
+                    return
+
+                time.sleep(
+                    server.latency
+                    + server.prefill_delay * (prompt_tokens - cached_tokens) / 1000
+                    + (server.slow_latency if slow else 0)
+                )
+                words = [f"token{i} " for i in range(server.tokens)]
+
+                usage = {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(words),
+                    "total_tokens": prompt_tokens + len(words),
+                }
+                if server.prompt_cache:
+                    usage["prompt_tokens_details"] = {"cached_tokens": cached_tokens}
+
+                if body.get("stream"):
+                    self._stream(body, words, usage)
+                else:
+                    self._single(body, words, usage)
+
+            def _error(self):
+                payload = json.dumps(
+                    {"error": {"message": "Rate limit reached", "type": "rate_limit"}}
+                ).encode()
+                self.send_response(server.error_status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if server.retry_after is not None:
+                    self.send_header("Retry-After", str(server.retry_after))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _single(self, body, words, usage):
+                payload = json.dumps(
+                    {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body.get("model") or "fake",
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {
+                                    "role": "assistant",
+                                    "content": "".join(words),
+                                },
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": usage,
+                    }
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self, body, words, usage):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for word in words:
+                    chunk = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": body.get("model") or "fake",
+                        "choices": [
+                            {
+                                "index": 0,
+                                "delta": {"content": word},
+                                "finish_reason": None,
+                            }
+                        ],
+                    }
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                    if server.token_delay:
+                        time.sleep(server.token_delay)
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    chunk = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": body.get("model") or "fake",
+                        "choices": [],
+                        "usage": usage,
+                    }
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                self._write_chunk(b"data: [DONE]\n\n")
+                self._write_chunk(b"")
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def _serve(options, ready) -> None:
+    server = FakeLLMServer(**options)
+    ready.put(server.base_url)
+    server._server.serve_forever()
+
+
+@contextmanager
+def fake_llm_server_process(**options) -> Iterator[str]:
+    """
+    Run a FakeLLMServer in a child process and yield its base url. The server then
+    neither competes with the client for the GIL nor shows up in its tracemalloc numbers.
+    Counters like `request_count` stay in the child.
+    """
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    process = context.Process(target=_serve, args=(options, ready), daemon=True)
+    process.start()
+    try:
+        yield ready.get(timeout=30)
+    finally:
+        process.terminate()
+        process.join()
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+from typing import List
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.agents.response_cache import SemanticResponseCache
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from agent_orchestration_framework.types import ConversationMessage
+from agent_orchestration_framework.utils.tracing import CallbackExporter, Tracer
+
+
+class SingleAgentClassifier(Classifier):
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        return ClassifierResult(next(iter(self.agents.values())), 1.0)
+
+
+class SlowClient:
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request_options):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        message = SimpleNamespace(content="Sunny")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_orchestrator(traces, **options):
+    orchestrator = MultiAgentOrchestrator(
+        {"LOG_EXECUTION_TIMES": True},
+        storage=InMemoryChatStorage(),
+        classifier=SingleAgentClassifier(),
+        logger=logging.getLogger("test"),
+        tracer=Tracer([CallbackExporter(traces.append)]),
+    )
+    client = SlowClient()
+    orchestrator.add_agent(
+        Agent(
+            AgentOptions(
+                name="Weather Agent",
+                description="Weather",
+                model="fake",
+                client=client,
+                inference_config={"temperature": 0},
+                **options,
+            )
+        )
+    )
+    return orchestrator, client
+
+
+def span_attribute(trace, name: str, attribute: str):
+    return next(
+        span.attributes[attribute]
+        for _, span in trace.walk()
+        if span.name.endswith(name) and attribute in span.attributes
+    )
+
+
+def test_coalesced_completions_show_in_traces_and_stats(caplog):
+    caplog.set_level(logging.INFO, logger="test")
+
+    async def main():
+        traces = []
+        orchestrator, client = make_orchestrator(traces, coalesce_requests=True)
+        await asyncio.gather(
+            *[
+                orchestrator.route_request("Rain today?", "user", f"session-{index}")
+                for index in range(2)
+            ]
+        )
+        assert client.calls == 1
+        coalesced = [span_attribute(trace, "LLM completion", "coalesced") for trace in traces]
+        assert sorted(coalesced) == [False, True]
+
+    asyncio.run(main())
+    assert "AGENT WEATHER AGENT | REQUEST COALESCING" in caplog.text
+    assert "> coalesced: 1" in caplog.text
+
+
+def test_response_cache_hits_show_in_traces_and_stats(caplog):
+    caplog.set_level(logging.INFO, logger="test")
+
+    async def main():
+        traces = []
+        orchestrator, client = make_orchestrator(
+            traces, response_cache=SemanticResponseCache()
+        )
+        for index in range(2):
+            await orchestrator.route_request("Rain today?", "user", f"session-{index}")
+        assert client.calls == 1
+        hits = [span_attribute(trace, "Response cache lookup", "hit") for trace in traces]
+        assert hits == [False, True]
+
+    asyncio.run(main())
+    assert "AGENT WEATHER AGENT | RESPONSE CACHE" in caplog.text
+    assert "> hits: 1" in caplog.text
+
+
+def test_storing_the_same_question_again_updates_its_slot():
+    cache = SemanticResponseCache(max_entries=2)
+    for text in ("Cloudy", "Sunny"):
+        cache.store("Rain today?", "context", ConversationMessage("assistant", [{"text": text}]))
+    assert cache.stats()["size"] == 1
+    cache.store("Snow today?", "context", ConversationMessage("assistant", [{"text": "No"}]))
+    assert cache.stats()["size"] == 2
+    assert cache.lookup("Rain today?", "context").text == "Sunny"
+    assert cache.lookup("Snow today?", "context").text == "No"
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from typing import List
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.classifiers.embedding_classifier import (
+    EmbeddingClassifier,
+)
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from agent_orchestration_framework.types import ConversationMessage
+
+
+class CountingStorage(InMemoryChatStorage):
+    def __init__(self):
+        super().__init__()
+        self.fetch_all_calls = 0
+
+    async def fetch_all_chats(self, user_id, session_id):
+        self.fetch_all_calls += 1
+        return await super().fetch_all_chats(user_id, session_id)
+
+
+class HistoryClassifier(Classifier):
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        return ClassifierResult(None, 0)
+
+
+def route(classifier, user_input: str = "Will it rain tomorrow?") -> int:
+    async def main():
+        storage = CountingStorage()
+        orchestrator = MultiAgentOrchestrator(
+            storage=storage, classifier=classifier, logger=logging.getLogger("test")
+        )
+        orchestrator.add_agent(
+            Agent(
+                AgentOptions(
+                    name="Weather Agent",
+                    description="Weather forecasts, rain and temperature",
+                    model="fake",
+                )
+            )
+        )
+        await orchestrator.classify_request(user_input, "user", "session")
+        return storage.fetch_all_calls
+
+    return asyncio.run(main())
+
+
+def test_history_is_only_fetched_for_classifiers_that_read_it():
+    assert route(EmbeddingClassifier()) == 0
+    assert route(HistoryClassifier()) == 1
+
+
+def test_history_is_only_fetched_when_escalating_to_the_fallback():
+    assert route(EmbeddingClassifier(fallback_classifier=HistoryClassifier())) == 0
+    # Nothing in common with the agent description, the fallback decides
+    classifier = EmbeddingClassifier(fallback_classifier=HistoryClassifier())
+    assert route(classifier, "Qzx vvk") == 1
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from typing import List
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.agents.manager_agent import ManagerAgent, SubTask
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from agent_orchestration_framework.types import ConversationMessage
+
+
+class FirstAgentClassifier(Classifier):
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        return ClassifierResult(next(iter(self.agents.values())), 1.0)
+
+
+class EchoAgent(Agent):
+    def __init__(self, name: str):
+        super().__init__(AgentOptions(name=name, description=name, model="fake"))
+        self.inputs = []
+
+    async def process_request(self, input_text, *args, **kwargs):
+        self.inputs.append(input_text)
+        return ConversationMessage(role="assistant", content=[{"text": input_text}])
+
+
+class FixedManager(ManagerAgent):
+    def __init__(self, tasks: List[SubTask], latency: float = 0):
+        super().__init__(AgentOptions(name="Manager", description="Manager", model="fake"))
+        self.tasks = tasks
+        self.latency = latency
+        self.calls = 0
+
+    async def decompose(self, input_text, agents):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return self.merge_tasks(self.tasks)
+
+
+class SlowClassifier(FirstAgentClassifier):
+    async def classify(self, input_text, chat_history):
+        await asyncio.sleep(0.1)
+        return await super().classify(input_text, chat_history)
+
+
+def make_orchestrator(manager=None, classifier=None):
+    orchestrator = MultiAgentOrchestrator(
+        {"FAN_OUT_ENABLED": True},
+        storage=InMemoryChatStorage(),
+        classifier=classifier or FirstAgentClassifier(),
+        logger=logging.getLogger("test"),
+        manager=manager,
+    )
+    travel, weather = EchoAgent("Travel Agent"), EchoAgent("Weather Agent")
+    orchestrator.add_agent(travel)
+    orchestrator.add_agent(weather)
+    return orchestrator, travel, weather
+
+
+def test_no_decomposition_model_keeps_the_request_whole():
+    async def main():
+        orchestrator, travel, _ = make_orchestrator()
+        text = "My flight is AA100. What is its status?"
+        response = await orchestrator.route_request(text, "user", "session")
+        assert "sub_agents" not in response["metadata"]
+        assert travel.inputs == [text]
+
+    asyncio.run(main())
+
+
+def test_sub_tasks_for_the_same_agent_are_merged():
+    async def main():
+        # The second part is left to the classifier, which picks the same agent
+        manager = FixedManager(
+            [SubTask("My flight is AA100.", "travel-agent"), SubTask("What is its status?")]
+        )
+        orchestrator, travel, _ = make_orchestrator(manager)
+        text = "My flight is AA100. What is its status?"
+        response = await orchestrator.route_request(text, "user", "session")
+        assert "sub_agents" not in response["metadata"]
+        assert travel.inputs == [text]
+
+    asyncio.run(main())
+
+
+def test_sub_tasks_for_different_agents_fan_out():
+    async def main():
+        manager = FixedManager(
+            [
+                SubTask("Book a flight.", "travel-agent"),
+                SubTask("Rain in Paris?", "weather-agent"),
+                SubTask("To Paris.", "travel-agent"),
+            ]
+        )
+        orchestrator, travel, weather = make_orchestrator(manager)
+        response = await orchestrator.route_request(
+            "Book a flight to Paris. Will it rain there?", "user", "session"
+        )
+        assert response["metadata"]["sub_agents"] == ["travel-agent", "weather-agent"]
+        assert travel.inputs == ["Book a flight. To Paris."]
+        assert weather.inputs == ["Rain in Paris?"]
+
+    asyncio.run(main())
+
+
+def test_single_part_request_skips_the_decomposition():
+    async def main():
+        manager = FixedManager([SubTask("Book a flight", "travel-agent")])
+        orchestrator, travel, _ = make_orchestrator(manager)
+        await orchestrator.route_request("Book a flight to Paris", "user", "session")
+        assert manager.calls == 0
+        assert travel.inputs == ["Book a flight to Paris"]
+
+    asyncio.run(main())
+
+
+def test_decomposition_runs_alongside_classification():
+    async def main():
+        manager = FixedManager([SubTask("Book a flight", "travel-agent")], latency=0.1)
+        orchestrator, travel, _ = make_orchestrator(manager, SlowClassifier())
+        start = asyncio.get_running_loop().time()
+        await orchestrator.route_request("Book a flight. Then a hotel.", "user", "session")
+        assert manager.calls == 1
+        assert asyncio.get_running_loop().time() - start < 0.18
+        assert travel.inputs == ["Book a flight. Then a hotel."]
+
+    asyncio.run(main())
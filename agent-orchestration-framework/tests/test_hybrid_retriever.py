@@ -0,0 +1,32 @@
+import asyncio
+import sys
+
+from agent_orchestration_framework.retrievers.hybrid_retriever import HybridRetriever
+
+
+def test_search_in_threads_while_documents_are_added():
+    async def main():
+        retriever = HybridRetriever(["baggage allowance for economy"], top_k=2)
+        stop = False
+
+        async def search():
+            while not stop:
+                await retriever.retrieve("baggage allowance economy seats", 2)
+
+        searches = [asyncio.ensure_future(search()) for _ in range(4)]
+        for batch in range(100):
+            retriever.add_documents(
+                [f"baggage allowance rule {batch} {index}" for index in range(20)]
+            )
+            await asyncio.sleep(0)
+        stop = True
+        await asyncio.gather(*searches)
+        documents = await retriever.retrieve("baggage allowance rule 99 19", 1)
+        assert documents[0].text == "baggage allowance rule 99 19"
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        asyncio.run(main())
+    finally:
+        sys.setswitchinterval(interval)
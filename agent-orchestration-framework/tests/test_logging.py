@@ -0,0 +1,48 @@
+import logging
+import queue
+
+from agent_orchestration_framework.utils.logger.logger_config import (
+    DROP_NEWEST,
+    DROP_OLDEST,
+    DroppingQueueHandler,
+)
+
+
+def record(level: int, message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 0, message, None, None)
+
+
+def drain(log_queue: queue.Queue):
+    messages = []
+    while not log_queue.empty():
+        messages.append(log_queue.get_nowait().msg)
+    return messages
+
+
+def test_drop_newest_keeps_warnings_and_errors():
+    log_queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue, DROP_NEWEST, block_timeout=0.01)
+    handler.emit(record(logging.INFO, "info 1"))
+    handler.emit(record(logging.ERROR, "error"))
+    handler.emit(record(logging.INFO, "info 2"))
+    assert handler.dropped == 1
+    assert drain(log_queue) == ["info 1", "error"]
+
+
+def test_drop_oldest_never_drops_an_error():
+    log_queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue, DROP_OLDEST, block_timeout=0.01)
+    handler.emit(record(logging.ERROR, "error"))
+    handler.emit(record(logging.INFO, "info 1"))
+    handler.emit(record(logging.INFO, "info 2"))
+    assert handler.dropped == 1
+    assert "error" in drain(log_queue)
+
+
+def test_drop_oldest_drops_info_records_first():
+    log_queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue, DROP_OLDEST, block_timeout=0.01)
+    for message in ("info 1", "info 2", "info 3"):
+        handler.emit(record(logging.INFO, message))
+    assert handler.dropped == 1
+    assert drain(log_queue) == ["info 2", "info 3"]
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from agent_orchestration_framework.llm.model_pool import (
+    ModelEndpoint,
+    ModelPool,
+    RoutingPolicy,
+)
+
+
+def make_pool():
+    return ModelPool(
+        [ModelEndpoint(client=None, model="a"), ModelEndpoint(client=None, model="b")],
+        policy=RoutingPolicy.HEDGED,
+        default_hedge_delay=0.05,
+    )
+
+
+def test_cancelled_caller_cancels_the_primary_before_hedging():
+    async def main():
+        finished, cancelled = [], []
+
+        async def complete(endpoint):
+            try:
+                await asyncio.sleep(1)
+                finished.append(endpoint.name)
+            except asyncio.CancelledError:
+                cancelled.append(endpoint.name)
+                raise
+
+        caller = asyncio.ensure_future(make_pool().complete(complete))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert cancelled == ["a"]
+        assert finished == []
+
+    asyncio.run(main())
+
+
+def test_hedge_wins_and_cancels_the_slow_primary():
+    async def main():
+        cancelled = []
+
+        async def complete(endpoint):
+            try:
+                await asyncio.sleep(1 if endpoint.name == "a" else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(endpoint.name)
+                raise
+            return endpoint.name
+
+        pool = make_pool()
+        assert await pool.complete(complete) == "b"
+        await asyncio.sleep(0)
+        assert pool.hedge_wins == 1
+        assert cancelled == ["a"]
+
+    asyncio.run(main())
+
+
+def test_slow_primary_loses_its_rank_after_a_lost_hedge():
+    async def main():
+        async def complete(endpoint):
+            await asyncio.sleep(1 if endpoint.name == "a" else 0.01)
+            return endpoint.name
+
+        pool = make_pool()
+        results = []
+        for _ in range(10):
+            results.append(await pool.complete(complete))
+            await asyncio.sleep(0)
+        assert results == ["b"] * 10
+        stats = pool.get_stats()
+        # Only the first calls hedge, before the cancelled attempts are recorded
+        assert stats["hedged_requests"] <= 2
+        assert stats["endpoints"]["a"]["requests"] >= 1
+        assert pool.ranked()[0].name == "b"
+
+    asyncio.run(main())
+
+
+def test_early_primary_error_falls_back_to_the_next_endpoint():
+    async def main():
+        async def complete(endpoint):
+            if endpoint.name == "a":
+                raise ConnectionError("endpoint down")
+            return endpoint.name
+
+        pool = make_pool()
+        assert await pool.complete(complete) == "b"
+        stats = pool.get_stats()
+        assert stats["fallbacks"] == 1
+        assert stats["hedged_requests"] == 0
+        assert stats["endpoints"]["a"]["errors"] == 1
+        assert pool.ranked()[0].name == "b"
+
+    asyncio.run(main())
+
+
+def test_least_latency_routes_around_a_failing_endpoint():
+    async def main():
+        calls = []
+
+        async def complete(endpoint):
+            calls.append(endpoint.name)
+            if endpoint.name == "a":
+                raise ConnectionError("endpoint down")
+            return endpoint.name
+
+        pool = ModelPool(
+            [ModelEndpoint(client=None, model="a"), ModelEndpoint(client=None, model="b")],
+            policy=RoutingPolicy.LEAST_LATENCY,
+        )
+        with pytest.raises(ConnectionError):
+            await pool.complete(complete)
+        for _ in range(5):
+            assert await pool.complete(complete) == "b"
+        assert calls == ["a"] + ["b"] * 5
+
+    asyncio.run(main())
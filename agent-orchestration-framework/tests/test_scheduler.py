@@ -0,0 +1,27 @@
+import asyncio
+
+from agent_orchestration_framework.llm.scheduler import LLMScheduler, ModelLimits
+
+
+def test_scheduler_works_across_event_loops():
+    scheduler = LLMScheduler({"model": ModelLimits(requests_per_minute=600)})
+
+    async def complete(value):
+        await asyncio.sleep(0)
+        return value
+
+    async def main(value):
+        results = []
+        # The dispatcher waits on the queue in between
+        for _ in range(2):
+            results.append(
+                await asyncio.wait_for(
+                    scheduler.submit(lambda: complete(value), model="model"), timeout=1
+                )
+            )
+        return results
+
+    # e.g. an orchestrator reused by two scripts, or a test per event loop
+    assert asyncio.run(main(1)) == [1, 1]
+    assert asyncio.run(main(2)) == [2, 2]
+    assert scheduler.stats()["queued"] == 0
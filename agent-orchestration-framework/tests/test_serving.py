@@ -0,0 +1,109 @@
+import asyncio
+import json
+import logging
+from typing import List
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.serving.server import Dispatcher, Worker
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from agent_orchestration_framework.types import ConversationMessage
+
+
+class SingleAgentClassifier(Classifier):
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        return ClassifierResult(next(iter(self.agents.values())), 1.0)
+
+
+class FailingStreamAgent(Agent):
+    async def process_request(self, input_text, *args, **kwargs):
+        return self._tokens()
+
+    async def _tokens(self):
+        yield "partial "
+        raise ValueError("bad token")
+
+
+async def start_worker():
+    orchestrator = MultiAgentOrchestrator(
+        storage=InMemoryChatStorage(),
+        classifier=SingleAgentClassifier(),
+        logger=logging.getLogger("test"),
+    )
+    orchestrator.add_agent(
+        FailingStreamAgent(
+            AgentOptions(name="Agent", description="Streams", model="fake", streaming=True)
+        )
+    )
+    worker = Worker(orchestrator)
+    return worker, await worker.start("127.0.0.1")
+
+
+async def post(port: int, path: str, payload, headers=None) -> bytes:
+    """Raw response bytes, read until the server closes the connection."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode()
+    head = [f"POST {path} HTTP/1.1", "Host: test", f"Content-Length: {len(body)}"]
+    head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    response = await asyncio.wait_for(reader.read(), timeout=5)
+    writer.close()
+    return response
+
+
+def test_error_in_agent_stream_cuts_the_chunked_body():
+    async def main():
+        worker, port = await start_worker()
+        request = {"user_input": "hi", "user_id": "user", "session_id": "session"}
+        response = await post(port, "/route", request)
+        assert response.startswith(b"HTTP/1.1 200 OK")
+        assert b"partial" in response
+        # No error response written into the body, and no terminating chunk
+        assert response.count(b"HTTP/1.1") == 1
+        assert not response.endswith(b"0\r\n\r\n")
+        await worker.drain(1)
+
+    asyncio.run(main())
+
+
+def test_connection_close_is_honoured():
+    async def main():
+        worker, port = await start_worker()
+        # Returns only because the worker closes the connection
+        response = await post(port, "/route", {}, {"Connection": "close"})
+        assert response.startswith(b"HTTP/1.1 400")
+        assert b"Connection: close" in response
+        await worker.drain(1)
+
+    asyncio.run(main())
+
+
+def test_worker_failing_mid_stream_cuts_the_dispatcher_response():
+    async def main():
+        worker, worker_port = await start_worker()
+        dispatcher = Dispatcher("unused:factory", workers=1, host="127.0.0.1", port=0)
+        dispatcher.workers["worker-0"].port = worker_port
+        server = await asyncio.start_server(dispatcher.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        request = {"user_input": "hi", "user_id": "user", "session_id": "session"}
+        # Returns only because the dispatcher closes the connection
+        response = await post(port, "/route", request)
+        assert response.startswith(b"HTTP/1.1 200 OK")
+        assert b"partial" in response
+        assert response.count(b"HTTP/1.1") == 1
+        assert b"503" not in response
+        assert dispatcher.errors == 1
+
+        server.close()
+        await worker.drain(1)
+
+    asyncio.run(main())
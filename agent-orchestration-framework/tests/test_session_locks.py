@@ -0,0 +1,95 @@
+import asyncio
+import gc
+import logging
+from typing import List
+
+from agent_orchestration_framework.agents.agent import Agent, AgentOptions
+from agent_orchestration_framework.classifiers.classifier import (
+    Classifier,
+    ClassifierResult,
+)
+from agent_orchestration_framework.orchestrator import MultiAgentOrchestrator
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from agent_orchestration_framework.types import ConversationMessage
+from agent_orchestration_framework.utils.tracing import CallbackExporter, Tracer
+
+
+class SingleAgentClassifier(Classifier):
+    async def classify(
+        self, input_text: str, chat_history: List[ConversationMessage]
+    ) -> ClassifierResult:
+        return ClassifierResult(next(iter(self.agents.values())), 1.0)
+
+
+class StreamingAgent(Agent):
+    async def process_request(self, input_text, *args, **kwargs):
+        return self._tokens()
+
+    async def _tokens(self):
+        for token in ("a ", "b"):
+            yield token
+
+
+def make_orchestrator(traces=None):
+    orchestrator = MultiAgentOrchestrator(
+        {"SERIALIZE_SESSION_REQUESTS": True},
+        storage=InMemoryChatStorage(),
+        classifier=SingleAgentClassifier(),
+        logger=logging.getLogger("test"),
+        tracer=Tracer([CallbackExporter(traces.append)]) if traces is not None else None,
+    )
+    orchestrator.add_agent(
+        StreamingAgent(
+            AgentOptions(
+                name="Stream Agent", description="Streams", model="fake", streaming=True
+            )
+        )
+    )
+    return orchestrator
+
+
+def test_dropped_stream_releases_session():
+    async def main():
+        traces = []
+        orchestrator = make_orchestrator(traces)
+        response = await orchestrator.route_request("hi", "user", "session")
+        assert response["streaming"]
+        assert orchestrator.session_locks.stats()["active_sessions"] == 1
+
+        # Never iterated, only dropped
+        del response
+        gc.collect()
+        assert orchestrator.session_locks.stats()["active_sessions"] == 0
+        assert len(traces) == 1
+
+        response = await asyncio.wait_for(
+            orchestrator.route_request("again", "user", "session"), timeout=1
+        )
+        assert "".join([chunk async for chunk in response["output"]]) == "a b"
+
+    asyncio.run(main())
+
+
+def test_aclose_before_iterating_releases_session():
+    async def main():
+        orchestrator = make_orchestrator()
+        response = await orchestrator.route_request("hi", "user", "session")
+        await response["output"].aclose()
+        assert orchestrator.session_locks.stats()["active_sessions"] == 0
+
+    asyncio.run(main())
+
+
+def test_consumed_stream_saves_history_then_releases_session():
+    async def main():
+        orchestrator = make_orchestrator()
+        response = await orchestrator.route_request("hi", "user", "session")
+        assert "".join([chunk async for chunk in response["output"]]) == "a b"
+        assert orchestrator.session_locks.stats()["active_sessions"] == 0
+
+        history = await orchestrator.storage.fetch_all_chats("user", "session")
+        assert [message.text for message in history][-1].endswith("a b")
+
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agent_orchestration_framework.tools.tool import Tool, Tools
+
+
+async def lookup_weather(city: str) -> str:
+    await asyncio.sleep(0.01)
+    return f"Sunny in {city}"
+
+
+async def book_flight(city: str) -> str:
+    raise RuntimeError("booking service down")
+
+
+def make_tools(parallel: bool) -> Tools:
+    properties = {"city": {"type": "string", "description": "City"}}
+    return Tools(
+        [
+            Tool("weather", "Weather of a city", properties, ["city"], lookup_weather),
+            Tool("book", "Books a flight", properties, ["city"], book_flight),
+        ],
+        parallel=parallel,
+    )
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_failing_tool_only_fails_its_own_result(parallel):
+    response = SimpleNamespace(
+        content=[
+            SimpleNamespace(id="call-1", name="book", input={"city": "Paris"}),
+            SimpleNamespace(id="call-2", name="weather", input={"city": "Paris"}),
+        ]
+    )
+    message = asyncio.run(make_tools(parallel).tool_handler("openai", response, []))
+    failed, succeeded = message["content"]
+    assert failed["tool_use_id"] == "call-1"
+    assert failed["is_error"] is True
+    assert "booking service down" in failed["content"]
+    assert succeeded == {
+        "type": "tool_result",
+        "tool_use_id": "call-2",
+        "content": "Sunny in Paris",
+    }
+
+
+@pytest.mark.parametrize("names", [("weather", "weather_tool"), ("weather_tool", "weather")])
+def test_tools_exposed_under_the_same_openai_name_are_rejected(names):
+    properties = {"city": {"type": "string", "description": "City"}}
+    tools = [Tool(name, "Weather of a city", properties, ["city"], lookup_weather) for name in names]
+    with pytest.raises(ValueError, match="would both be named 'weather'"):
+        Tools(tools)
+
+
+def test_tools_are_found_by_name_and_openai_name():
+    tools = make_tools(parallel=False)
+    tools.register(
+        Tool(
+            "Forecast_Tool",
+            "Forecast of a city",
+            {"city": {"type": "string", "description": "City"}},
+            ["city"],
+            lookup_weather,
+        )
+    )
+    assert tools.get_tool("Forecast_Tool") is tools.get_tool("forecast")
+    assert [tool["function"]["name"] for tool in tools.to_openai_format()] == [
+        "weather",
+        "book",
+        "forecast",
+    ]
+
+
+def weather_calls(count: int):
+    return SimpleNamespace(
+        content=[
+            SimpleNamespace(id=f"call-{index}", name="weather", input={"city": "Paris"})
+            for index in range(count)
+        ]
+    )
+
+
+def test_parallel_tools_can_be_used_from_several_event_loops():
+    tools = make_tools(parallel=True)
+    tools.max_concurrency = 1
+    for _ in range(2):
+        # Two calls contend for the semaphore on each loop
+        message = asyncio.run(tools.tool_handler("openai", weather_calls(2), []))
+        assert [result["content"] for result in message["content"]] == ["Sunny in Paris"] * 2
+
+
+async def slow_weather(city: str) -> str:
+    await asyncio.sleep(1)
+    return "late"
+
+
+async def upstream_timeout(city: str) -> str:
+    raise asyncio.TimeoutError("upstream weather API timed out")
+
+
+@pytest.mark.parametrize(
+    "func, content, is_error",
+    [
+        (slow_weather, "Tool 'weather' timed out after 0.05s", False),
+        (upstream_timeout, "Tool 'weather' failed: upstream weather API timed out", True),
+    ],
+)
+def test_only_missed_deadlines_are_reported_as_timeouts(func, content, is_error):
+    properties = {"city": {"type": "string", "description": "City"}}
+    tools = Tools([Tool("weather", "Weather", properties, ["city"], func)], timeout=0.05)
+    message = asyncio.run(tools.tool_handler("openai", weather_calls(1), []))
+    result = message["content"][0]
+    assert result["content"] == content
+    assert result.get("is_error", False) is is_error
@@ -0,0 +1,31 @@
+import copy
+import pickle
+
+import pytest
+
+from agent_orchestration_framework.types import (
+    ConversationMessage,
+    ParticipantRole,
+    TimestampedMessage,
+)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        ConversationMessage(ParticipantRole.USER, [{"text": "hi"}]),
+        ConversationMessage("assistant", [{"text": "a"}, {"image": [1]}], frozen=True),
+        TimestampedMessage("user", [{"text": "hi"}], timestamp=5, frozen=True),
+    ],
+)
+@pytest.mark.parametrize(
+    "clone",
+    [lambda message: pickle.loads(pickle.dumps(message)), copy.copy, copy.deepcopy],
+)
+def test_messages_pickle_and_copy(message, clone):
+    cloned = clone(message)
+    assert type(cloned) is type(message)
+    assert cloned.role == message.role
+    assert cloned.content == message.content
+    assert cloned.frozen == message.frozen
+    assert getattr(cloned, "timestamp", None) == getattr(message, "timestamp", None)
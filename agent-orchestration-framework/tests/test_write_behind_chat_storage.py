@@ -0,0 +1,47 @@
+import asyncio
+
+from agent_orchestration_framework.storage.in_memory_chat_storage import (
+    InMemoryChatStorage,
+)
+from agent_orchestration_framework.storage.write_behind_chat_storage import (
+    WriteBehindChatStorage,
+)
+from agent_orchestration_framework.types import ConversationMessage
+
+
+class StalledStorage(InMemoryChatStorage):
+    def __init__(self):
+        super().__init__()
+        self.released = asyncio.Event()
+
+    async def save_chat_messages(self, *args, **kwargs):
+        await self.released.wait()
+        return await super().save_chat_messages(*args, **kwargs)
+
+
+def message(role: str, text: str) -> ConversationMessage:
+    return ConversationMessage(role, [{"text": text}])
+
+
+def test_save_cancelled_under_backpressure_does_not_block_reads():
+    async def main():
+        inner = StalledStorage()
+        storage = WriteBehindChatStorage(inner, max_pending=1)
+        key = ("user", "session", "agent")
+        await storage.save_chat_message(*key, message("user", "first"))
+        # The worker holds "first", "second" fills the queue, "third" waits for room
+        await asyncio.sleep(0)
+        await storage.save_chat_message(*key, message("assistant", "second"))
+        blocked = asyncio.ensure_future(
+            storage.save_chat_message(*key, message("user", "third"))
+        )
+        await asyncio.sleep(0)
+        blocked.cancel()
+        await asyncio.gather(blocked, return_exceptions=True)
+
+        inner.released.set()
+        history = await asyncio.wait_for(storage.fetch_chat(*key), timeout=1)
+        assert [item.text for item in history] == ["first", "second"]
+        await storage.close()
+
+    asyncio.run(main())